@@ -0,0 +1,96 @@
+"""
+bench_conversion.py
+Compares the bulk GeoJSON geometry conversion in Conversion.geojson_to_gdf with the
+previous one-shape()-per-feature approach on synthetic layers.
+
+Run with:
+    uv run python benchmarks/bench_conversion.py --features 100000
+"""
+
+import argparse
+import random
+import time
+
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import shape
+
+from pykaahma_linz.features.Conversion import geojson_to_gdf
+
+
+def make_features(n: int, geometry_type: str) -> list[dict]:
+    random.seed(42)
+    features = []
+    for i in range(n):
+        x, y = random.uniform(1.0e6, 2.0e6), random.uniform(4.7e6, 6.2e6)
+        if geometry_type == "Point":
+            geometry = {"type": "Point", "coordinates": [x, y]}
+        elif geometry_type == "LineString":
+            geometry = {
+                "type": "LineString",
+                "coordinates": [[x + j, y + j * 2] for j in range(10)],
+            }
+        else:
+            ring = [[x, y], [x + 10, y], [x + 10, y + 10], [x, y + 10], [x, y]]
+            geometry = {"type": "MultiPolygon", "coordinates": [[ring], [ring[::-1]]]}
+        features.append(
+            {
+                "type": "Feature",
+                "geometry": geometry,
+                "properties": {"id": i, "name": f"feature {i}", "value": x / y},
+            }
+        )
+    return features
+
+
+def legacy_geojson_to_gdf(features: list[dict], epsg: int) -> gpd.GeoDataFrame:
+    records = []
+    geometries = []
+    for feature in features:
+        records.append(feature.get("properties", {}))
+        geom = feature.get("geometry")
+        geometries.append(shape(geom) if geom else None)
+    return gpd.GeoDataFrame(
+        pd.DataFrame(records), geometry=geometries, crs=f"EPSG:{epsg}"
+    )
+
+
+def best_of(func, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark GeoJSON to GeoDataFrame conversion."
+    )
+    parser.add_argument("--features", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'geometry':<14}{'features':>10}{'legacy (s)':>12}{'bulk (s)':>10}{'speedup':>9}"
+    )
+    for geometry_type in ("Point", "LineString", "MultiPolygon"):
+        features = make_features(args.features, geometry_type)
+        legacy_time, expected = best_of(
+            lambda: legacy_geojson_to_gdf(features, 2193), args.repeat
+        )
+        bulk_time, actual = best_of(
+            lambda: geojson_to_gdf(features, epsg=2193), args.repeat
+        )
+        assert actual.geom_equals_exact(expected, tolerance=0).all()
+        pd.testing.assert_frame_equal(
+            actual.drop(columns="geometry"), expected.drop(columns="geometry")
+        )
+        print(
+            f"{geometry_type:<14}{len(features):>10}{legacy_time:>12.3f}{bulk_time:>10.3f}{legacy_time / bulk_time:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+bench_json_decode.py
+Compares the installed JSON decoders on synthetic WFS GeoJSON pages with full
+coordinate arrays, as decoded for every page by features.wfs.
+
+Run with:
+    uv run python benchmarks/bench_json_decode.py --features 1000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from pykaahma_linz.features.json_decoder import JSON_DECODERS
+
+
+def make_page(n: int, vertices: int) -> bytes:
+    random.seed(42)
+    features = []
+    for i in range(n):
+        x, y = random.uniform(1.0e6, 2.0e6), random.uniform(4.7e6, 6.2e6)
+        ring = [
+            [
+                round(x + random.uniform(-50, 50), 3),
+                round(y + random.uniform(-50, 50), 3),
+            ]
+            for _ in range(vertices)
+        ]
+        ring.append(ring[0])
+        features.append(
+            {
+                "type": "Feature",
+                "id": f"layer-50772.{i}",
+                "geometry": {"type": "MultiPolygon", "coordinates": [[ring]]},
+                "properties": {
+                    "id": i,
+                    "appellation": f"Lot {i} DP {random.randint(1000, 99999)}",
+                    "calc_area": random.uniform(100, 10000),
+                    "land_district": random.choice(["Otago", "Canterbury", "Auckland"]),
+                },
+            }
+        )
+    page = {
+        "type": "FeatureCollection",
+        "features": features,
+        "totalFeatures": "unknown",
+        "numberReturned": n,
+        "crs": {"type": "name", "properties": {"name": "urn:ogc:def:crs:EPSG::2193"}},
+    }
+    return json.dumps(page).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WFS page JSON decoding.")
+    parser.add_argument("--features", type=int, default=1000)
+    parser.add_argument("--vertices", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    page = make_page(args.features, args.vertices)
+    print(
+        f"Page of {args.features} features, {len(page) / 1e6:.1f} MB, best of {args.repeat}"
+    )
+    expected = json.loads(page)
+    timings = {}
+    for name, decode in JSON_DECODERS.items():
+        assert decode(page) == expected
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            decode(page)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+
+    for name, best in timings.items():
+        speedup = timings["json"] / best
+        print(f"{name:<10}{best * 1000:>10.1f} ms{speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Cache.py
+Pluggable caches for API metadata (item details, service descriptors, etc.) fetched through a KServer.
+"""
+
+import abc
+import copy
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from pykaahma_linz.features.json_decoder import json_loads
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_TTL = 3600  # seconds
+DEFAULT_MAX_ENTRIES = 1024
+
+
+@dataclass
+class CacheEntry:
+    """
+    A cached API response and the validators needed to revalidate it.
+
+    Attributes:
+        value (dict or list): The decoded JSON response.
+        url (str): The URL the response was fetched from.
+        etag (str or None): The ETag header of the response, if any.
+        last_modified (str or None): The Last-Modified header of the response, if any.
+        stored_at (float): The time (seconds since the epoch) the response was fetched or last revalidated.
+    """
+
+    value: dict | list
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+    stored_at: float = field(default_factory=time.time)
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Returns True if the entry is younger than ttl seconds."""
+        return time.time() - self.stored_at < ttl
+
+
+class MetadataCache(abc.ABC):
+    """
+    Base class for metadata caches used by a KServer.
+
+    Subclasses store CacheEntry objects keyed by a string. Entries younger than ttl seconds
+    are used without contacting the server; older entries are revalidated with a conditional
+    request (If-None-Match / If-Modified-Since) when the server sent validators, and
+    refetched otherwise.
+
+    Attributes:
+        ttl (float): Seconds an entry is used without revalidation.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL) -> None:
+        self.ttl = ttl
+
+    @abc.abstractmethod
+    def get(self, key: str) -> CacheEntry | None:
+        """Returns the entry stored under key, or None."""
+
+    @abc.abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Stores an entry under key, replacing any existing entry."""
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """Removes the entry stored under key, if any."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Removes all entries."""
+
+
+class MemoryCache(MetadataCache):
+    """
+    An in-memory, least-recently-used metadata cache.
+
+    Values are copied on the way in and out, so callers cannot change cached entries.
+
+    Attributes:
+        ttl (float): Seconds an entry is used without revalidation.
+        max_entries (int): The number of entries kept before the least recently used is evicted.
+    """
+
+    def __init__(
+        self, ttl: float = DEFAULT_CACHE_TTL, max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> None:
+        """
+        Parameters:
+            ttl (float, optional): Seconds an entry is used without revalidation. Defaults to 3600.
+            max_entries (int, optional): Maximum number of entries to keep. Defaults to 1024.
+        """
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = copy.deepcopy(entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteCache(MetadataCache):
+    """
+    An on-disk metadata cache backed by a SQLite database.
+
+    The database can be shared between runs and between processes, so a batch job can start
+    with the metadata fetched by the previous run.
+
+    Attributes:
+        ttl (float): Seconds an entry is used without revalidation.
+        path (str): The path of the SQLite database file.
+    """
+
+    def __init__(self, path: str, ttl: float = DEFAULT_CACHE_TTL) -> None:
+        """
+        Opens the cache database, creating it if needed.
+
+        Parameters:
+            path (str): The path of the SQLite database file.
+            ttl (float, optional): Seconds an entry is used without revalidation. Defaults to 3600.
+        """
+        super().__init__(ttl)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, url TEXT NOT NULL, "
+                "etag TEXT, last_modified TEXT, stored_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, url, etag, last_modified, stored_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        value, url, etag, last_modified, stored_at = row
+        try:
+            value = json_loads(value)
+        except ValueError as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            self.delete(key)
+            return None
+        return CacheEntry(value, url, etag, last_modified, stored_at)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    json.dumps(entry.value),
+                    entry.url,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.stored_at,
+                ),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
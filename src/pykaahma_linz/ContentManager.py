@@ -3,14 +3,27 @@ ContentManager is a class that manages the content
 of a KServer instance.
 """
 
-import requests
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Iterator
+import geopandas as gpd
 from pykaahma_linz.CustomErrors import (
     KServerBadRequestError,
     KServerError,
     KUnknownItemTypeError,
 )
+from pykaahma_linz.JobResult import JobResult
 from pykaahma_linz.KVectorItem import KVectorItem
 from pykaahma_linz.KTableItem import KTableItem
+from .features import export as export_features
+from .features.Conversion import gdf_to_single_polygon_geojson
+from .features.json_decoder import json_loads
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_SEARCH_PAGE_SIZE = 100
 
 
 class ContentManager:
@@ -58,32 +71,33 @@ class ContentManager:
         """
 
         # Example: https://data.linz.govt.nz/services/api/v1.x/data/?id=51571
-        url = f"{self._kserver._api_url}data/?id={id}"
-        response = requests.get(url)
-        response.raise_for_status()
+        url = f"{self._kserver._api_url}data/"
+        return self._kserver.get(url, params={"id": id})
 
-        return response.json()
-
-    def _get_item_details(self, url: str) -> dict:
+    def _get_item_details(self, url: str, cache_key: str = None) -> dict:
         """
         Retrieves detailed information about a specific item.
 
         Parameters:
             url (str): The item URL to retrieve details for.
+            cache_key (str, optional): The key to cache the details under, if the KServer has a metadata cache.
 
         Returns:
             dict: The detailed information of the item.
         """
 
-        response = requests.get(url)
-        response.raise_for_status()
-
-        return response.json()
+        if cache_key is None:
+            return self._kserver.get(url)
+        return self._kserver._get_cached(url, cache_key)
 
     def get(self, id: str) -> dict:
         """
         Retrieves content by id from the KServer.
 
+        If the KServer has a metadata cache, the item details are cached by id. A cached item
+        is returned without any request until the cache TTL expires, and then revalidated
+        with a single conditional request to the item URL.
+
         Parameters:
             id (str): The id of the content to retrieve.
 
@@ -95,23 +109,31 @@ class ContentManager:
             KUnknownItemTypeError: If the item kind is not supported.
         """
 
-        search_result = self._search_by_id(id)
-        if not search_result or "error" in search_result:
-            raise KServerBadRequestError(
-                f"Content with id {id} not found or invalid request."
-            )
-        if len(search_result) == 0:
-            return None
-        elif len(search_result) > 1:
-            raise KServerBadRequestError(
-                f"Multiple contents found for id {id}. Please refine your search."
-            )
+        cache_key = f"item:{id}"
+        cache = self._kserver._cache
+        cached = cache.get(cache_key) if cache is not None else None
+        if cached is not None:
+            # The item URL is known from an earlier lookup, so the search can be skipped
+            item_url = cached.url
+        else:
+            search_result = self._search_by_id(id)
+            if not search_result or "error" in search_result:
+                raise KServerBadRequestError(
+                    f"Content with id {id} not found or invalid request."
+                )
+            if len(search_result) == 0:
+                return None
+            elif len(search_result) > 1:
+                raise KServerBadRequestError(
+                    f"Multiple contents found for id {id}. Please refine your search."
+                )
 
-        # Assuming the first item is the desired content
-        item_json = search_result[0]
-        if "url" not in item_json:
-            raise KServerError(f"Item with id {id} does not have a URL.")
-        item_details = self._get_item_details(item_json.get("url", ""))
+            # Assuming the first item is the desired content
+            item_json = search_result[0]
+            if "url" not in item_json:
+                raise KServerError(f"Item with id {id} does not have a URL.")
+            item_url = item_json.get("url", "")
+        item_details = self._get_item_details(item_url, cache_key=cache_key)
 
         # Based on the kind of item, return the appropriate item class.
         if item_details.get("kind") == "vector":
@@ -124,3 +146,208 @@ class ContentManager:
             )
 
         return item
+
+    def search(
+        self,
+        text: str = None,
+        kind: str = None,
+        type: str = None,
+        updated_since: datetime | str = None,
+        page_size: int = DEFAULT_SEARCH_PAGE_SIZE,
+        prefetch: bool = True,
+        **params: Any,
+    ) -> Iterator[dict]:
+        """
+        Searches the data catalogue, yielding matching entries one page at a time.
+
+        Pages are requested lazily by following the 'page-next' link of each response, so only one
+        page is held in memory. With prefetch, the next page is requested in the background
+        while the caller works through the current one.
+
+        Parameters:
+            text (str, optional): Free text to search for in titles, descriptions and tags.
+            kind (str, optional): The kind of item, e.g. 'vector' or 'table'.
+            type (str, optional): The type of item, e.g. 'layer' or 'table'.
+            updated_since (datetime or str, optional): Only return items updated after this time.
+            page_size (int, optional): The number of entries per page request. Defaults to 100.
+            prefetch (bool, optional): Request the next page while the current one is consumed. Defaults to True.
+            **params: Additional query parameters for the data listing.
+
+        Yields:
+            dict: A catalogue entry, with summary fields such as id, url, type, kind and title.
+                Use get() to retrieve the full item.
+
+        Raises:
+            KServerBadRequestError: If the request fails with a 400 status code.
+            KServerError: For other HTTP errors or request exceptions.
+        """
+        if isinstance(updated_since, datetime):
+            updated_since = updated_since.isoformat()
+        query = {
+            "q": text,
+            "kind": kind,
+            "type": type,
+            "updated_at.after": updated_since,
+            "page_size": page_size,
+            **params,
+        }
+        query = {key: value for key, value in query.items() if value is not None}
+        logger.debug(f"Searching data catalogue with {query=}")
+
+        url = f"{self._kserver._api_url}data/"
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            response = self._kserver._request("GET", url, params=query)
+            while True:
+                # Koordinates links pages with rel="page-next", carrying the query parameters
+                next_url = response.links.get("page-next", {}).get("url")
+                next_page = (
+                    executor.submit(self._kserver._request, "GET", next_url)
+                    if next_url and prefetch
+                    else None
+                )
+                yield from json_loads(response.content)
+                if not next_url:
+                    return
+                response = (
+                    next_page.result()
+                    if next_page is not None
+                    else self._kserver._request("GET", next_url)
+                )
+
+    def get_many(self, ids: list, max_workers: int = DEFAULT_MAX_WORKERS) -> list:
+        """
+        Retrieves several items by id, looking them up concurrently.
+
+        Each lookup is the same as get(), run on up to max_workers threads that share the
+        KServer connection pool (and metadata cache, if one is configured). Duplicate ids are
+        only looked up once and share the same instance.
+
+        Parameters:
+            ids (list): The ids of the items to retrieve.
+            max_workers (int, optional): The maximum number of lookups in flight at once. Defaults to 8.
+
+        Returns:
+            list: The KVectorItem/KTableItem instances, in the same order as ids.
+
+        Raises:
+            ValueError: If max_workers is less than 1.
+            KServerBadRequestError: If an item is not found or the request is invalid.
+            KUnknownItemTypeError: If an item kind is not supported.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        unique_ids = list(dict.fromkeys(ids))
+        if not unique_ids:
+            return []
+        logger.debug(
+            f"Retrieving {len(unique_ids)} items with up to {max_workers} concurrent lookups"
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(unique_ids))
+        ) as executor:
+            items = dict(zip(unique_ids, executor.map(self.get, unique_ids)))
+        return [items[id] for id in ids]
+
+    def export(
+        self,
+        items: list,
+        export_format: str | dict,
+        crs: str = None,
+        extent: dict | gpd.GeoDataFrame = None,
+        poll_interval: int = 10,
+        timeout: int = 600,
+        validate: bool = True,
+        **kwargs: Any,
+    ) -> JobResult:
+        """
+        Exports several items together as a single export job.
+
+        The server packages all the items into one download, so there is one job to poll
+        and one file to download instead of one per item.
+
+        Parameters:
+            items (list): The items to export, as KVectorItem/KTableItem instances or ids.
+            export_format (str or dict): The format to export the items in. The API takes one format per
+                kind of item, so pass a dictionary keyed by kind to use different formats for vector
+                and table items, e.g. {"vector": "geopackage", "table": "csv"}.
+            crs (str, optional): The coordinate reference system to use for the vector items.
+            extent (dict or gpd.GeoDataFrame, optional): The extent to use for the vector items. Should be a GeoJSON dictionary or a GeoDataFrame.
+            poll_interval (int, optional): The interval in seconds to poll the export job status. Default is 10 seconds.
+            timeout (int, optional): The maximum time in seconds to wait for the export job to complete. Default is 600 seconds (10 minutes).
+            validate (bool, optional): Validate the request with the server before exporting. A successful validation
+                is cached on the KServer, so repeated exports of the same request are only validated once.
+                Pass False to skip validation entirely. Default is True.
+            **kwargs: Additional parameters for the export request.
+
+        Returns:
+            JobResult: A JobResult instance containing the export job details.
+
+        Raises:
+            ValueError: If no items are given, a format is not supported by an item, or the export fails validation.
+        """
+        if not items:
+            raise ValueError("At least one item must be provided for an export.")
+        items = [
+            item if isinstance(item, (KVectorItem, KTableItem)) else self.get(item)
+            for item in items
+        ]
+        logger.debug(
+            f"Exporting items with ids: {[item.id for item in items]} in format: {export_format}"
+        )
+
+        if isinstance(extent, gpd.GeoDataFrame):
+            logger.debug("Converting extent GeoDataFrame to GeoJSON for export")
+            extent = gdf_to_single_polygon_geojson(extent)
+
+        export_items = []
+        for item in items:
+            item_format = (
+                export_format.get(item.kind)
+                if isinstance(export_format, dict)
+                else export_format
+            )
+            if item_format is None:
+                raise ValueError(
+                    f"No export format given for {item.kind} item with id: {item.id}"
+                )
+            export_items.append(
+                (
+                    item.id,
+                    item.type,
+                    item.kind,
+                    item._resolve_export_format(item_format),
+                )
+            )
+
+        if validate:
+            is_valid = self._kserver._validate_export(
+                export_items, crs=crs, extent=extent, **kwargs
+            )
+        else:
+            logger.debug("Skipping export validation")
+            is_valid = True
+        if not is_valid:
+            raise ValueError(
+                f"Export validation failed for items with ids: {[item.id for item in items]}"
+            )
+
+        export_request = export_features.request_multi_export(
+            self._kserver._api_url,
+            self._kserver._api_key,
+            export_items,
+            crs=crs,
+            extent=extent,
+            client=self._kserver.client,
+            **kwargs,
+        )
+
+        job_result = JobResult(
+            export_request, self._kserver, poll_interval=poll_interval, timeout=timeout
+        )
+        for item in items:
+            item._jobs.append(job_result)
+        logger.info(
+            f"Export job created for items with ids: {[item.id for item in items]}, job id: {job_result.id}"
+        )
+        return job_result
@@ -6,12 +6,49 @@ import logging
 import os
 import time
 import asyncio
+import re
 import httpx
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 import hashlib
+import json
+from tenacity import (
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+from pykaahma_linz.CustomErrors import KServerError
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_CONCURRENT_DOWNLOADS = 4  # Jobs downloaded at once by download_all_async
+DEFAULT_DIGEST = "sha256"  # Always computed, and stored as DownloadResult.checksum
+# Smallest byte range fetched by a multi-part download
+MULTIPART_MIN_PART_SIZE = 8 * 1024 * 1024
+HASH_READ_SIZE = 1024 * 1024  # Bytes read at a time when checksumming a file
+CONTENT_RANGE_PATTERN = re.compile(r"^bytes\s+(\d+)-\d+/(\d+)$")
+PART_FILE_SUFFIX = ".part"  # Downloads are written here and renamed once verified
+# Written next to a '.part' file, identifying the download it belongs to
+PART_STATE_SUFFIX = ".json"
+DEFAULT_DOWNLOAD_RETRIES = (
+    3  # Times an interrupted download is resumed before giving up
+)
+DOWNLOAD_RETRY_WAIT = wait_exponential(multiplier=1, min=2, max=30)
+
+
+class _IncompleteDownloadError(KServerError):
+    """Raised when a download ends before the expected number of bytes is received."""
+
+    pass
+
+
+def _is_retryable_download_error(exception: BaseException) -> bool:
+    """Network errors, server errors and incomplete downloads are retried. Client errors are not."""
+    if isinstance(exception, httpx.HTTPStatusError):
+        return exception.response.status_code >= 500
+    return isinstance(exception, (httpx.TransportError, _IncompleteDownloadError))
+
 
 @dataclass
 class DownloadResult:
@@ -31,6 +68,8 @@ class DownloadResult:
         job_id (int): The unique identifier of the export job.
         completed_at (float): The timestamp (seconds since epoch) when the download completed.
         checksum (str | None): The SHA256 checksum of the downloaded file, or None if unavailable.
+        checksums (dict): Hex digests of the downloaded file keyed by hashlib algorithm name,
+            including 'sha256' and any additional digests requested.
     """
 
     folder: str
@@ -42,6 +81,149 @@ class DownloadResult:
     job_id: int
     completed_at: float
     checksum: str | None = None
+    checksums: dict = field(default_factory=dict)
+
+
+def _new_hashers(digests: list[str] | None) -> dict:
+    """
+    Creates the hash objects used to checksum a download as its chunks are written.
+
+    Parameters:
+        digests (list[str], optional): Additional hashlib algorithm names, e.g. ["md5"]. SHA256 is always included.
+
+    Returns:
+        dict: hashlib hash objects keyed by algorithm name.
+
+    Raises:
+        ValueError: If an algorithm is not supported by hashlib, or has a variable length digest.
+    """
+    names = [DEFAULT_DIGEST] + [d.lower() for d in digests or [] if d]
+    hashers = {name: hashlib.new(name) for name in dict.fromkeys(names)}
+    for name, hasher in hashers.items():
+        if hasher.digest_size == 0:
+            raise ValueError(
+                f"Digest '{name}' has a variable length and is not supported."
+            )
+    return hashers
+
+
+def _parse_content_range(response: httpx.Response) -> tuple[int, int] | None:
+    """Returns the first byte and total size from a 206 response's Content-Range header, or None if unknown."""
+    match = CONTENT_RANGE_PATTERN.match(response.headers.get("Content-Range", ""))
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def _content_length(response: httpx.Response) -> int | None:
+    """Returns the size of the decoded body from the Content-Length header, or None if unknown."""
+    if "Content-Encoding" in response.headers:
+        return None  # Content-Length is the encoded size
+    length = response.headers.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+def _split_ranges(
+    total_size: int, parts: int, min_part_size: int = MULTIPART_MIN_PART_SIZE
+) -> list[tuple[int, int]]:
+    """
+    Splits a file into contiguous, inclusive byte ranges.
+
+    Parameters:
+        total_size (int): The size of the file in bytes.
+        parts (int): The maximum number of ranges.
+        min_part_size (int, optional): The smallest range to create, so small files use fewer ranges.
+
+    Returns:
+        list[tuple[int, int]]: The (start, end) byte offsets of each range, end inclusive.
+            Empty if the file is empty.
+    """
+    if total_size <= 0:
+        return []
+    parts = max(1, min(parts, total_size // max(min_part_size, 1)))
+    part_size = -(-total_size // parts)  # ceiling division
+    return [
+        (start, min(start + part_size, total_size) - 1)
+        for start in range(0, total_size, part_size)
+    ]
+
+
+def _download_range(
+    client: httpx.Client, url: str, file_path: str, start: int, end: int
+) -> None:
+    """
+    Fetches one byte range of a file and writes it at its offset in a preallocated file.
+
+    Parameters:
+        client (httpx.Client): The HTTP client to send the request with.
+        url (str): The resolved download URL.
+        file_path (str): The preallocated file to write into.
+        start (int): The first byte of the range.
+        end (int): The last byte of the range, inclusive.
+
+    Raises:
+        KServerError: If the server does not answer with a partial response.
+        _IncompleteDownloadError: If fewer bytes than requested are received, so the range should be retried.
+    """
+    with client.stream("GET", url, headers={"Range": f"bytes={start}-{end}"}) as r:
+        r.raise_for_status()
+        if r.status_code != 206:
+            raise KServerError(
+                f"Expected a partial response for bytes {start}-{end}, got status {r.status_code}."
+            )
+        written = 0
+        with open(file_path, "r+b") as f:
+            f.seek(start)
+            for chunk in r.iter_bytes():
+                f.write(chunk)
+                written += len(chunk)
+    if written != end - start + 1:
+        raise _IncompleteDownloadError(
+            f"Received {written} bytes for range {start}-{end}, expected {end - start + 1}."
+        )
+
+
+def _stream_to_file(
+    response: httpx.Response, file_path: str, hashers: dict, mode: str = "wb"
+) -> None:
+    """Writes (or with mode 'ab', appends) a streamed response body to a file, updating the hash objects with each chunk."""
+    with open(file_path, mode) as f:
+        for chunk in response.iter_bytes():
+            f.write(chunk)
+            for hasher in hashers.values():
+                hasher.update(chunk)
+
+
+def _read_part_state(part_path: str) -> dict | None:
+    """Returns the state saved next to a '.part' file, or None if there is none or it cannot be read."""
+    state_path = f"{part_path}{PART_STATE_SUFFIX}"
+    if not os.path.exists(state_path):
+        return None
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read partial download state {state_path}: {e}")
+        return None
+
+
+def _write_part_state(part_path: str, state: dict) -> None:
+    """Saves the state identifying the download a '.part' file belongs to."""
+    with open(f"{part_path}{PART_STATE_SUFFIX}", "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+
+def _discard_part(part_path: str) -> None:
+    """Removes a '.part' file and its saved state, if they exist."""
+    for path in (part_path, f"{part_path}{PART_STATE_SUFFIX}"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _hash_file(file_path: str, hashers: dict) -> None:
+    """Updates the hash objects with the contents of a file, read in chunks."""
+    with open(file_path, "rb") as f:
+        while chunk := f.read(HASH_READ_SIZE):
+            for hasher in hashers.values():
+                hasher.update(chunk)
 
 
 class JobResult:
@@ -70,6 +252,7 @@ class JobResult:
         download_completed_at (float): The timestamp when the download completed.
         download_resolved_url (str): The final resolved URL after redirects.
         download_checksum (str | None): The SHA256 checksum of the downloaded file.
+        download_checksums (dict): All checksums of the downloaded file, keyed by algorithm name.
     """
 
     def __init__(
@@ -216,52 +399,394 @@ class JobResult:
 
         return self._last_response
 
-    def download(self, folder: str, file_name: str | None = None) -> DownloadResult:
+    def download(
+        self,
+        folder: str,
+        file_name: str | None = None,
+        digests: list[str] | None = None,
+        parts: int = 1,
+        retries: int = DEFAULT_DOWNLOAD_RETRIES,
+    ) -> DownloadResult:
         """
         Waits for job to finish, then downloads the file synchronously.
 
+        The file is written to a '.part' file next to the destination, which is only renamed into
+        place once its size has been verified. If the download is interrupted it is resumed from
+        the end of the '.part' file with a Range request, up to `retries` times. A later call to
+        download also resumes from a '.part' file left behind by an earlier failure.
+
+        The checksums are computed on the chunks as they are written, so the file is never
+        read back or held in memory (only the already downloaded bytes are read when resuming).
+
+        With parts greater than 1, a multi-part download is attempted: the file's size is
+        probed with a one byte Range request, and byte ranges are then fetched concurrently into
+        a preallocated file. If the server does not support Range requests, the probe's response
+        is streamed as a normal single download instead. In multi-part mode the checksums are
+        computed by reading the finished file in chunks, since the parts arrive out of order,
+        and a failed attempt restarts the download rather than resuming it.
+
         Parameters:
             folder (str): The folder where the file will be saved.
             file_name (str, optional): The name of the file to save. If None, uses job name.
+            digests (list[str], optional): Additional hashlib algorithms to compute, e.g. ["md5"].
+                SHA256 is always computed.
+            parts (int, optional): The maximum number of byte ranges to fetch concurrently. Each range
+                is at least MULTIPART_MIN_PART_SIZE bytes. Defaults to 1 (a single stream).
+            retries (int, optional): The number of times to resume after a network error, server error
+                or incomplete download. Defaults to 3.
 
         Returns:
             DownloadResult: An object containing details about the downloaded file.
 
         Raises:
-            ValueError: If the download URL is not available.
+            ValueError: If a digest is not supported, or the download URL is not available.
+            KServerError: If the download is still incomplete after all retries.
+            httpx.HTTPError: If the download fails with a client error, or a network or server error persists.
         """
 
+        _new_hashers(digests)  # validate the digests before waiting on the job
         self.output()  # ensure job is complete
         if not self.download_url:
             raise ValueError(
                 "Download URL not available. Job may not have completed successfully."
             )
 
+        file_name, file_path = self._prepare_download(folder, file_name)
+        part_path = f"{file_path}{PART_FILE_SUFFIX}"
+
+        for attempt in Retrying(
+            retry=retry_if_exception(_is_retryable_download_error),
+            stop=stop_after_attempt(retries + 1),
+            wait=DOWNLOAD_RETRY_WAIT,
+            before_sleep=lambda state: logger.warning(
+                f"Download of job {self._id} interrupted: {state.outcome.exception()}. Resuming."
+            ),
+            reraise=True,
+        ):
+            with attempt:
+                final_url, hashers = self._download_to_part(
+                    part_path, digests, parts, retries
+                )
+
+        os.replace(part_path, file_path)
+        _discard_part(part_path)  # the saved state
+        return self._record_download(folder, file_name, file_path, final_url, hashers)
+
+    def _part_state(self, response: httpx.Response) -> dict:
+        """
+        Builds the state identifying the download a '.part' file belongs to.
+
+        Parameters:
+            response (httpx.Response): The response the file is being written from.
+
+        Returns:
+            dict: The download URL, job id and the response's ETag and Last-Modified validators.
+        """
+        return {
+            "download_url": self.download_url,
+            "job_id": self._id,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+    def _resume_validator(self, part_path: str) -> str | None:
+        """
+        Returns the validator to resume a '.part' file with, or None if it cannot be resumed.
+
+        A '.part' file can only be resumed if its saved state shows it is from this job's
+        download and holds an ETag or Last-Modified validator to send as If-Range.
+
+        Parameters:
+            part_path (str): The path of the '.part' file.
+
+        Returns:
+            str or None: The ETag or Last-Modified value of the partial download.
+        """
+        state = _read_part_state(part_path)
+        if (
+            state is None
+            or state.get("download_url") != self.download_url
+            or state.get("job_id") != self._id
+        ):
+            return None
+        return state.get("etag") or state.get("last_modified")
+
+    def _download_to_part(
+        self,
+        part_path: str,
+        digests: list[str] | None,
+        parts: int,
+        retries: int = DEFAULT_DOWNLOAD_RETRIES,
+    ) -> tuple[str, dict]:
+        """
+        Makes one attempt to complete the '.part' file, resuming from its current size.
+
+        A '.part' file is only resumed if its saved state matches this job's download. The
+        resume request carries If-Range, so if the file on the server has changed it is sent
+        in full and the partial file is replaced.
+
+        Parameters:
+            part_path (str): The path of the '.part' file.
+            digests (list[str], optional): Additional hashlib algorithms to compute.
+            parts (int): The maximum number of byte ranges to fetch concurrently for a fresh download.
+            retries (int, optional): The number of times each byte range of a multi-part download is retried.
+
+        Returns:
+            tuple[str, dict]: The final resolved URL and the hash objects for the complete file.
+
+        Raises:
+            _IncompleteDownloadError: If the file is not complete, so the attempt should be retried.
+        """
+        hashers = _new_hashers(digests)
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        validator = self._resume_validator(part_path) if offset else None
+        if offset and validator is None:
+            logger.debug(
+                f"Partial download {part_path} is not from job {self._id}, starting again"
+            )
+            _discard_part(part_path)
+            offset = 0
+        if offset:
+            headers = {"Range": f"bytes={offset}-", "If-Range": validator}
+        elif parts > 1:
+            headers = {"Range": "bytes=0-0"}
+        else:
+            headers = None
+
+        # The pooled client only sends the API key to the Koordinates host, so the
+        # redirect to the download location (e.g. S3) is followed without it. The body
+        # is streamed from that single request, so the file is only transferred once.
+        client = self._kserver.client
+        expected_size = None
+        with client.stream(
+            "GET", self.download_url, headers=headers, follow_redirects=True
+        ) as r:
+            range_not_satisfiable = r.status_code == 416
+            if range_not_satisfiable and offset:
+                # The partial file does not match the current download, so start again
+                _discard_part(part_path)
+                raise _IncompleteDownloadError(
+                    f"Partial download of job {self._id} is not valid for this file."
+                )
+            if not range_not_satisfiable:
+                r.raise_for_status()
+            final_url = str(r.url)
+            # An empty file cannot satisfy the probe's byte range; it is fetched below in one go
+            probed = (r.status_code == 206 or range_not_satisfiable) and not offset
+            state = self._part_state(r)
+            if r.status_code == 206:
+                content_range = _parse_content_range(r)
+                expected_size = content_range[1] if content_range else None
+                if offset:
+                    response_validator = state["etag"] or state["last_modified"]
+                    if (
+                        content_range is None
+                        or content_range[0] != offset
+                        or (response_validator and response_validator != validator)
+                    ):
+                        _discard_part(part_path)
+                        raise _IncompleteDownloadError(
+                            f"Server did not resume job {self._id} from byte {offset}."
+                        )
+                    logger.debug(f"Resuming job {self._id} from byte {offset}")
+                    _hash_file(part_path, hashers)
+                    _stream_to_file(r, part_path, hashers, mode="ab")
+            elif not range_not_satisfiable:
+                # A single stream was requested, Range is not supported, or the file has
+                # changed since the partial download (If-Range), so this is the whole file
+                if offset:
+                    logger.debug(f"Server cannot resume, restarting job {self._id}")
+                _write_part_state(part_path, state)
+                _stream_to_file(r, part_path, hashers)
+                expected_size = _content_length(r)
+
+        if probed:
+            _write_part_state(part_path, state)
+        if probed and (
+            expected_size is None or expected_size < MULTIPART_MIN_PART_SIZE
+        ):
+            # Unknown, empty or small files are not worth splitting into ranges
+            logger.debug(
+                f"Download size {expected_size} too small or unknown, using a single stream."
+            )
+            with client.stream("GET", final_url) as r:
+                r.raise_for_status()
+                _stream_to_file(r, part_path, hashers)
+                if expected_size is None:
+                    expected_size = _content_length(r)
+        elif probed:
+            try:
+                self._download_parts(
+                    client, final_url, part_path, expected_size, parts, retries
+                )
+            except Exception:
+                # A preallocated file with missing ranges cannot be resumed
+                _discard_part(part_path)
+                raise
+            _hash_file(part_path, hashers)
+
+        size = os.path.getsize(part_path)
+        if expected_size is not None and size != expected_size:
+            raise _IncompleteDownloadError(
+                f"Downloaded {size} of {expected_size} bytes for job {self._id}."
+            )
+        return final_url, hashers
+
+    def _download_parts(
+        self,
+        client: httpx.Client,
+        url: str,
+        file_path: str,
+        total_size: int,
+        parts: int,
+        retries: int = DEFAULT_DOWNLOAD_RETRIES,
+    ) -> None:
+        """
+        Downloads a file as concurrent byte ranges into a preallocated file.
+
+        A range that fails with a network error, server error or short read is fetched again,
+        up to `retries` times, without affecting the other ranges.
+
+        Parameters:
+            client (httpx.Client): The HTTP client to send the requests with.
+            url (str): The resolved download URL, which must support Range requests.
+            file_path (str): The path to write the file to.
+            total_size (int): The size of the file in bytes.
+            parts (int): The maximum number of ranges to fetch concurrently.
+            retries (int, optional): The number of times to retry each range. Defaults to 3.
+
+        Raises:
+            KServerError: If a range is still incomplete after all retries.
+        """
+        ranges = _split_ranges(total_size, parts, MULTIPART_MIN_PART_SIZE)
+        logger.debug(
+            f"Downloading job {self._id} ({total_size} bytes) in {len(ranges)} parts"
+        )
+        with open(file_path, "wb") as f:
+            f.truncate(total_size)
+
+        def download_range(start: int, end: int) -> None:
+            for attempt in Retrying(
+                retry=retry_if_exception(_is_retryable_download_error),
+                stop=stop_after_attempt(retries + 1),
+                wait=DOWNLOAD_RETRY_WAIT,
+                before_sleep=lambda state: logger.warning(
+                    f"Range {start}-{end} of job {self._id} failed: {state.outcome.exception()} Retrying."
+                ),
+                reraise=True,
+            ):
+                with attempt:
+                    _download_range(client, url, file_path, start, end)
+
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(download_range, start, end) for start, end in ranges
+            ]
+            for future in futures:
+                future.result()
+
+    async def download_async(
+        self,
+        folder: str,
+        file_name: str | None = None,
+        digests: list[str] | None = None,
+    ) -> DownloadResult:
+        """
+        Waits for job to finish, then downloads the file asynchronously.
+
+        The file is streamed to disk in chunks through the KServer's pooled async client,
+        and the checksums are computed as the chunks arrive.
+
+        Parameters:
+            folder (str): The folder where the file will be saved.
+            file_name (str, optional): The name of the file to save. If None, uses job name.
+            digests (list[str], optional): Additional hashlib algorithms to compute, e.g. ["md5"].
+                SHA256 is always computed.
+
+        Returns:
+            DownloadResult: An object containing details about the downloaded file.
+
+        Raises:
+            ValueError: If a digest is not supported, or the download URL is not available.
+            KServerError: If fewer bytes are received than the server reported.
+        """
+
+        hashers = _new_hashers(digests)
+        await self.output_async()  # ensure job is complete
+        if not self.download_url:
+            raise ValueError(
+                "Download URL not available. Job may not have completed successfully."
+            )
+
+        file_name, file_path = self._prepare_download(folder, file_name)
+
+        # The pooled client only sends the API key to the Koordinates host, so the
+        # redirect to the download location (e.g. S3) is followed without it.
+        # The file is only renamed into place once its size has been verified.
+        client = self._kserver.async_client
+        part_path = f"{file_path}{PART_FILE_SUFFIX}"
+        async with client.stream("GET", self.download_url, follow_redirects=True) as r:
+            r.raise_for_status()
+            final_url = str(r.url)
+            expected_size = _content_length(r)
+            with open(part_path, "wb") as f:
+                async for chunk in r.aiter_bytes():
+                    f.write(chunk)
+                    for hasher in hashers.values():
+                        hasher.update(chunk)
+
+        size = os.path.getsize(part_path)
+        if expected_size is not None and size != expected_size:
+            raise KServerError(
+                f"Downloaded {size} of {expected_size} bytes for job {self._id}."
+            )
+        os.replace(part_path, file_path)
+        _discard_part(part_path)  # any state left by an earlier synchronous attempt
+        logger.debug(f"Job {self._id} downloaded to {file_path}")
+        return self._record_download(folder, file_name, file_path, final_url, hashers)
+
+    def _prepare_download(self, folder: str, file_name: str | None) -> tuple[str, str]:
+        """
+        Resolves the file name and path for a download, creating the folder if needed.
+
+        Parameters:
+            folder (str): The folder where the file will be saved.
+            file_name (str, optional): The name of the file to save, without extension. If None, uses job name.
+
+        Returns:
+            tuple[str, str]: The file name and the full file path.
+        """
         file_name = f"{file_name}.zip" if file_name else f"{self.name}.zip"
         file_path = os.path.join(folder, file_name)
         if not os.path.exists(folder):
             os.makedirs(folder, exist_ok=True)
+        return file_name, file_path
 
-        headers = {"Authorization": f"key {self._kserver._api_key}"}
-
-        with httpx.Client(follow_redirects=True) as client:
-            resp = client.get(self.download_url, headers=headers, follow_redirects=True)
-            resp.raise_for_status()
-            final_url = str(resp.url)
+    def _record_download(
+        self,
+        folder: str,
+        file_name: str,
+        file_path: str,
+        final_url: str,
+        hashers: dict,
+    ) -> DownloadResult:
+        """
+        Stores the download metadata on the JobResult and returns it as a DownloadResult.
 
-            with client.stream("GET", final_url) as r, open(file_path, "wb") as f:
-                r.raise_for_status()
-                for chunk in r.iter_bytes():
-                    f.write(chunk)
+        Parameters:
+            folder (str): The folder the file was saved in.
+            file_name (str): The name of the downloaded file.
+            file_path (str): The full path to the downloaded file.
+            final_url (str): The final resolved URL after redirects.
+            hashers (dict): The hash objects updated with the file's contents, keyed by algorithm name.
 
+        Returns:
+            DownloadResult: An object containing details about the downloaded file.
+        """
         file_size_bytes = os.path.getsize(file_path)
-        checksum = None
-        try:
-            with open(file_path, "rb") as f:
-                checksum = hashlib.sha256(f.read()).hexdigest()
-        except Exception:
-            pass
         completed_at = time.time()
+        checksums = {name: hasher.hexdigest() for name, hasher in hashers.items()}
+        checksum = checksums.get(DEFAULT_DIGEST)
 
         # Set as attributes on the JobResult instance
         self.download_folder = folder
@@ -271,6 +796,7 @@ class JobResult:
         self.download_completed_at = completed_at
         self.download_resolved_url = final_url
         self.download_checksum = checksum
+        self.download_checksums = checksums
 
         return DownloadResult(
             folder=folder,
@@ -282,4 +808,46 @@ class JobResult:
             job_id=self._id,
             completed_at=completed_at,
             checksum=checksum,
+            checksums=checksums,
         )
+
+
+async def download_all_async(
+    jobs: list[JobResult],
+    folder: str,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENT_DOWNLOADS,
+    return_exceptions: bool = False,
+    digests: list[str] | None = None,
+) -> list[DownloadResult]:
+    """
+    Waits for many jobs to finish and downloads their files concurrently.
+
+    Each job is polled with output_async and then downloaded with download_async. At most
+    max_concurrency jobs are waited on and downloaded at once; the rest start as slots free up.
+
+    Parameters:
+        jobs (list[JobResult]): The jobs to download.
+        folder (str): The folder where the files will be saved. Each file is named after its job.
+        max_concurrency (int, optional): The maximum number of jobs in progress at once. Defaults to 4.
+        return_exceptions (bool, optional): If True, a failed job's exception is returned in its place
+            instead of being raised, so the other downloads still complete. Defaults to False.
+        digests (list[str], optional): Additional hashlib algorithms to compute for each file, e.g. ["md5"].
+
+    Returns:
+        list[DownloadResult]: The download results, in the same order as jobs.
+
+    Raises:
+        ValueError: If max_concurrency is less than 1.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be a positive integer.")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(job: JobResult) -> DownloadResult:
+        async with semaphore:
+            logger.debug(f"Waiting for job {job.id} to complete")
+            return await job.download_async(folder, digests=digests)
+
+    return await asyncio.gather(
+        *(run(job) for job in jobs), return_exceptions=return_exceptions
+    )
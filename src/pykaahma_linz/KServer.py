@@ -3,17 +3,36 @@ KServer.py
 A class to connect with a Koordinates server.
 """
 
-import requests
 import os
+import asyncio
 import logging
+import threading
+import time
+from typing import Any
+from pykaahma_linz.Cache import CacheEntry, MemoryCache, MetadataCache
 from pykaahma_linz.ContentManager import ContentManager
 from pykaahma_linz.CustomErrors import KServerError, KServerBadRequestError
+from pykaahma_linz.Transport import (
+    TransportMetrics,
+    KoordinatesKeyAuth,
+    MetricsTransport,
+    AsyncMetricsTransport,
+)
+from pykaahma_linz.features.json_decoder import json_loads
+from pykaahma_linz.features import export as export_features
 import httpx
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_BASE_URL = "https://data.linz.govt.nz/"
 DEFAULT_API_VERSION = "v1.x"
+DEFAULT_TIMEOUT = 30  # seconds
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30  # seconds
+DEFAULT_VALIDATION_CACHE_TTL = 3600  # seconds
+DEFAULT_VALIDATION_CACHE_SIZE = 256  # successful export validations kept
+DEFAULT_SERVICES_CACHE_TTL = 86400  # seconds
 
 
 class KServer:
@@ -29,6 +48,28 @@ class KServer:
         _content_manager (ContentManager or None): Cached ContentManager instance.
         _wfs_manager (object or None): Cached WFS manager instance (if implemented).
         _api_key (str): The API key for authenticating requests.
+        _timeout (float): Default timeout in seconds for HTTP requests.
+        _limits (httpx.Limits): Connection pool limits shared by the sync and async clients.
+        _http2 (bool): Whether HTTP/2 is enabled on the pooled clients.
+        _client (httpx.Client or None): Lazily created, long-lived synchronous client.
+        _async_client (httpx.AsyncClient or None): Lazily created, long-lived asynchronous client.
+        _transport (httpx.BaseTransport or None): Custom synchronous transport, e.g. httpx.MockTransport.
+        _async_transport (httpx.AsyncBaseTransport or None): Custom asynchronous transport.
+        _metrics (TransportMetrics): Running totals for all requests sent through this server.
+        _validation_cache_ttl (float): Seconds a successful export validation is reused for.
+        _cache (MetadataCache or None): Cache for metadata such as item details, or None to disable caching.
+        _services_cache (MetadataCache): Cache for item service descriptors. The metadata cache if one is
+            given, otherwise an in-memory cache.
+        _validated_exports (MemoryCache): Recent successful export validations, keyed by export_validation_key.
+            Bounded, so a long running process exporting many different requests does not grow it forever.
+
+    All modules (content lookups, WFS queries, exports and job downloads) send their requests
+    through the pooled clients, so they share the same connection pool, API key injection,
+    timeouts and metrics. Pass a custom transport (e.g. httpx.MockTransport) to run offline.
+
+    The pooled clients keep connections alive between requests. Use the KServer as a
+    context manager (``with KServer(...)`` or ``async with KServer(...)``), or call
+    close() / aclose(), to release them when finished.
     """
 
     def __init__(
@@ -36,6 +77,16 @@ class KServer:
         api_key,
         base_url=DEFAULT_BASE_URL,
         api_version=DEFAULT_API_VERSION,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        transport: httpx.BaseTransport = None,
+        async_transport: httpx.AsyncBaseTransport = None,
+        validation_cache_ttl: float = DEFAULT_VALIDATION_CACHE_TTL,
+        cache: MetadataCache = None,
+        services_cache_ttl: float = DEFAULT_SERVICES_CACHE_TTL,
     ) -> None:
         """
         Initializes the KServer instance with the base URL, API version, and API key.
@@ -44,6 +95,24 @@ class KServer:
             api_key (str): The API key for authenticating with the Koordinates server.
             base_url (str, optional): The base URL of the Koordinates server. Defaults to 'https://data.linz.govt.nz/'.
             api_version (str, optional): The API version to use. Defaults to 'v1.x'.
+            timeout (float, optional): Default timeout in seconds for HTTP requests. Defaults to 30.
+            max_connections (int, optional): Maximum number of concurrent connections in the pool. Defaults to 20.
+            max_keepalive_connections (int, optional): Maximum number of idle connections kept alive. Defaults to 10.
+            keepalive_expiry (float, optional): Seconds an idle connection is kept alive. Defaults to 30.
+            http2 (bool, optional): Enable HTTP/2 on the pooled clients. Requires the 'h2' package
+                (pip install httpx[http2]); falls back to HTTP/1.1 if it is not installed. Defaults to False.
+            transport (httpx.BaseTransport, optional): A custom transport for synchronous requests, such as
+                httpx.MockTransport for offline testing. Pool limits and http2 do not apply to custom transports.
+            async_transport (httpx.AsyncBaseTransport, optional): A custom transport for asynchronous requests.
+                Defaults to the synchronous transport if it also supports async requests.
+            validation_cache_ttl (float, optional): Seconds a successful export validation is reused for
+                by later exports of the same items, format, CRS and extent. Set to 0 to validate every
+                export. Defaults to 3600.
+            cache (MetadataCache, optional): A cache for item metadata, e.g. MemoryCache() or
+                SQLiteCache("metadata.db") to share it between runs. Defaults to None (no caching).
+            services_cache_ttl (float, optional): Seconds item service descriptors are kept in memory when
+                no cache is given. Ignored if a cache is given, which then also holds the service
+                descriptors. Defaults to 86400.
         """
         self._base_url = base_url
         self._api_version = api_version
@@ -52,8 +121,49 @@ class KServer:
         self._api_key = api_key
         if not self._api_key:
             raise KServerError("API key must be provided.")
+        self._timeout = timeout
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2 = http2 and self._h2_available()
+        self._client = None
+        self._async_client = None
+        self._async_client_loop = None
+        self._client_lock = threading.Lock()
+        self._transport = transport
+        if async_transport is None and isinstance(transport, httpx.AsyncBaseTransport):
+            async_transport = transport
+        self._async_transport = async_transport
+        self._metrics = TransportMetrics()
+        self._cache = cache
+        self._services_cache = (
+            cache if cache is not None else MemoryCache(ttl=services_cache_ttl)
+        )
+        self._validation_cache_ttl = validation_cache_ttl
+        self._validated_exports = MemoryCache(
+            ttl=validation_cache_ttl, max_entries=DEFAULT_VALIDATION_CACHE_SIZE
+        )
         logger.debug(f"KServer initialized with base URL: {self._base_url}")
 
+    @staticmethod
+    def _h2_available() -> bool:
+        """
+        Checks whether the optional 'h2' package required for HTTP/2 is installed.
+
+        Returns:
+            bool: True if HTTP/2 support is available, False otherwise.
+        """
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning(
+                "HTTP/2 requested but the 'h2' package is not installed. Falling back to HTTP/1.1."
+            )
+            return False
+        return True
+
     @property
     def _service_url(self) -> str:
         """
@@ -96,39 +206,306 @@ class KServer:
             self._content_manager = ContentManager(self)
         return self._content_manager
 
-    def get(self, url: str, params: dict = None) -> dict:
+    @property
+    def metrics(self) -> TransportMetrics:
         """
-        Makes a synchronous GET request to the specified URL with the provided parameters.
-        Injects the API key into the request headers.
+        Returns the running request metrics for this server.
+
+        Returns:
+            TransportMetrics: Request counts, errors, bytes received and time spent.
+        """
+        return self._metrics
+
+    @property
+    def _auth(self) -> KoordinatesKeyAuth:
+        """
+        Returns the auth handler that injects the API key for requests to this server.
+
+        Returns:
+            KoordinatesKeyAuth: The auth handler scoped to the server host.
+        """
+        return KoordinatesKeyAuth(self._api_key, httpx.URL(self._base_url).host)
+
+    @property
+    def client(self) -> httpx.Client:
+        """
+        Returns the pooled synchronous HTTP client, creating it on first use.
+
+        Returns:
+            httpx.Client: The long-lived client shared by all synchronous requests.
+        """
+        client = self._client
+        if client is not None and not client.is_closed:
+            return client
+        # Several threads (e.g. ContentManager.get_many) may ask for the client at once,
+        # so it is created under a lock to avoid building and leaking extra pools.
+        with self._client_lock:
+            if self._client is None or self._client.is_closed:
+                logger.debug("Creating pooled httpx.Client for KServer")
+                transport = self._transport or httpx.HTTPTransport(
+                    limits=self._limits, http2=self._http2
+                )
+                self._client = httpx.Client(
+                    auth=self._auth,
+                    timeout=self._timeout,
+                    transport=MetricsTransport(transport, self._metrics),
+                )
+            return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        Returns the pooled asynchronous HTTP client, creating it on first use.
+
+        An httpx.AsyncClient is bound to the event loop it was first used on, so a new
+        client is created if this is accessed from a different running event loop
+        (e.g. successive asyncio.run() calls). The previous client is closed on its own
+        loop if that loop is still running; otherwise its connections cannot be closed
+        cleanly and a warning is logged.
+
+        Returns:
+            httpx.AsyncClient: The long-lived client shared by all asynchronous requests.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._client_lock:
+            old_client = self._async_client
+            if (
+                old_client is not None
+                and not old_client.is_closed
+                and (loop is None or loop is self._async_client_loop)
+            ):
+                return old_client
+            if (
+                old_client is not None
+                and not old_client.is_closed
+                and self._async_client_loop is None
+            ):
+                # Created outside an event loop, so it has no connections yet and can be adopted
+                self._async_client_loop = loop
+                return old_client
+
+            if old_client is not None and not old_client.is_closed:
+                self._release_async_client(old_client, self._async_client_loop)
+            logger.debug("Creating pooled httpx.AsyncClient for KServer")
+            transport = self._async_transport or httpx.AsyncHTTPTransport(
+                limits=self._limits, http2=self._http2
+            )
+            self._async_client = httpx.AsyncClient(
+                auth=self._auth,
+                timeout=self._timeout,
+                transport=AsyncMetricsTransport(transport, self._metrics),
+            )
+            self._async_client_loop = loop
+            return self._async_client
+
+    @staticmethod
+    def _release_async_client(
+        client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None
+    ) -> None:
+        """
+        Closes an async client that is being replaced because it belongs to another event loop.
 
         Parameters:
-            url (str): The URL to send the GET request to.
-            params (dict, optional): Query parameters to include in the request. Defaults to None.
+            client (httpx.AsyncClient): The client being replaced.
+            loop (asyncio.AbstractEventLoop or None): The event loop the client was created on.
+        """
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+        logger.warning(
+            "Replacing an async client whose event loop has finished without closing it. "
+            "Use 'async with KServer(...)' or await aclose() before the loop ends to release its connections."
+        )
+
+    def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends a synchronous request through the pooled client and maps errors.
+
+        Parameters:
+            method (str): The HTTP method, e.g. 'GET' or 'POST'.
+            url (str): The URL to send the request to.
+            **kwargs: Additional arguments passed to httpx.Client.request (params, json, headers, etc.).
 
         Returns:
-            dict: The JSON response from the server.
+            httpx.Response: The response from the server.
 
         Raises:
             KServerBadRequestError: If the request fails with a 400 status code.
-            KServerError: For other HTTP errors or request exceptions.
+            KServerError: For request exceptions such as connection errors or timeouts.
+            httpx.HTTPStatusError: For other HTTP error status codes.
         """
-        headers = {"Authorization": f"key {self._api_key}"}
-        logger.debug(f"Making kserver GET request to {url} with params {params}")
+        logger.debug(
+            f"Making kserver {method} request to {url} with params {kwargs.get('params')}"
+        )
         try:
-            response = httpx.get(url, headers=headers, params=params, timeout=30)
+            response = self.client.request(method, url, **kwargs)
         except httpx.RequestError as exc:
             logger.error(f"An error occurred while requesting {exc.request.url!r}.")
             raise KServerError(str(exc)) from exc
 
         if response.status_code == 400:
             raise KServerBadRequestError(response.text)
+        if response.status_code == 304:
+            return response  # Not Modified, in reply to a conditional request
         response.raise_for_status()
-        return response.json()
+        return response
+
+    async def _async_request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends an asynchronous request through the pooled client and maps errors.
+
+        Parameters:
+            method (str): The HTTP method, e.g. 'GET' or 'POST'.
+            url (str): The URL to send the request to.
+            **kwargs: Additional arguments passed to httpx.AsyncClient.request (params, json, headers, etc.).
+
+        Returns:
+            httpx.Response: The response from the server.
+
+        Raises:
+            KServerBadRequestError: If the request fails with a 400 status code.
+            KServerError: For request exceptions such as connection errors or timeouts.
+            httpx.HTTPStatusError: For other HTTP error status codes.
+        """
+        logger.debug(
+            f"Making async kserver {method} request to {url} with params {kwargs.get('params')}"
+        )
+        try:
+            response = await self.async_client.request(method, url, **kwargs)
+        except httpx.RequestError as exc:
+            logger.error(f"An error occurred while requesting {exc.request.url!r}.")
+            raise KServerError(str(exc)) from exc
+
+        if response.status_code == 400:
+            raise KServerBadRequestError(response.text)
+        response.raise_for_status()
+        return response
+
+    def get(self, url: str, params: dict = None) -> dict:
+        """
+        Makes a synchronous GET request to the specified URL with the provided parameters.
+        The API key is injected into the request headers by the pooled client.
+
+        Parameters:
+            url (str): The URL to send the GET request to.
+            params (dict, optional): Query parameters to include in the request. Defaults to None.
+
+        Returns:
+            dict: The JSON response from the server.
+
+        Raises:
+            KServerBadRequestError: If the request fails with a 400 status code.
+            KServerError: For other HTTP errors or request exceptions.
+        """
+        return json_loads(self._request("GET", url, params=params).content)
+
+    def post(self, url: str, json: dict = None) -> dict:
+        """
+        Makes a synchronous POST request with a JSON body to the specified URL.
+        The API key is injected into the request headers by the pooled client.
+
+        Parameters:
+            url (str): The URL to send the POST request to.
+            json (dict, optional): The JSON body to send. Defaults to None.
+
+        Returns:
+            dict: The JSON response from the server.
+
+        Raises:
+            KServerBadRequestError: If the request fails with a 400 status code.
+            KServerError: For other HTTP errors or request exceptions.
+        """
+        return json_loads(self._request("POST", url, json=json).content)
+
+    def _get_cached(
+        self, url: str, key: str, params: dict = None, cache: MetadataCache = None
+    ) -> dict:
+        """
+        Makes a GET request through the metadata cache, if one is configured.
+
+        A cached response younger than the cache TTL is returned without a request. An older
+        one is revalidated with If-None-Match / If-Modified-Since, and reused if the server
+        replies 304 Not Modified.
+
+        Parameters:
+            url (str): The URL to send the GET request to.
+            key (str): The cache key to store the response under, e.g. 'item:50318'.
+            params (dict, optional): Query parameters to include in the request. Defaults to None.
+            cache (MetadataCache, optional): The cache to use. Defaults to the KServer metadata cache.
+
+        Returns:
+            dict: The JSON response from the server, or the cached copy.
+
+        Raises:
+            KServerBadRequestError: If the request fails with a 400 status code.
+            KServerError: For other HTTP errors or request exceptions.
+        """
+        cache = self._cache if cache is None else cache
+        if cache is None:
+            return self.get(url, params=params)
+
+        entry = cache.get(key)
+        if entry is not None and entry.url != url:
+            entry = None
+        if entry is not None and entry.is_fresh(cache.ttl):
+            logger.debug(f"Using cached response for {key}")
+            return entry.value
+
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        response = self._request("GET", url, params=params, headers=headers)
+
+        if response.status_code == 304 and entry is not None:
+            logger.debug(f"Cached response for {key} is still valid")
+            entry.stored_at = time.time()
+            cache.set(key, entry)
+            return entry.value
+
+        value = json_loads(response.content)
+        cache.set(
+            key,
+            CacheEntry(
+                value,
+                url,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            ),
+        )
+        return value
+
+    def get_services(self, data_type: str, id: str) -> list:
+        """
+        Returns the services (WFS, changesets, etc.) available for an item.
+
+        Service descriptors rarely change, so they are cached by the KServer and shared by every
+        item instance. With an on-disk metadata cache they are also shared between processes and runs.
+
+        Parameters:
+            data_type (str): The type of the item ('layer' or 'table').
+            id (str): The id of the item.
+
+        Returns:
+            list: The service descriptors of the item.
+
+        Raises:
+            KServerBadRequestError: If the request fails with a 400 status code.
+            KServerError: For other HTTP errors or request exceptions.
+        """
+        url = f"{self._api_url}{data_type}s/{id}/services/"
+        return self._get_cached(
+            url, f"services:{data_type}:{id}", cache=self._services_cache
+        )
 
     async def async_get(self, url: str, params: dict = None) -> dict:
         """
         Makes an asynchronous GET request to the specified URL with the provided parameters.
-        Injects the API key into the request headers.
+        The API key is injected into the request headers by the pooled client.
 
         Parameters:
             url (str): The URL to send the GET request to.
@@ -141,31 +518,111 @@ class KServer:
             KServerBadRequestError: If the request fails with a 400 status code.
             KServerError: For other HTTP errors or request exceptions.
         """
-        headers = {"Authorization": f"key {self._api_key}"}
-        logger.debug(f"Making async kserver GET request to {url} with params {params}")
-        async with httpx.AsyncClient(timeout=30) as client:
-            try:
-                response = await client.get(url, headers=headers, params=params)
-            except httpx.RequestError as exc:
-                logger.error(f"An error occurred while requesting {exc.request.url!r}.")
-                raise KServerError(str(exc)) from exc
+        response = await self._async_request("GET", url, params=params)
+        return json_loads(response.content)
+
+    def _validate_export(
+        self,
+        items: list[tuple[str, str, str, str]],
+        crs: str = None,
+        extent: dict = None,
+        **kwargs: Any,
+    ) -> bool:
+        """
+        Validates an export request, reusing a recent successful validation of the same request.
+
+        Only successful validations are cached; a request that fails validation is checked
+        against the server again next time.
+
+        Parameters:
+            items (list[tuple]): The items to export, as (id, data_type, kind, export_format) tuples.
+            crs (str, optional): Coordinate Reference System, if applicable.
+            extent (dict, optional): Spatial extent for the export.
+            **kwargs: Additional parameters for the export.
+
+        Returns:
+            bool: True if the export request is valid, False otherwise.
+
+        Raises:
+            ValueError: If the parameters are invalid, or the data type is unsupported or not implemented.
+        """
+        key = export_features.export_validation_key(
+            self._api_url, items, crs=crs, extent=extent, **kwargs
+        )
+        validated = self._validated_exports.get(key)
+        if validated is not None and validated.is_fresh(self._validation_cache_ttl):
+            logger.debug(f"Using cached export validation for {key}")
+            return True
+
+        is_valid = export_features.validate_multi_export_params(
+            self._api_url,
+            self._api_key,
+            items,
+            crs=crs,
+            extent=extent,
+            client=self.client,
+            **kwargs,
+        )
+        if is_valid and self._validation_cache_ttl > 0:
+            self._validated_exports.set(key, CacheEntry({}, self._api_url))
+        return is_valid
+
+    def close(self) -> None:
+        """
+        Closes the pooled synchronous client. The asynchronous client is also released if its
+        event loop is no longer running; otherwise use aclose(). Safe to call more than once.
+
+        Returns:
+            None
+        """
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        if self._async_client is not None and (
+            self._async_client_loop is None or self._async_client_loop.is_closed()
+        ):
+            # Connections bound to a finished event loop cannot be reused or awaited.
+            self._async_client = None
+            self._async_client_loop = None
+        logger.debug("KServer HTTP clients closed.")
+
+    async def aclose(self) -> None:
+        """
+        Closes both the pooled asynchronous and synchronous clients. Safe to call more than once.
+
+        Returns:
+            None
+        """
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_client_loop = None
+        self.close()
+
+    def __enter__(self) -> "KServer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "KServer":
+        return self
 
-            if response.status_code == 400:
-                raise KServerBadRequestError(response.text)
-            response.raise_for_status()
-            return response.json()
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
 
     def reset(self) -> None:
         """
         Resets the KServer instance, forcing the content manager and WFS manager
-        to reinitialize the next time they are accessed. This is useful if the API key
-        or other configurations change.
+        to reinitialize the next time they are accessed, and clears cached export validations.
+        This is useful if the API key or other configurations change.
 
         Returns:
             None
         """
         self._content_manager = None
         self._wfs_manager = None
+        self._validated_exports.clear()
         logger.info("KServer instance reset.")
 
     def __repr__(self) -> str:
@@ -3,19 +3,25 @@ KTableItem.py
 A class to represent a table dataset.
 """
 
+import asyncio
 import logging
 import json
+import itertools
+import pandas as pd
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
 from pykaahma_linz.KItem import KItem
 from pykaahma_linz.JobResult import JobResult
 from .features import wfs as wfs_features
+from .features import wfs_async as wfs_async_features
 from .features import export as export_features
 from .features.Conversion import json_to_df
 from pykaahma_linz.CustomErrors import KServerError
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CHUNK_SIZE = 10000  # Number of records per DataFrame yielded by query_chunks
+
 
 class KTableItem(KItem):
     """
@@ -133,12 +139,64 @@ class KTableItem(KItem):
         logger.debug(f"Creating WFS service for item with id: {self.id}")
         wfs_service = self._kserver.wfs.operations
 
-    def query_json(self, cql_filter: str = None, **kwargs: Any) -> dict:
+    def iter_pages(
+        self, cql_filter: str = None, max_workers: int = 1, **kwargs: Any
+    ) -> Iterator[dict]:
+        """
+        Executes a WFS query on the item and yields each page of results as it arrives.
+
+        Parameters:
+            cql_filter (str, optional): The CQL filter to apply to the query.
+            max_workers (int, optional): Number of pages to fetch concurrently. Defaults to 1 (sequential).
+            **kwargs: Additional parameters for the WFS query.
+
+        Yields:
+            dict: A page of the WFS query result in JSON format.
+        """
+        logger.debug(f"Streaming WFS query for item with id: {self.id}")
+
+        yield from wfs_features.iter_wfs_pages(
+            url=self._wfs_url,
+            api_key=self._kserver._api_key,
+            client=self._kserver.client,
+            typeNames=f"{self.type}-{self.id}",
+            cql_filter=cql_filter,
+            max_workers=max_workers,
+            feature_count=self.feature_count if cql_filter is None else None,
+            **kwargs,
+        )
+
+    def iter_features(
+        self, cql_filter: str = None, max_workers: int = 1, **kwargs: Any
+    ) -> Iterator[dict]:
+        """
+        Executes a WFS query on the item and yields each JSON record as it arrives.
+
+        Only the current page is held in memory, so this can be used to process or write out
+        large tables in constant memory.
+
+        Parameters:
+            cql_filter (str, optional): The CQL filter to apply to the query.
+            max_workers (int, optional): Number of pages to fetch concurrently. Defaults to 1 (sequential).
+            **kwargs: Additional parameters for the WFS query.
+
+        Yields:
+            dict: A JSON feature, with the record values in its properties.
+        """
+        for page in self.iter_pages(
+            cql_filter=cql_filter, max_workers=max_workers, **kwargs
+        ):
+            yield from page.get("features", [])
+
+    def query_json(
+        self, cql_filter: str = None, max_workers: int = 1, **kwargs: Any
+    ) -> dict:
         """
         Executes a WFS query on the item and returns the result as JSON.
 
         Parameters:
             cql_filter (str, optional): The CQL filter to apply to the query.
+            max_workers (int, optional): Number of pages to fetch concurrently. Defaults to 1 (sequential).
             **kwargs: Additional parameters for the WFS query.
 
         Returns:
@@ -149,19 +207,32 @@ class KTableItem(KItem):
         result = wfs_features.download_wfs_data(
             url=self._wfs_url,
             api_key=self._kserver._api_key,
+            client=self._kserver.client,
             typeNames=f"{self.type}-{self.id}",
             cql_filter=cql_filter,
+            max_workers=max_workers,
+            feature_count=self.feature_count if cql_filter is None else None,
             **kwargs,
         )
 
         return result
 
-    def query(self, cql_filter: str = None, **kwargs: Any) -> dict:
+    def query(
+        self,
+        cql_filter: str = None,
+        max_workers: int = 1,
+        output_format: str = "json",
+        **kwargs: Any,
+    ) -> dict:
         """
         Executes a WFS query on the item and returns the result as a DataFrame.
 
         Parameters:
             cql_filter (str, optional): The CQL filter to apply to the query.
+            max_workers (int, optional): Number of pages to fetch concurrently. Defaults to 1 (sequential).
+                Only applies to the 'json' output format.
+            output_format (str, optional): The server output format to request. 'json' (default) parses
+                JSON pages; 'csv' streams each page to a temporary file and reads it with pyogrio/GDAL.
             **kwargs: Additional parameters for the WFS query.
 
         Returns:
@@ -169,11 +240,60 @@ class KTableItem(KItem):
         """
         logger.debug(f"Executing WFS query for item with id: {self.id}")
 
-        result = self.query_json(cql_filter=cql_filter, **kwargs)
+        if output_format.lower() != "json":
+            return wfs_features.download_wfs_gdf(
+                url=self._wfs_url,
+                api_key=self._kserver._api_key,
+                client=self._kserver.client,
+                typeNames=f"{self.type}-{self.id}",
+                output_format=output_format,
+                fields=self.fields,
+                cql_filter=cql_filter,
+                feature_count=self.feature_count if cql_filter is None else None,
+                **kwargs,
+            )
+
+        result = self.query_json(
+            cql_filter=cql_filter, max_workers=max_workers, **kwargs
+        )
 
         df = json_to_df(result, fields=self.fields)
         return df
 
+    def query_chunks(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        cql_filter: str = None,
+        max_workers: int = 1,
+        **kwargs: Any,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Executes a WFS query on the item and yields the result as a series of DataFrames.
+
+        Only one chunk of records is held in memory at a time, which keeps peak memory low
+        when loading large tables into another store (e.g. a database) chunk by chunk.
+
+        Parameters:
+            chunk_size (int, optional): The number of records in each DataFrame. Defaults to 10,000.
+            cql_filter (str, optional): The CQL filter to apply to the query.
+            max_workers (int, optional): Number of pages to fetch concurrently. Defaults to 1 (sequential).
+            **kwargs: Additional parameters for the WFS query.
+
+        Yields:
+            pandas.DataFrame: A DataFrame of at most chunk_size records.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+
+        features = self.iter_features(
+            cql_filter=cql_filter, max_workers=max_workers, **kwargs
+        )
+        while chunk := list(itertools.islice(features, chunk_size)):
+            logger.debug(
+                f"Converting chunk of {len(chunk)} records for item with id: {self.id}"
+            )
+            yield json_to_df(chunk, fields=self.fields)
+
     def get_changeset_json(
         self, from_time: str, to_time: str = None, cql_filter: str = None, **kwargs: Any
     ) -> dict:
@@ -189,21 +309,12 @@ class KTableItem(KItem):
         Returns:
             dict: The changeset data in JSON format.
         """
-        if not self.supports_changesets:
-            logger.error(f"Item with id: {self.id} does not support changesets.")
-            raise KServerError("This item does not support changesets.")
-
-        if to_time is None:
-            to_time = datetime.now().isoformat()
-        logger.debug(
-            f"Fetching changeset for item with id: {self.id} from {from_time} to {to_time}"
-        )
-
-        viewparams = f"from:{from_time};to:{to_time}"
+        viewparams = self._changeset_viewparams(from_time, to_time)
 
         result = wfs_features.download_wfs_data(
             url=self._wfs_url,
             api_key=self._kserver._api_key,
+            client=self._kserver.client,
             typeNames=f"{self.type}-{self.id}-changeset",
             viewparams=viewparams,
             cql_filter=cql_filter,
@@ -235,19 +346,134 @@ class KTableItem(KItem):
         df = json_to_df(result, fields=self.fields)
         return df
 
+    def _changeset_viewparams(self, from_time: str, to_time: str = None) -> str:
+        """
+        Builds the WFS viewparams for a changeset query.
+
+        Parameters:
+            from_time (str): The start time for the changeset query, ISO format.
+            to_time (str, optional): The end time for the changeset query, ISO format. If not provided, the current time is used.
+
+        Returns:
+            str: The viewparams value for the changeset query.
+
+        Raises:
+            KServerError: If the item does not support changesets.
+        """
+        if not self.supports_changesets:
+            logger.error(f"Item with id: {self.id} does not support changesets.")
+            raise KServerError("This item does not support changesets.")
+
+        if to_time is None:
+            to_time = datetime.now().isoformat()
+        logger.debug(
+            f"Fetching changeset for item with id: {self.id} from {from_time} to {to_time}"
+        )
+        return f"from:{from_time};to:{to_time}"
+
+    async def query_json_async(self, cql_filter: str = None, **kwargs: Any) -> dict:
+        """
+        Asynchronously executes a WFS query on the item and returns the result as JSON.
+
+        Uses the KServer's pooled async client, so many items can be queried concurrently
+        from one event loop, e.g. with asyncio.gather.
+
+        Parameters:
+            cql_filter (str, optional): The CQL filter to apply to the query.
+            **kwargs: Additional parameters for the WFS query.
+
+        Returns:
+            dict: The result of the WFS query in JSON format.
+        """
+        logger.debug(f"Executing async WFS query for item with id: {self.id}")
+
+        return await wfs_async_features.download_wfs_data_async(
+            url=self._wfs_url,
+            api_key=self._kserver._api_key,
+            client=self._kserver.async_client,
+            typeNames=f"{self.type}-{self.id}",
+            cql_filter=cql_filter,
+            feature_count=self.feature_count if cql_filter is None else None,
+            **kwargs,
+        )
+
+    async def query_async(self, cql_filter: str = None, **kwargs: Any) -> pd.DataFrame:
+        """
+        Asynchronously executes a WFS query on the item and returns the result as a DataFrame.
+
+        The conversion to a DataFrame runs in a worker thread so it does not block the event loop.
+
+        Parameters:
+            cql_filter (str, optional): The CQL filter to apply to the query.
+            **kwargs: Additional parameters for the WFS query.
+
+        Returns:
+            pd.DataFrame: The result of the WFS query.
+        """
+        result = await self.query_json_async(cql_filter=cql_filter, **kwargs)
+        return await asyncio.to_thread(json_to_df, result, fields=self.fields)
+
+    async def get_changeset_json_async(
+        self, from_time: str, to_time: str = None, cql_filter: str = None, **kwargs: Any
+    ) -> dict:
+        """
+        Asynchronously retrieves a changeset for the item in JSON format.
+
+        Parameters:
+            from_time (str): The start time for the changeset query, ISO format (e.g., "2015-05-15T04:25:25.334974").
+            to_time (str, optional): The end time for the changeset query, ISO format. If not provided, the current time is used.
+            cql_filter (str, optional): The CQL filter to apply to the changeset query.
+            **kwargs: Additional parameters for the WFS query.
+
+        Returns:
+            dict: The changeset data in JSON format.
+        """
+        viewparams = self._changeset_viewparams(from_time, to_time)
+
+        return await wfs_async_features.download_wfs_data_async(
+            url=self._wfs_url,
+            api_key=self._kserver._api_key,
+            client=self._kserver.async_client,
+            typeNames=f"{self.type}-{self.id}-changeset",
+            viewparams=viewparams,
+            cql_filter=cql_filter,
+            **kwargs,
+        )
+
+    async def get_changeset_async(
+        self, from_time: str, to_time: str = None, cql_filter: str = None, **kwargs: Any
+    ) -> pd.DataFrame:
+        """
+        Asynchronously retrieves a changeset for the item and returns it as a DataFrame.
+
+        Parameters:
+            from_time (str): The start time for the changeset query, ISO format (e.g., "2015-05-15T04:25:25.334974").
+            to_time (str, optional): The end time for the changeset query, ISO format. If not provided, the current time is used.
+            cql_filter (str, optional): The CQL filter to apply to the changeset query.
+            **kwargs: Additional parameters for the WFS query.
+
+        Returns:
+            pandas.DataFrame: The changeset data as a DataFrame.
+        """
+        result = await self.get_changeset_json_async(
+            from_time=from_time, to_time=to_time, cql_filter=cql_filter, **kwargs
+        )
+        return await asyncio.to_thread(json_to_df, result, fields=self.fields)
+
     @property
     def services(self) -> list:
         """
         Returns the services associated with the item.
 
+        The services are cached by the KServer, so other instances of the same item reuse them.
+
         Returns:
             list: A list of services associated with the item.
         """
 
         if self._services is None:
             logger.debug(f"Fetching services for item with id: {self.id}")
-            url = self._kserver._api_url + f"tables/{self.id}/services/"
-            self._services = self._kserver.get(url)
+            self._services = self._kserver.get_services(self.type, self.id)
         logger.debug(
             f"Returning {len(self._services)} services for item with id: {self.id}"
         )
@@ -331,6 +557,7 @@ class KTableItem(KItem):
             self.type,
             self.kind,
             export_format,
+            client=self._kserver.client,
             **kwargs,
         )
 
@@ -339,6 +566,7 @@ class KTableItem(KItem):
         export_format: str,
         poll_interval: int = 10,
         timeout: int = 600,
+        validate: bool = True,
         **kwargs: Any,
     ) -> JobResult:
         """
@@ -348,6 +576,9 @@ class KTableItem(KItem):
             export_format (str): The format to export the item in.
             poll_interval (int, optional): The interval in seconds to poll the export job status. Default is 10 seconds.
             timeout (int, optional): The maximum time in seconds to wait for the export job to complete. Default is 600 seconds (10 minutes).
+            validate (bool, optional): Validate the request with the server before exporting. A successful validation
+                is cached on the KServer, so repeated exports of the same request are only validated once.
+                Pass False to skip validation entirely. Default is True.
             **kwargs: Additional parameters for the export request.
 
         Returns:
@@ -358,12 +589,16 @@ class KTableItem(KItem):
 
         export_format = self._resolve_export_format(export_format)
 
-        validate_export_request = self.validate_export_request(
-            export_format,
-            **kwargs,
-        )
+        if validate:
+            is_valid = self._kserver._validate_export(
+                [(self.id, self.type, self.kind, export_format)],
+                **kwargs,
+            )
+        else:
+            logger.debug(f"Skipping export validation for item with id: {self.id}")
+            is_valid = True
 
-        if not validate_export_request:
+        if not is_valid:
             logger.error(
                 f"Export validation failed for item with id: {self.id} in format: {export_format}"
             )
@@ -378,6 +613,7 @@ class KTableItem(KItem):
             self.type,
             self.kind,
             export_format,
+            client=self._kserver.client,
             **kwargs,
         )
 
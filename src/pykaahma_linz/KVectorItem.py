@@ -3,14 +3,17 @@ KVectorItem.py
 A class to represent a vector dataset.
 """
 
+import asyncio
 import logging
 import json
+import itertools
 from datetime import datetime
 import geopandas as gpd
-from typing import Any
+from typing import Any, Iterator
 from pykaahma_linz.KItem import KItem
 from pykaahma_linz.JobResult import JobResult
 from .features import wfs as wfs_features
+from .features import wfs_async as wfs_async_features
 from .features import export as export_features
 from .features.Conversion import (
     geojson_to_gdf,
@@ -21,6 +24,10 @@ from pykaahma_linz.CustomErrors import KServerError
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CHUNK_SIZE = (
+    10000  # Number of features per GeoDataFrame yielded by query_chunks
+)
+
 
 class KVectorItem(KItem):
     """
@@ -170,11 +177,91 @@ class KVectorItem(KItem):
         logger.debug(f"Creating WFS service for item with id: {self.id}")
         wfs_service = self._kserver.wfs.operations
 
+    def iter_pages(
+        self,
+        cql_filter: str = None,
+        srsName: str = None,
+        bbox: str | gpd.GeoDataFrame = None,
+        max_workers: int = 1,
+        **kwargs: Any,
+    ) -> Iterator[dict]:
+        """
+        Executes a WFS query on the item and yields each page of results as it arrives.
+
+        Parameters:
+            cql_filter (str, optional): The CQL filter to apply to the query.
+            srsName (str, optional): The spatial reference system name to use for the query.
+            bbox (str or gpd.GeoDataFrame, optional): The bounding box to apply to the query.
+                If a GeoDataFrame is provided, it will be converted to a bounding box string in WGS84.
+            max_workers (int, optional): Number of pages to fetch concurrently. Defaults to 1 (sequential).
+            **kwargs: Additional parameters for the WFS query.
+
+        Yields:
+            dict: A page of the WFS query result in GeoJSON format.
+        """
+        logger.debug(f"Streaming WFS query for item with id: {self.id}")
+
+        if isinstance(bbox, gpd.GeoDataFrame):
+            logger.debug(
+                f"Converting bbox GeoDataFrame to GeoJSON for item with id: {self.id}"
+            )
+            bbox = gdf_to_bbox(bbox)
+
+        yield from wfs_features.iter_wfs_pages(
+            url=self._wfs_url,
+            api_key=self._kserver._api_key,
+            client=self._kserver.client,
+            typeNames=f"{self.type}-{self.id}",
+            cql_filter=cql_filter,
+            srsName=srsName or f"EPSG:{self.epsg}" if self.epsg else None,
+            bbox=bbox,
+            max_workers=max_workers,
+            feature_count=(
+                self.feature_count if cql_filter is None and bbox is None else None
+            ),
+            **kwargs,
+        )
+
+    def iter_features(
+        self,
+        cql_filter: str = None,
+        srsName: str = None,
+        bbox: str | gpd.GeoDataFrame = None,
+        max_workers: int = 1,
+        **kwargs: Any,
+    ) -> Iterator[dict]:
+        """
+        Executes a WFS query on the item and yields each GeoJSON feature as it arrives.
+
+        Only the current page is held in memory, so this can be used to process or write out
+        large layers in constant memory.
+
+        Parameters:
+            cql_filter (str, optional): The CQL filter to apply to the query.
+            srsName (str, optional): The spatial reference system name to use for the query.
+            bbox (str or gpd.GeoDataFrame, optional): The bounding box to apply to the query.
+                If a GeoDataFrame is provided, it will be converted to a bounding box string in WGS84.
+            max_workers (int, optional): Number of pages to fetch concurrently. Defaults to 1 (sequential).
+            **kwargs: Additional parameters for the WFS query.
+
+        Yields:
+            dict: A GeoJSON feature.
+        """
+        for page in self.iter_pages(
+            cql_filter=cql_filter,
+            srsName=srsName,
+            bbox=bbox,
+            max_workers=max_workers,
+            **kwargs,
+        ):
+            yield from page.get("features", [])
+
     def query_json(
         self,
         cql_filter: str = None,
         srsName: str = None,
         bbox: str | gpd.GeoDataFrame = None,
+        max_workers: int = 1,
         **kwargs: Any,
     ) -> dict:
         """
@@ -185,6 +272,7 @@ class KVectorItem(KItem):
             srsName (str, optional): The spatial reference system name to use for the query.
             bbox (str or gpd.GeoDataFrame, optional): The bounding box to apply to the query.
                 If a GeoDataFrame is provided, it will be converted to a bounding box string in WGS84.
+            max_workers (int, optional): Number of pages to fetch concurrently. Defaults to 1 (sequential).
             **kwargs: Additional parameters for the WFS query.
 
         Returns:
@@ -201,10 +289,15 @@ class KVectorItem(KItem):
         result = wfs_features.download_wfs_data(
             url=self._wfs_url,
             api_key=self._kserver._api_key,
+            client=self._kserver.client,
             typeNames=f"{self.type}-{self.id}",
             cql_filter=cql_filter,
             srsName=srsName or f"EPSG:{self.epsg}" if self.epsg else None,
             bbox=bbox,
+            max_workers=max_workers,
+            feature_count=(
+                self.feature_count if cql_filter is None and bbox is None else None
+            ),
             **kwargs,
         )
 
@@ -215,6 +308,8 @@ class KVectorItem(KItem):
         cql_filter: str = None,
         srsName: str = None,
         bbox: str | gpd.GeoDataFrame = None,
+        max_workers: int = 1,
+        output_format: str = "json",
         **kwargs: Any,
     ) -> gpd.GeoDataFrame:
         """
@@ -222,22 +317,91 @@ class KVectorItem(KItem):
 
         Args:
             cql_filter (str): The WFS query to execute.
+            max_workers (int, optional): Number of pages to fetch concurrently. Defaults to 1 (sequential).
+                Only applies to the 'json' output format.
+            output_format (str, optional): The server output format to request. 'json' (default) parses
+                GeoJSON pages; 'csv' or 'gml' streams each page to a temporary file and reads it with
+                pyogrio/GDAL, which is faster and uses less memory for large layers.
 
         Returns:
             dict: The result of the WFS query.
         """
         logger.debug(f"Executing WFS query for item with id: {self.id}")
 
+        if output_format.lower() != "json":
+            if isinstance(bbox, gpd.GeoDataFrame):
+                bbox = gdf_to_bbox(bbox)
+            return wfs_features.download_wfs_gdf(
+                url=self._wfs_url,
+                api_key=self._kserver._api_key,
+                client=self._kserver.client,
+                typeNames=f"{self.type}-{self.id}",
+                output_format=output_format,
+                epsg=self.epsg,
+                fields=self.fields,
+                cql_filter=cql_filter,
+                srsName=srsName or f"EPSG:{self.epsg}" if self.epsg else None,
+                bbox=bbox,
+                feature_count=(
+                    self.feature_count if cql_filter is None and bbox is None else None
+                ),
+                **kwargs,
+            )
+
         result = self.query_json(
             cql_filter=cql_filter,
             srsName=srsName or f"EPSG:{self.epsg}" if self.epsg else None,
             bbox=bbox,
+            max_workers=max_workers,
             **kwargs,
         )
 
         gdf = geojson_to_gdf(result, epsg=self.epsg, fields=self.fields)
         return gdf
 
+    def query_chunks(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        cql_filter: str = None,
+        srsName: str = None,
+        bbox: str | gpd.GeoDataFrame = None,
+        max_workers: int = 1,
+        **kwargs: Any,
+    ) -> Iterator[gpd.GeoDataFrame]:
+        """
+        Executes a WFS query on the item and yields the result as a series of GeoDataFrames.
+
+        Only one chunk of features is held in memory at a time, which keeps peak memory low
+        when loading large layers into another store (e.g. a database) chunk by chunk.
+
+        Parameters:
+            chunk_size (int, optional): The number of features in each GeoDataFrame. Defaults to 10,000.
+            cql_filter (str, optional): The CQL filter to apply to the query.
+            srsName (str, optional): The spatial reference system name to use for the query.
+            bbox (str or gpd.GeoDataFrame, optional): The bounding box to apply to the query.
+                If a GeoDataFrame is provided, it will be converted to a bounding box string in WGS84.
+            max_workers (int, optional): Number of pages to fetch concurrently. Defaults to 1 (sequential).
+            **kwargs: Additional parameters for the WFS query.
+
+        Yields:
+            gpd.GeoDataFrame: A GeoDataFrame of at most chunk_size features.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+
+        features = self.iter_features(
+            cql_filter=cql_filter,
+            srsName=srsName,
+            bbox=bbox,
+            max_workers=max_workers,
+            **kwargs,
+        )
+        while chunk := list(itertools.islice(features, chunk_size)):
+            logger.debug(
+                f"Converting chunk of {len(chunk)} features for item with id: {self.id}"
+            )
+            yield geojson_to_gdf(chunk, epsg=self.epsg, fields=self.fields)
+
     def get_changeset_json(
         self,
         from_time: str,
@@ -261,17 +425,7 @@ class KVectorItem(KItem):
             dict: The changeset data in JSON format.
         """
 
-        if not self.supports_changesets:
-            logger.error(f"Item with id: {self.id} does not support changesets.")
-            raise KServerError("This item does not support changesets.")
-
-        if to_time is None:
-            to_time = datetime.now().isoformat()
-        logger.debug(
-            f"Fetching changeset for item with id: {self.id} from {from_time} to {to_time}"
-        )
-
-        viewparams = f"from:{from_time};to:{to_time}"
+        viewparams = self._changeset_viewparams(from_time, to_time)
 
         if isinstance(bbox, gpd.GeoDataFrame):
             logger.debug(
@@ -282,6 +436,7 @@ class KVectorItem(KItem):
         result = wfs_features.download_wfs_data(
             url=self._wfs_url,
             api_key=self._kserver._api_key,
+            client=self._kserver.client,
             typeNames=f"layer-{self.id}-changeset",
             viewparams=viewparams,
             cql_filter=cql_filter,
@@ -325,19 +480,185 @@ class KVectorItem(KItem):
         gdf = geojson_to_gdf(result, epsg=self.epsg, fields=self.fields)
         return gdf
 
+    def _changeset_viewparams(self, from_time: str, to_time: str = None) -> str:
+        """
+        Builds the WFS viewparams for a changeset query.
+
+        Parameters:
+            from_time (str): The start time for the changeset query, ISO format.
+            to_time (str, optional): The end time for the changeset query, ISO format. If not provided, the current time is used.
+
+        Returns:
+            str: The viewparams value for the changeset query.
+
+        Raises:
+            KServerError: If the item does not support changesets.
+        """
+        if not self.supports_changesets:
+            logger.error(f"Item with id: {self.id} does not support changesets.")
+            raise KServerError("This item does not support changesets.")
+
+        if to_time is None:
+            to_time = datetime.now().isoformat()
+        logger.debug(
+            f"Fetching changeset for item with id: {self.id} from {from_time} to {to_time}"
+        )
+        return f"from:{from_time};to:{to_time}"
+
+    async def query_json_async(
+        self,
+        cql_filter: str = None,
+        srsName: str = None,
+        bbox: str | gpd.GeoDataFrame = None,
+        **kwargs: Any,
+    ) -> dict:
+        """
+        Asynchronously executes a WFS query on the item and returns the result as JSON.
+
+        Uses the KServer's pooled async client, so many items can be queried concurrently
+        from one event loop, e.g. with asyncio.gather.
+
+        Parameters:
+            cql_filter (str, optional): The CQL filter to apply to the query.
+            srsName (str, optional): The spatial reference system name to use for the query.
+            bbox (str or gpd.GeoDataFrame, optional): The bounding box to apply to the query.
+                If a GeoDataFrame is provided, it will be converted to a bounding box string in WGS84.
+            **kwargs: Additional parameters for the WFS query.
+
+        Returns:
+            dict: The result of the WFS query in JSON format.
+        """
+        logger.debug(f"Executing async WFS query for item with id: {self.id}")
+
+        if isinstance(bbox, gpd.GeoDataFrame):
+            bbox = gdf_to_bbox(bbox)
+
+        return await wfs_async_features.download_wfs_data_async(
+            url=self._wfs_url,
+            api_key=self._kserver._api_key,
+            client=self._kserver.async_client,
+            typeNames=f"{self.type}-{self.id}",
+            cql_filter=cql_filter,
+            srsName=srsName or f"EPSG:{self.epsg}" if self.epsg else None,
+            bbox=bbox,
+            feature_count=(
+                self.feature_count if cql_filter is None and bbox is None else None
+            ),
+            **kwargs,
+        )
+
+    async def query_async(
+        self,
+        cql_filter: str = None,
+        srsName: str = None,
+        bbox: str | gpd.GeoDataFrame = None,
+        **kwargs: Any,
+    ) -> gpd.GeoDataFrame:
+        """
+        Asynchronously executes a WFS query on the item and returns the result as a GeoDataFrame.
+
+        The conversion to a GeoDataFrame runs in a worker thread so it does not block the event loop.
+
+        Parameters:
+            cql_filter (str, optional): The CQL filter to apply to the query.
+            srsName (str, optional): The spatial reference system name to use for the query.
+            bbox (str or gpd.GeoDataFrame, optional): The bounding box to apply to the query.
+            **kwargs: Additional parameters for the WFS query.
+
+        Returns:
+            gpd.GeoDataFrame: The result of the WFS query.
+        """
+        result = await self.query_json_async(
+            cql_filter=cql_filter, srsName=srsName, bbox=bbox, **kwargs
+        )
+        return await asyncio.to_thread(
+            geojson_to_gdf, result, epsg=self.epsg, fields=self.fields
+        )
+
+    async def get_changeset_json_async(
+        self,
+        from_time: str,
+        to_time: str = None,
+        cql_filter: str = None,
+        bbox: str | gpd.GeoDataFrame = None,
+        **kwargs: Any,
+    ) -> dict:
+        """
+        Asynchronously retrieves a changeset for the item in JSON format.
+
+        Parameters:
+            from_time (str): The start time for the changeset query, ISO format (e.g., "2015-05-15T04:25:25.334974").
+            to_time (str, optional): The end time for the changeset query, ISO format. If not provided, the current time is used.
+            cql_filter (str, optional): The CQL filter to apply to the changeset query.
+            bbox (str or gpd.GeoDataFrame, optional): The bounding box to apply to the changeset query.
+            **kwargs: Additional parameters for the WFS query.
+
+        Returns:
+            dict: The changeset data in JSON format.
+        """
+        viewparams = self._changeset_viewparams(from_time, to_time)
+
+        if isinstance(bbox, gpd.GeoDataFrame):
+            bbox = gdf_to_bbox(bbox)
+
+        return await wfs_async_features.download_wfs_data_async(
+            url=self._wfs_url,
+            api_key=self._kserver._api_key,
+            client=self._kserver.async_client,
+            typeNames=f"layer-{self.id}-changeset",
+            viewparams=viewparams,
+            cql_filter=cql_filter,
+            srsName=f"EPSG:{self.epsg}" if self.epsg else None,
+            bbox=bbox,
+            **kwargs,
+        )
+
+    async def get_changeset_async(
+        self,
+        from_time: str,
+        to_time: str = None,
+        cql_filter: str = None,
+        bbox: str | gpd.GeoDataFrame = None,
+        **kwargs: Any,
+    ) -> gpd.GeoDataFrame:
+        """
+        Asynchronously retrieves a changeset for the item and returns it as a GeoDataFrame.
+
+        Parameters:
+            from_time (str): The start time for the changeset query, ISO format (e.g., "2015-05-15T04:25:25.334974").
+            to_time (str, optional): The end time for the changeset query, ISO format. If not provided, the current time is used.
+            cql_filter (str, optional): The CQL filter to apply to the changeset query.
+            bbox (str or gpd.GeoDataFrame, optional): The bounding box to apply to the changeset query.
+            **kwargs: Additional parameters for the WFS query.
+
+        Returns:
+            gpd.GeoDataFrame: The changeset data as a GeoDataFrame.
+        """
+        result = await self.get_changeset_json_async(
+            from_time=from_time,
+            to_time=to_time,
+            cql_filter=cql_filter,
+            bbox=bbox,
+            **kwargs,
+        )
+        return await asyncio.to_thread(
+            geojson_to_gdf, result, epsg=self.epsg, fields=self.fields
+        )
+
     @property
     def services(self) -> list:
         """
         Returns the services associated with the item.
 
+        The services are cached by the KServer, so other instances of the same item reuse them.
+
         Returns:
             list: A list of services associated with the item.
         """
 
         if self._services is None:
             logger.debug(f"Fetching services for item with id: {self.id}")
-            url = self._kserver._api_url + f"layers/{self.id}/services/"
-            self._services = self._kserver.get(url)
+            self._services = self._kserver.get_services(self.type, self.id)
         logger.debug(
             f"Returning {len(self._services)} services for item with id: {self.id}"
         )
@@ -427,6 +748,7 @@ class KVectorItem(KItem):
             export_format,
             crs,
             extent,
+            client=self._kserver.client,
             **kwargs,
         )
 
@@ -437,6 +759,7 @@ class KVectorItem(KItem):
         extent: dict | gpd.GeoDataFrame = None,
         poll_interval: int = 10,
         timeout: int = 600,
+        validate: bool = True,
         **kwargs: Any,
     ) -> JobResult:
         """
@@ -448,6 +771,9 @@ class KVectorItem(KItem):
             extent (dict or gpd.GeoDataFrame, optional): The extent to use for the export. Should be a GeoJSON dictionary or a GeoDataFrame.
             poll_interval (int, optional): The interval in seconds to poll the export job status. Default is 10 seconds.
             timeout (int, optional): The maximum time in seconds to wait for the export job to complete. Default is 600 seconds (10 minutes).
+            validate (bool, optional): Validate the request with the server before exporting. A successful validation
+                is cached on the KServer, so repeated exports of the same request are only validated once.
+                Pass False to skip validation entirely. Default is True.
             **kwargs: Additional parameters for the export request.
 
         Returns:
@@ -463,14 +789,18 @@ class KVectorItem(KItem):
 
         export_format = self._resolve_export_format(export_format)
 
-        validate_export_request = self.validate_export_request(
-            export_format,
-            crs=crs,
-            extent=extent,
-            **kwargs,
-        )
+        if validate:
+            is_valid = self._kserver._validate_export(
+                [(self.id, self.type, self.kind, export_format)],
+                crs=crs,
+                extent=extent,
+                **kwargs,
+            )
+        else:
+            logger.debug(f"Skipping export validation for item with id: {self.id}")
+            is_valid = True
 
-        if not validate_export_request:
+        if not is_valid:
             logger.error(
                 f"Export validation failed for item with id: {self.id} in format: {export_format}"
             )
@@ -487,6 +817,7 @@ class KVectorItem(KItem):
             export_format,
             crs=crs,
             extent=extent,
+            client=self._kserver.client,
             **kwargs,
         )
 
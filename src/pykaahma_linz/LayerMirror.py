@@ -0,0 +1,257 @@
+"""
+LayerMirror.py
+Keeps a local copy of a vector layer up to date by applying its changesets.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import geopandas as gpd
+import pandas as pd
+
+from pykaahma_linz.CustomErrors import KServerError
+from pykaahma_linz.KVectorItem import KVectorItem
+from pykaahma_linz.features.Conversion import apply_field_types
+
+logger = logging.getLogger(__name__)
+
+CHANGE_FIELD = "__change__"
+SYNC_STATE_SUFFIX = ".sync.json"
+PARQUET_EXTENSIONS = (".parquet", ".geoparquet")
+
+
+@dataclass
+class MirrorSyncResult:
+    """
+    Describes the outcome of a LayerMirror.sync call.
+
+    Attributes:
+        full (bool): True if the whole layer was downloaded, False if a changeset was applied.
+        inserted (int): The number of features inserted.
+        updated (int): The number of features updated.
+        deleted (int): The number of features deleted.
+        feature_count (int): The number of features in the local copy after the sync.
+        synced_at (str): The UTC time, in ISO format, the local copy is now up to date to.
+    """
+
+    full: bool
+    inserted: int
+    updated: int
+    deleted: int
+    feature_count: int
+    synced_at: str
+
+
+class LayerMirror:
+    """
+    A local copy of a vector layer, kept up to date with the layer's changesets.
+
+    The first sync downloads the whole layer. Later syncs request only the changeset since
+    the previous sync and apply its inserts, updates and deletes, matching features on the
+    layer's primary key fields. The time of the last sync is kept in a sidecar JSON file
+    next to the local copy.
+
+    The local copy is written as GeoParquet if the path ends in .parquet or .geoparquet
+    (requires pyarrow), and otherwise with pyogrio/GDAL, e.g. as a GeoPackage for .gpkg.
+
+    Attributes:
+        item (KVectorItem): The layer to mirror.
+        path (str): The path of the local copy.
+        layer_name (str or None): The layer name within the file, for multi-layer formats such as GeoPackage.
+        cql_filter (str or None): A CQL filter limiting the features mirrored.
+        state_path (str): The path of the sidecar JSON file holding the sync state.
+    """
+
+    def __init__(
+        self,
+        item: KVectorItem,
+        path: str,
+        layer_name: str = None,
+        cql_filter: str = None,
+    ) -> None:
+        """
+        Parameters:
+            item (KVectorItem): The layer to mirror.
+            path (str): The path of the local copy, e.g. "railway_stations.gpkg".
+            layer_name (str, optional): The layer name within the file. Defaults to the driver's default.
+            cql_filter (str, optional): A CQL filter limiting the features mirrored. Defaults to None.
+        """
+        self.item = item
+        self.path = path
+        self.layer_name = layer_name
+        self.cql_filter = cql_filter
+        self.state_path = f"{path}{SYNC_STATE_SUFFIX}"
+
+    @property
+    def _is_parquet(self) -> bool:
+        return self.path.lower().endswith(PARQUET_EXTENSIONS)
+
+    @property
+    def _query(self) -> dict:
+        """The parameters identifying the mirrored data, used to detect a changed configuration."""
+        return {"item_id": self.item.id, "cql_filter": self.cql_filter}
+
+    @property
+    def last_synced(self) -> str | None:
+        """
+        Returns the UTC time, in ISO format, the local copy was last brought up to date.
+
+        Returns:
+            str or None: The time of the last sync, or None if the layer has not been synced
+                (or the local copy no longer matches this mirror).
+        """
+        state = self._read_state()
+        return state.get("synced_at") if state else None
+
+    def _read_state(self) -> dict | None:
+        if not os.path.exists(self.state_path) or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read mirror state {self.state_path}: {e}")
+            return None
+        if state.get("query") != self._query:
+            logger.warning(
+                f"Mirror state {self.state_path} is for a different layer or filter. A full sync is needed."
+            )
+            return None
+        return state
+
+    def _write_state(self, synced_at: str) -> None:
+        state = {"query": self._query, "synced_at": synced_at}
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def read(self) -> gpd.GeoDataFrame:
+        """
+        Reads the local copy of the layer.
+
+        The columns are typed from the layer's fields, as for item.query, since the file may not
+        keep nullable integers or categoricals (e.g. a GeoPackage reads them back as floats and strings).
+
+        Returns:
+            gpd.GeoDataFrame: The mirrored features.
+        """
+        if self._is_parquet:
+            gdf = gpd.read_parquet(self.path)
+        else:
+            gdf = gpd.read_file(self.path, layer=self.layer_name)
+        if self.item.fields:
+            gdf = apply_field_types(gdf, self.item.fields)
+        return gdf
+
+    def _write(self, gdf: gpd.GeoDataFrame) -> None:
+        """Writes the local copy via a temporary file, so an interrupted write never corrupts it."""
+        root, ext = os.path.splitext(self.path)
+        tmp_path = f"{root}.tmp{ext}"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        if self._is_parquet:
+            gdf.to_parquet(tmp_path, index=False)
+        else:
+            gdf.to_file(tmp_path, layer=self.layer_name, index=False)
+        os.replace(tmp_path, self.path)
+
+    def sync(self, full: bool = False) -> MirrorSyncResult:
+        """
+        Brings the local copy up to date.
+
+        Downloads the whole layer if it has not been synced before (or full is True), and
+        otherwise applies the changeset since the last sync. The sync time is only recorded
+        once the local copy has been written, so a failed sync is simply retried next time.
+
+        Parameters:
+            full (bool, optional): Download the whole layer even if an incremental sync is possible. Defaults to False.
+
+        Returns:
+            MirrorSyncResult: The number of features inserted, updated and deleted.
+
+        Raises:
+            KServerError: If an incremental sync is needed but the layer does not support
+                changesets or has no primary key fields.
+        """
+        # Taken before any data is requested, so changes made during the sync are picked up next time
+        synced_at = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+        last_synced = None if full else self.last_synced
+
+        if last_synced is None:
+            logger.info(f"Downloading layer {self.item.id} to mirror at {self.path}")
+            gdf = self.item.query(cql_filter=self.cql_filter)
+            self._write(gdf)
+            self._write_state(synced_at)
+            return MirrorSyncResult(
+                full=True,
+                inserted=len(gdf),
+                updated=0,
+                deleted=0,
+                feature_count=len(gdf),
+                synced_at=synced_at,
+            )
+
+        primary_key_fields = self.item.primary_key_fields
+        if not primary_key_fields:
+            raise KServerError(
+                f"Layer {self.item.id} has no primary key fields, so changes cannot be applied. Use sync(full=True)."
+            )
+
+        logger.info(
+            f"Applying changes to layer {self.item.id} since {last_synced} to mirror at {self.path}"
+        )
+        changes = self.item.get_changeset(
+            from_time=last_synced, to_time=synced_at, cql_filter=self.cql_filter
+        )
+        if changes.empty or CHANGE_FIELD not in changes.columns:
+            logger.debug(f"No changes to layer {self.item.id} since {last_synced}")
+            self._write_state(synced_at)
+            return MirrorSyncResult(
+                full=False,
+                inserted=0,
+                updated=0,
+                deleted=0,
+                feature_count=len(self.read()),
+                synced_at=synced_at,
+            )
+
+        local = self.read()
+        # A feature may change more than once in the period; its last change wins
+        changes = changes.drop_duplicates(subset=primary_key_fields, keep="last")
+        change_types = changes[CHANGE_FIELD].str.upper()
+        changed_keys = pd.MultiIndex.from_frame(changes[primary_key_fields])
+        exists = changed_keys.isin(pd.MultiIndex.from_frame(local[primary_key_fields]))
+
+        # Replace every changed feature: deletes are dropped, inserts and updates re-added
+        keep = ~pd.MultiIndex.from_frame(local[primary_key_fields]).isin(changed_keys)
+        upserts = changes[(change_types != "DELETE").to_numpy()].drop(
+            columns=CHANGE_FIELD
+        )
+        if upserts.crs is None and local.crs is not None:
+            upserts = upserts.set_crs(local.crs)
+        elif upserts.crs is not None and local.crs is not None:
+            upserts = upserts.to_crs(local.crs)
+        if upserts.geometry.name != local.geometry.name:
+            upserts = upserts.rename_geometry(local.geometry.name)
+        upserts = upserts.reindex(columns=local.columns)
+        merged = gpd.GeoDataFrame(
+            pd.concat([local[keep], upserts], ignore_index=True),
+            geometry=local.geometry.name,
+            crs=local.crs,
+        )
+        self._write(merged)
+        self._write_state(synced_at)
+
+        is_delete = (change_types == "DELETE").to_numpy()
+        return MirrorSyncResult(
+            full=False,
+            inserted=int((~is_delete & ~exists).sum()),
+            updated=int((~is_delete & exists).sum()),
+            deleted=int((is_delete & exists).sum()),
+            feature_count=len(merged),
+            synced_at=synced_at,
+        )
@@ -0,0 +1,186 @@
+"""
+Transport.py
+The pluggable HTTP transport layer used for all requests made through a KServer.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TransportMetrics:
+    """
+    Running totals for all HTTP traffic sent through a KServer transport.
+
+    Attributes:
+        requests (int): The number of requests that received a response.
+        errors (int): The number of requests that failed without a response (connection errors, timeouts).
+        bytes_received (int): The number of response body bytes read by callers.
+        elapsed_seconds (float): Total time spent waiting for response headers.
+        status_codes (dict): Count of responses keyed by HTTP status code.
+    """
+
+    requests: int = 0
+    errors: int = 0
+    bytes_received: int = 0
+    elapsed_seconds: float = 0.0
+    status_codes: dict = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def record_response(self, status_code: int, elapsed: float) -> None:
+        """Records a completed request."""
+        with self._lock:
+            self.requests += 1
+            self.elapsed_seconds += elapsed
+            self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+
+    def record_error(self, elapsed: float) -> None:
+        """Records a request that failed before a response was received."""
+        with self._lock:
+            self.errors += 1
+            self.elapsed_seconds += elapsed
+
+    def record_bytes(self, num_bytes: int) -> None:
+        """Records response body bytes as they are read."""
+        with self._lock:
+            self.bytes_received += num_bytes
+
+    def reset(self) -> None:
+        """Resets all counters to zero."""
+        with self._lock:
+            self.requests = 0
+            self.errors = 0
+            self.bytes_received = 0
+            self.elapsed_seconds = 0.0
+            self.status_codes = {}
+
+
+class KoordinatesKeyAuth(httpx.Auth):
+    """
+    Injects the Koordinates API key into requests sent to the Koordinates host.
+
+    The key is only added when the request host matches the server host, so the same
+    client can safely be used to fetch pre-signed download URLs on other hosts (e.g. S3).
+
+    Attributes:
+        _api_key (str): The API key for authenticating requests.
+        _host (str): The host name the key is sent to.
+    """
+
+    def __init__(self, api_key: str, host: str) -> None:
+        self._api_key = api_key
+        self._host = host
+
+    def auth_flow(self, request: httpx.Request):
+        if request.url.host == self._host:
+            request.headers["Authorization"] = f"key {self._api_key}"
+        yield request
+
+
+class _CountingByteStream(httpx.SyncByteStream):
+    """Wraps a response stream and records the number of bytes read."""
+
+    def __init__(self, stream: httpx.SyncByteStream, metrics: TransportMetrics) -> None:
+        self._stream = stream
+        self._metrics = metrics
+
+    def __iter__(self):
+        for chunk in self._stream:
+            self._metrics.record_bytes(len(chunk))
+            yield chunk
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+class _AsyncCountingByteStream(httpx.AsyncByteStream):
+    """Wraps an async response stream and records the number of bytes read."""
+
+    def __init__(
+        self, stream: httpx.AsyncByteStream, metrics: TransportMetrics
+    ) -> None:
+        self._stream = stream
+        self._metrics = metrics
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._metrics.record_bytes(len(chunk))
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class MetricsTransport(httpx.BaseTransport):
+    """
+    A synchronous transport that delegates to another transport and records metrics.
+
+    Attributes:
+        _transport (httpx.BaseTransport): The transport that actually sends requests.
+        _metrics (TransportMetrics): The metrics instance to record into.
+    """
+
+    def __init__(
+        self, transport: httpx.BaseTransport, metrics: TransportMetrics
+    ) -> None:
+        self._transport = transport
+        self._metrics = metrics
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = self._transport.handle_request(request)
+        except Exception:
+            self._metrics.record_error(time.perf_counter() - start)
+            raise
+        self._metrics.record_response(response.status_code, time.perf_counter() - start)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_CountingByteStream(response.stream, self._metrics),
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncMetricsTransport(httpx.AsyncBaseTransport):
+    """
+    An asynchronous transport that delegates to another transport and records metrics.
+
+    Attributes:
+        _transport (httpx.AsyncBaseTransport): The transport that actually sends requests.
+        _metrics (TransportMetrics): The metrics instance to record into.
+    """
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, metrics: TransportMetrics
+    ) -> None:
+        self._transport = transport
+        self._metrics = metrics
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            self._metrics.record_error(time.perf_counter() - start)
+            raise
+        self._metrics.record_response(response.status_code, time.perf_counter() - start)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_AsyncCountingByteStream(response.stream, self._metrics),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -1,11 +1,284 @@
 import geopandas as gpd
 import pandas as pd
+import pyogrio
+import numpy as np
+import shapely
 from shapely.geometry import shape
 from typing import Any
+import itertools
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Compact pandas dtypes for Koordinates field types
+FIELD_TYPE_DTYPES = {
+    "integer": "Int32",
+    "int": "Int32",
+    "int32": "Int32",
+    "smallint": "Int32",
+    "bigint": "Int64",
+    "int64": "Int64",
+    "long": "Int64",
+    "float": "float32",
+    "real": "float32",
+    "float32": "float32",
+    "double": "float64",
+    "float64": "float64",
+    "numeric": "float64",
+    "decimal": "float64",
+    "boolean": "boolean",
+    "bool": "boolean",
+    "date": "datetime",
+    "datetime": "datetime",
+    "timestamp": "datetime",
+    "string": "string",
+    "str": "string",
+    "text": "string",
+    "varchar": "string",
+}
+# Text forms of boolean values, as found in CSV output
+BOOLEAN_STRINGS = {
+    "true": True,
+    "false": False,
+    "t": True,
+    "f": False,
+    "1": True,
+    "0": False,
+}
+INT32_MIN, INT32_MAX = -(2**31), 2**31 - 1
+# Max ratio of unique values to rows for a string column to become categorical
+DEFAULT_CATEGORY_RATIO = 0.5
+
+# Column names GeoServer uses for the WKT geometry in CSV output, if not known from the fields
+CSV_GEOMETRY_NAMES = ["shape", "the_geom", "geom", "geometry", "WKT"]
+
+# Nesting depth of the GeoJSON coordinates array for each geometry type,
+# i.e. the number of offset arrays needed by shapely.from_ragged_array.
+_GEOJSON_COORDINATE_DEPTHS = {
+    "Point": 0,
+    "LineString": 1,
+    "MultiPoint": 1,
+    "Polygon": 2,
+    "MultiLineString": 2,
+    "MultiPolygon": 3,
+}
+
+
+def _shape_geometries(geometries: list[dict | None]) -> np.ndarray:
+    """
+    Converts GeoJSON geometry dictionaries to shapely geometries one at a time.
+
+    Parameters:
+        geometries (list): GeoJSON geometry dictionaries, or None for missing geometries.
+
+    Returns:
+        np.ndarray: An object array of shapely geometries (or None).
+    """
+    result = np.empty(len(geometries), dtype=object)
+    result[:] = [shape(geom) if geom else None for geom in geometries]
+    return result
+
+
+def _ragged_geometries(geometries: list[dict], geometry_type: str) -> np.ndarray:
+    """
+    Converts GeoJSON geometries of a single type to shapely geometries in bulk.
+
+    The nested coordinate lists are flattened into one coordinate array plus offset arrays,
+    which shapely turns into geometries in a single vectorized call.
+
+    Parameters:
+        geometries (list): GeoJSON geometry dictionaries, all of geometry_type.
+        geometry_type (str): The GeoJSON geometry type.
+
+    Returns:
+        np.ndarray: An object array of shapely geometries.
+
+    Raises:
+        ValueError: If the coordinates cannot be packed into a regular array
+            (e.g. mixed 2D/3D coordinates or empty geometries).
+    """
+    nested = [geom["coordinates"] for geom in geometries]
+    depth = _GEOJSON_COORDINATE_DEPTHS[geometry_type]
+    if depth == 0:
+        return shapely.points(np.asarray(nested, dtype="float64"))
+
+    offsets = []
+    for _ in range(depth):
+        lengths = np.fromiter(map(len, nested), dtype="int64", count=len(nested))
+        offsets.append(np.concatenate(([0], np.cumsum(lengths))))
+        nested = list(itertools.chain.from_iterable(nested))
+    coords = np.asarray(nested, dtype="float64")
+    if coords.ndim != 2:
+        raise ValueError("Coordinates could not be packed into a regular array.")
+    # from_ragged_array expects the innermost (coordinate) offsets first
+    return shapely.from_ragged_array(
+        getattr(shapely.GeometryType, geometry_type.upper()),
+        coords,
+        tuple(reversed(offsets)),
+    )
+
+
+def geojson_geometries_to_shapely(geometries: list[dict | None]) -> np.ndarray:
+    """
+    Converts a list of GeoJSON geometry dictionaries to shapely geometries.
+
+    Layers with a single geometry type (the usual case for Koordinates layers) are converted
+    in bulk with shapely.from_ragged_array. Mixed or unusual geometries fall back to
+    converting each geometry with shapely.geometry.shape.
+
+    Parameters:
+        geometries (list): GeoJSON geometry dictionaries, or None for missing geometries.
+
+    Returns:
+        np.ndarray: An object array of shapely geometries (or None), in input order.
+    """
+    present = [i for i, geom in enumerate(geometries) if geom]
+    geometry_types = {geometries[i].get("type") for i in present}
+    if len(geometry_types) != 1:
+        return _shape_geometries(geometries)
+
+    geometry_type = geometry_types.pop()
+    if geometry_type not in _GEOJSON_COORDINATE_DEPTHS:
+        return _shape_geometries(geometries)
+
+    try:
+        converted = _ragged_geometries([geometries[i] for i in present], geometry_type)
+    except (ValueError, TypeError) as e:
+        logger.debug(f"Falling back to per-feature geometry conversion: {e}")
+        return _shape_geometries(geometries)
+
+    if len(present) == len(geometries):
+        return converted
+    result = np.full(len(geometries), None, dtype=object)
+    result[present] = converted
+    return result
+
+
+def _int_dtype(values: pd.Series, dtype: str) -> str:
+    """Returns Int32 unless the values need 64 bits."""
+    if dtype == "Int32" and values.notna().any():
+        if values.min() < INT32_MIN or values.max() > INT32_MAX:
+            return "Int64"
+    return dtype
+
+
+def _convert_column(values: pd.Series, field_type: str, category_ratio: float):
+    """
+    Converts a single column to the compact dtype for a Koordinates field type.
+
+    Parameters:
+        values (pd.Series): The column values.
+        field_type (str): The Koordinates field type, lower case.
+        category_ratio (float): Maximum ratio of unique values to rows for a string column
+            to be stored as a categorical.
+
+    Returns:
+        pd.Series or None: The converted column, or None if the type needs no conversion.
+    """
+    dtype = FIELD_TYPE_DTYPES.get(field_type)
+    if dtype in ("Int32", "Int64"):
+        numbers = pd.to_numeric(values, errors="coerce")
+        return numbers.astype(_int_dtype(numbers, dtype))
+    if dtype in ("float32", "float64"):
+        return pd.to_numeric(values, errors="coerce").astype(dtype)
+    if dtype == "boolean":
+        if values.dtype == object or pd.api.types.is_string_dtype(values):
+            # File based formats such as CSV read booleans as text
+            values = values.map(
+                lambda v: BOOLEAN_STRINGS.get(v.lower()) if isinstance(v, str) else v
+            )
+        return values.astype("boolean")
+    if dtype == "datetime":
+        try:
+            return pd.to_datetime(values, errors="coerce", format="ISO8601")
+        except (ValueError, TypeError):
+            # Mixed time zone offsets can only be represented in UTC
+            return pd.to_datetime(values, errors="coerce", format="ISO8601", utc=True)
+    if dtype == "string":
+        if len(values) and values.nunique(dropna=True) <= len(values) * category_ratio:
+            return values.astype("category")
+        return None
+    return None
+
+
+def apply_field_types(
+    df: pd.DataFrame,
+    fields: list[dict[str, str]],
+    category_ratio: float = DEFAULT_CATEGORY_RATIO,
+) -> pd.DataFrame:
+    """
+    Applies compact dtypes to a DataFrame based on the Koordinates field definitions.
+
+    Integers become nullable Int32 (or Int64 where the values need it), floats become
+    float32 or float64 as declared, dates become datetimes and low-cardinality strings
+    become categoricals. All columns are converted first and then assigned in one step.
+    Columns that fail to convert are left unchanged and a warning is logged.
+
+    Parameters:
+        df (pd.DataFrame): The DataFrame (or GeoDataFrame) to convert.
+        fields (list): A list of dictionaries with the field 'name' and 'type', e.g. item.fields.
+        category_ratio (float, optional): Maximum ratio of unique values to rows for a string
+            column to be stored as a categorical. Defaults to 0.5.
+
+    Returns:
+        pd.DataFrame: The DataFrame with converted columns.
+    """
+    converted = {}
+    for field in fields:
+        col = field.get("name")
+        field_type = (field.get("type") or "").lower()
+        if col not in df.columns or field_type == "geometry":
+            continue
+        if field_type not in FIELD_TYPE_DTYPES:
+            logger.debug(
+                f"Unsupported data type '{field_type}' for column '{col}'. Skipping conversion."
+            )
+            continue
+        try:
+            values = _convert_column(df[col], field_type, category_ratio)
+        except Exception as e:
+            logger.warning(
+                f"Failed to convert column '{col}' to {field_type}: {e}. Leaving column unchanged."
+            )
+            continue
+        if values is not None:
+            converted[col] = values
+
+    if not converted:
+        return df
+    logger.debug(f"Applying field types to columns: {list(converted)}")
+    return df.assign(**converted)
+
+
+def empty_frame(
+    fields: list[dict[str, str]] | None = None, epsg: str | int = None
+) -> pd.DataFrame:
+    """
+    Creates an empty frame with the columns and dtypes of a layer or table, for a download
+    that returned no features.
+
+    Parameters:
+        fields (list, optional): A list of dictionaries with the field 'name' and 'type', e.g. item.fields.
+        epsg (str or int, optional): EPSG code of the geometries.
+
+    Returns:
+        pd.DataFrame: An empty GeoDataFrame if the fields include a geometry (or, without fields,
+            if epsg is given), otherwise an empty DataFrame.
+    """
+    fields = fields or []
+    columns = [f.get("name") for f in fields if f.get("type") != "geometry"]
+    df = pd.DataFrame({col: pd.Series(dtype="object") for col in columns})
+    has_geometry = (
+        any(f.get("type") == "geometry" for f in fields) if fields else bool(epsg)
+    )
+    if has_geometry:
+        df = gpd.GeoDataFrame(
+            df, geometry=gpd.GeoSeries([]), crs=f"EPSG:{epsg}" if epsg else None
+        )
+    if fields:
+        df = apply_field_types(df, fields)
+    return df
+
 
 def geojson_to_gdf(
     geojson: dict[str, Any] | list[dict[str, Any]],
@@ -44,49 +317,20 @@ def geojson_to_gdf(
             "Invalid geojson input. Expected a FeatureCollection or list of features."
         )
 
-    # Flatten properties and extract geometry
-    records = []
-    geometries = []
-    for feature in features:
-        props = feature.get("properties", {})
-        geom = feature.get("geometry")
-        records.append(props)
-        geometries.append(shape(geom) if geom else None)
+    # Properties become columns directly from the existing dicts, and the
+    # geometries are converted in bulk rather than one shape() call per feature
+    records = [feature.get("properties", {}) for feature in features]
+    geometries = geojson_geometries_to_shapely(
+        [feature.get("geometry") for feature in features]
+    )
 
     # Create GeoDataFrame
     crs = f"EPSG:{epsg}"
     df = pd.DataFrame(records)
     gdf = gpd.GeoDataFrame(df, geometry=geometries, crs=crs)
 
-    # Apply data type mapping
-    if fields and False:
-        for field in fields:
-            col = field.get("name")
-            dtype = field.get("type").lower()
-            if dtype == "geometry":
-                continue  # Skip geometry fields as they are already handled
-            if col in gdf.columns:
-                try:
-                    if dtype in ["int", "bigint", "integer", "int32", "int64"]:
-                        gdf[col] = (
-                            pd.to_numeric(gdf[col], errors="coerce")
-                            .fillna(0)
-                            .astype("int32")
-                        )
-                    elif dtype in ["float", "double"]:
-                        gdf[col] = pd.to_numeric(gdf[col], errors="coerce")
-                    elif dtype in ["str", "string"]:
-                        gdf[col] = gdf[col].astype(str)
-                    elif dtype == "bool":
-                        gdf[col] = gdf[col].astype(bool)
-                    else:
-                        logger.warning(
-                            f"Unsupported data type '{dtype}' for column '{col}'. Skipping conversion."
-                        )
-                except Exception as e:
-                    raise ValueError(
-                        f"Failed to convert column '{col}' to {dtype}: {e}"
-                    )
+    if fields:
+        gdf = apply_field_types(gdf, fields)
     return gdf
 
 
@@ -127,34 +371,51 @@ def json_to_df(
         records.append(props)
     df = pd.DataFrame(records)
 
-    # Apply data type mapping
-    if fields and False:
-        for field in fields:
-            col = field.get("name")
-            dtype = field.get("type").lower()
-            if col in df.columns:
-                try:
-                    if dtype in ["int", "bigint", "integer", "int32", "int64"]:
-                        df[col] = (
-                            pd.to_numeric(df[col], errors="coerce")
-                            .fillna(0)
-                            .astype("int32")
-                        )
-                    elif dtype in ["float", "double"]:
-                        df[col] = pd.to_numeric(df[col], errors="coerce")
-                    elif dtype in ["str", "string"]:
-                        df[col] = df[col].astype(str)
-                    elif dtype == "bool":
-                        df[col] = df[col].astype(bool)
-                    else:
-                        logger.warning(
-                            f"Unsupported data type '{dtype}' for column '{col}'. Skipping conversion."
-                        )
-                except Exception as e:
-                    raise ValueError(
-                        f"Failed to convert column '{col}' to {dtype}: {e}"
-                    )
+    if fields:
+        df = apply_field_types(df, fields)
+
+    return df
+
+
+def read_wfs_file(
+    file_path: str,
+    output_format: str,
+    epsg: str | int = None,
+    fields: list[dict[str, str]] | None = None,
+) -> pd.DataFrame:
+    """
+    Reads a WFS page saved in a file based output format (CSV with WKT, or GML) using pyogrio/GDAL.
+
+    Parameters:
+        file_path (str): The path of the file to read.
+        output_format (str): The format of the file, 'csv' or 'gml'.
+        epsg (str or int, optional): EPSG code to assign if the file does not carry a CRS.
+        fields (list, optional): A list of dictionaries specifying field names and their data types.
+
+    Returns:
+        pd.DataFrame: A GeoDataFrame, or a DataFrame if the file has no geometry column.
+
+    Raises:
+        ValueError: If the output format is not supported.
+    """
+    if output_format == "csv":
+        geometry_names = [
+            f.get("name") for f in fields or [] if f.get("type") == "geometry"
+        ]
+        df = pyogrio.read_dataframe(
+            file_path,
+            GEOM_POSSIBLE_NAMES=",".join(geometry_names or CSV_GEOMETRY_NAMES),
+            KEEP_GEOM_COLUMNS="NO",
+        )
+    elif output_format == "gml":
+        df = pyogrio.read_dataframe(file_path)
+    else:
+        raise ValueError(f"Unsupported WFS file format: {output_format}")
 
+    if isinstance(df, gpd.GeoDataFrame) and df.crs is None and epsg:
+        df = df.set_crs(f"EPSG:{epsg}")
+    if fields:
+        df = apply_field_types(df, fields)
     return df
 
 
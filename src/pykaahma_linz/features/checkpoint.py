@@ -0,0 +1,162 @@
+"""
+checkpoint.py
+Persists WFS pages to disk as they are downloaded so an interrupted download can be resumed.
+"""
+
+import json
+import logging
+import os
+import re
+from typing import Iterator
+
+from .json_decoder import json_loads
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE_NAME = "manifest.json"
+PAGE_FILE_PATTERN = re.compile(r"^page_(\d+)\.json$")
+
+
+def _write_atomic(file_path: str, data: bytes) -> None:
+    """Writes data to a file via a temporary file, so a partial write is never left behind."""
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, file_path)
+
+
+class WfsPageCheckpoint:
+    """
+    A directory of WFS pages saved as they complete, keyed by their startIndex.
+
+    The directory holds a manifest describing the query, and one JSON file per page. When a
+    download is retried with the same query, the saved pages are replayed and the download
+    continues from the offset after the last saved page. If the query differs, the saved
+    pages are discarded.
+
+    Attributes:
+        checkpoint_dir (str): The directory the pages are saved in.
+        query (dict): The parameters identifying the download.
+        next_start_index (int): The startIndex of the next page to fetch.
+        complete (bool): True if the download finished and every page is saved.
+    """
+
+    def __init__(self, checkpoint_dir: str, query: dict) -> None:
+        """
+        Opens a checkpoint directory, creating it if needed.
+
+        Parameters:
+            checkpoint_dir (str): The directory to save pages in.
+            query (dict): The parameters identifying the download (layer, filter, CRS, etc.).
+                Values that are not JSON serialisable are stored as strings.
+        """
+        self.checkpoint_dir = checkpoint_dir
+        self.query = json.loads(json.dumps(query, default=str, sort_keys=True))
+        self.next_start_index = 0
+        self.complete = False
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+        manifest = self._read_manifest()
+        if manifest is not None and manifest.get("query") != self.query:
+            logger.warning(
+                f"Checkpoint in {checkpoint_dir} is for a different query. Discarding saved pages."
+            )
+            self.clear()
+            manifest = None
+        if manifest is None:
+            self._write_manifest()
+        else:
+            self.complete = bool(manifest.get("complete"))
+
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.checkpoint_dir, MANIFEST_FILE_NAME)
+
+    def _page_path(self, start_index: int) -> str:
+        return os.path.join(self.checkpoint_dir, f"page_{start_index:010d}.json")
+
+    def _read_manifest(self) -> dict | None:
+        if not os.path.exists(self._manifest_path):
+            return None
+        try:
+            with open(self._manifest_path, "rb") as f:
+                return json_loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read checkpoint manifest: {e}")
+            return None
+
+    def _write_manifest(self) -> None:
+        manifest = {"query": self.query, "complete": self.complete}
+        _write_atomic(self._manifest_path, json.dumps(manifest).encode("utf-8"))
+
+    def _saved_offsets(self) -> list[int]:
+        offsets = []
+        for name in os.listdir(self.checkpoint_dir):
+            match = PAGE_FILE_PATTERN.match(name)
+            if match:
+                offsets.append(int(match.group(1)))
+        return sorted(offsets)
+
+    def iter_pages(self) -> Iterator[dict]:
+        """
+        Yields the saved pages in startIndex order and advances next_start_index past them.
+
+        Pages that are missing, unreadable or not contiguous with the previous page end the
+        replay, and they and any later pages are removed so they are downloaded again.
+
+        Yields:
+            dict: A saved page of the WFS query result.
+        """
+        offsets = self._saved_offsets()
+        for i, start_index in enumerate(offsets):
+            page_data = None
+            if start_index == self.next_start_index:
+                try:
+                    with open(self._page_path(start_index), "rb") as f:
+                        page_data = json_loads(f.read())
+                except (OSError, ValueError) as e:
+                    logger.warning(
+                        f"Could not read checkpointed page at startIndex {start_index}: {e}"
+                    )
+            if not isinstance(page_data, dict):
+                logger.debug(
+                    f"Resuming download from startIndex {self.next_start_index}."
+                )
+                for stale in offsets[i:]:
+                    os.remove(self._page_path(stale))
+                self.complete = False
+                self._write_manifest()
+                return
+            self.next_start_index += len(page_data.get("features", []))
+            yield page_data
+        if offsets and not self.complete:
+            logger.debug(
+                f"Resuming download from startIndex {self.next_start_index} using {len(offsets)} checkpointed pages."
+            )
+
+    def save(self, page_data: dict) -> None:
+        """
+        Saves a page at next_start_index and advances next_start_index past its features.
+
+        Parameters:
+            page_data (dict): The page of the WFS query result.
+        """
+        _write_atomic(
+            self._page_path(self.next_start_index),
+            json.dumps(page_data).encode("utf-8"),
+        )
+        self.next_start_index += len(page_data.get("features", []))
+
+    def mark_complete(self) -> None:
+        """Records that every page of the download has been saved."""
+        self.complete = True
+        self._write_manifest()
+
+    def clear(self) -> None:
+        """Removes the saved pages and the manifest."""
+        for start_index in self._saved_offsets():
+            os.remove(self._page_path(start_index))
+        if os.path.exists(self._manifest_path):
+            os.remove(self._manifest_path)
+        self.next_start_index = 0
+        self.complete = False
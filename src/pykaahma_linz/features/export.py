@@ -1,5 +1,7 @@
 # export.py
-import requests
+import hashlib
+import httpx
+import json
 import os
 from datetime import datetime
 from typing import Any
@@ -14,6 +16,8 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_TIMEOUT = 30  # Timeout in seconds for a standalone client
+
 
 class KExportError(Exception):
     """Custom exception for errors encountered during export operations."""
@@ -35,6 +39,134 @@ def _ensure_ending_slash(url: str) -> str:
     return url if url.endswith("/") else f"{url}/"
 
 
+def _post(
+    client: httpx.Client | None, url: str, headers: dict, data: dict
+) -> httpx.Response:
+    """
+    Posts a JSON payload, using a temporary client if none is supplied.
+
+    Parameters:
+        client (httpx.Client or None): The HTTP client to use.
+        url (str): The URL to post to.
+        headers (dict): HTTP headers for the request (including API key).
+        data (dict): The JSON payload.
+
+    Returns:
+        httpx.Response: The response from the server.
+    """
+    if client is not None:
+        return client.post(url, headers=headers, json=data)
+    with httpx.Client(timeout=DEFAULT_TIMEOUT) as temp_client:
+        return temp_client.post(url, headers=headers, json=data)
+
+
+def _item_url(api_url: str, id: str, data_type: str) -> str:
+    """
+    Builds the API URL of an item from its id and data type.
+
+    Parameters:
+        api_url (str): The base URL of the Koordinates API, ending with a slash.
+        id (str): The ID of the item.
+        data_type (str): The type of data ('layer' or 'table').
+
+    Returns:
+        str: The URL of the item.
+
+    Raises:
+        ValueError: If the data type is unsupported or not implemented.
+    """
+    if data_type == "layer":
+        return f"{api_url}layers/{id}/"
+    elif data_type == "table":
+        return f"{api_url}tables/{id}/"
+    raise ValueError(f"Unsupported or not implemented data type: {data_type}")
+
+
+def build_export_payload(
+    api_url: str,
+    items: list[tuple[str, str, str, str]],
+    crs: str = None,
+    extent: dict = None,
+    **kwargs: Any,
+) -> dict:
+    """
+    Builds the JSON payload for an export of one or more items.
+
+    The API takes one export format per kind of item, so all vector items in an export share
+    a format, as do all table items.
+
+    Parameters:
+        api_url (str): The base URL of the Koordinates API.
+        items (list[tuple]): The items to export, as (id, data_type, kind, export_format) tuples,
+            e.g. ("50772", "layer", "vector", "application/x-ogc-gpkg").
+        crs (str, optional): Coordinate Reference System, applied if any item is a layer.
+        extent (dict, optional): Spatial extent, applied if any item is a layer.
+        **kwargs: Additional parameters for the export.
+
+    Returns:
+        dict: The export payload.
+
+    Raises:
+        ValueError: If no items are given, a data type is unsupported, or items of the same kind
+            have different formats.
+    """
+    if not items:
+        raise ValueError("At least one item must be provided for an export.")
+
+    api_url = _ensure_ending_slash(api_url)
+    formats = {}
+    for id, data_type, kind, export_format in items:
+        if formats.setdefault(kind, export_format) != export_format:
+            raise ValueError(
+                f"All {kind} items in an export must use the same format. Got {formats[kind]} and {export_format}."
+            )
+
+    data = {
+        "items": [
+            {"item": _item_url(api_url, id, data_type)} for id, data_type, _, _ in items
+        ],
+        "formats": formats,
+        **kwargs,
+    }
+
+    has_layers = any(data_type == "layer" for _, data_type, _, _ in items)
+    if has_layers and crs:
+        data["crs"] = crs
+    if has_layers and extent:
+        data["extent"] = extent
+
+    logger.debug(f"{data=}")
+    return data
+
+
+def export_validation_key(
+    api_url: str,
+    items: list[tuple[str, str, str, str]],
+    crs: str = None,
+    extent: dict = None,
+    **kwargs: Any,
+) -> str:
+    """
+    Builds a key identifying an export request, for caching its validation result.
+
+    The key is a hash of the export payload, so it covers the items, their formats, the CRS,
+    the extent and any additional parameters.
+
+    Parameters:
+        api_url (str): The base URL of the Koordinates API.
+        items (list[tuple]): The items to export, as (id, data_type, kind, export_format) tuples.
+        crs (str, optional): Coordinate Reference System, if applicable.
+        extent (dict, optional): Spatial extent for the export.
+        **kwargs: Additional parameters for the export.
+
+    Returns:
+        str: A hex digest identifying the export request.
+    """
+    data = build_export_payload(api_url, items, crs=crs, extent=extent, **kwargs)
+    encoded = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
 def validate_export_params(
     api_url: str,
     api_key: str,
@@ -44,6 +176,7 @@ def validate_export_params(
     export_format: str,
     crs: str = None,
     extent: dict = None,
+    client: httpx.Client = None,
     **kwargs: Any,
 ) -> bool:
     """
@@ -58,6 +191,8 @@ def validate_export_params(
         export_format (str): The format for the export.
         crs (str, optional): Coordinate Reference System, if applicable.
         extent (dict, optional): Spatial extent for the export.
+        client (httpx.Client, optional): The HTTP client to use, typically the pooled KServer client.
+            If not provided, a temporary client is created for the request.
         **kwargs: Additional parameters for the export.
 
     Returns:
@@ -66,41 +201,56 @@ def validate_export_params(
     Raises:
         ValueError: If the data type is unsupported or not implemented.
     """
+    return validate_multi_export_params(
+        api_url,
+        api_key,
+        [(id, data_type, kind, export_format)],
+        crs=crs,
+        extent=extent,
+        client=client,
+        **kwargs,
+    )
 
 
-    # validation_url = f"{requests_url}validate/"
-    logger.info("Validating export parameters")
-    logger.info(data_type)
+def validate_multi_export_params(
+    api_url: str,
+    api_key: str,
+    items: list[tuple[str, str, str, str]],
+    crs: str = None,
+    extent: dict = None,
+    client: httpx.Client = None,
+    **kwargs: Any,
+) -> bool:
+    """
+    Validates export parameters for one or more items exported together.
 
-    api_url = _ensure_ending_slash(api_url)
-    if data_type == "layer":
-        download_url = f"{api_url}layers/"
-    elif data_type == "table":
-        download_url = f"{api_url}tables/"
-    else:
-        raise ValueError(f"Unsupported or not implemented data type: {data_type}")
-    validation_url = f"{api_url}exports/validate/"
+    Parameters:
+        api_url (str): The base URL of the Koordinates API.
+        api_key (str): The API key for authentication.
+        items (list[tuple]): The items to export, as (id, data_type, kind, export_format) tuples.
+        crs (str, optional): Coordinate Reference System, if applicable.
+        extent (dict, optional): Spatial extent for the export.
+        client (httpx.Client, optional): The HTTP client to use, typically the pooled KServer client.
+            If not provided, a temporary client is created for the request.
+        **kwargs: Additional parameters for the export.
 
-    logger.debug(f"{download_url=}")
+    Returns:
+        bool: True if the export parameters are valid, False otherwise.
 
-    data = {
-        "items": [{"item": f"{download_url}{id}/"}],
-        "formats": {f"{kind}": export_format},
-        **kwargs,
-    }
+    Raises:
+        ValueError: If the parameters are invalid, or the data type is unsupported or not implemented.
+    """
 
-    if data_type == "layer" and crs:
-        data["crs"] = crs
-    if data_type == "layer" and extent:
-        data["extent"] = extent
+    logger.info("Validating export parameters")
 
-    logger.debug(f"{data=}")
+    data = build_export_payload(api_url, items, crs=crs, extent=extent, **kwargs)
+    validation_url = f"{_ensure_ending_slash(api_url)}exports/validate/"
 
     headers = {"Authorization": f"key {api_key}"}
     is_valid = False
 
     try:
-        response = requests.post(validation_url, headers=headers, json=data)
+        response = _post(client, validation_url, headers, data)
         response.raise_for_status()
 
         # if response has any 200 status code, check for validation errors
@@ -120,7 +270,7 @@ def validate_export_params(
                 logger.debug(err)
                 raise ValueError(err)
 
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         status = e.response.status_code if e.response is not None else None
         logger.error(
             f"HTTP error during validation: {status} - {getattr(e.response, 'text', '')}"
@@ -144,6 +294,7 @@ def request_export(
     export_format: str,
     crs: str = None,
     extent: dict = None,
+    client: httpx.Client = None,
     **kwargs: Any,
 ) -> dict:
     """
@@ -158,6 +309,8 @@ def request_export(
         export_format (str): The format for the export.
         crs (str, optional): Coordinate Reference System, if applicable.
         extent (dict, optional): Spatial extent for the export.
+        client (httpx.Client, optional): The HTTP client to use, typically the pooled KServer client.
+            If not provided, a temporary client is created for the request.
         **kwargs: Additional parameters for the export.
 
     Returns:
@@ -167,37 +320,57 @@ def request_export(
         KExportError: If the export request fails or if the response cannot be parsed.
         ValueError: If the data type is unsupported or not implemented.
     """
+    return request_multi_export(
+        api_url,
+        api_key,
+        [(id, data_type, kind, export_format)],
+        crs=crs,
+        extent=extent,
+        client=client,
+        **kwargs,
+    )
 
-    logger.info("Requesting export")
 
-    api_url = _ensure_ending_slash(api_url)
-    export_url = f"{api_url}exports/"
-    if data_type == "layer":
-        download_url = f"{api_url}layers/"
-    elif data_type == "table":
-        download_url = f"{api_url}tables/"
-    else:
-        raise ValueError(f"Unsupported or not implemented data type: {data_type}")
-    logger.debug(f"{download_url=}")
+def request_multi_export(
+    api_url: str,
+    api_key: str,
+    items: list[tuple[str, str, str, str]],
+    crs: str = None,
+    extent: dict = None,
+    client: httpx.Client = None,
+    **kwargs: Any,
+) -> dict:
+    """
+    Requests a single export job covering one or more items from the Koordinates API.
 
-    data = {
-        "items": [{"item": f"{download_url}{id}/"}],
-        "formats": {f"{kind}": export_format},
-        **kwargs,
-    }
+    Parameters:
+        api_url (str): The base URL of the Koordinates API.
+        api_key (str): The API key for authentication.
+        items (list[tuple]): The items to export, as (id, data_type, kind, export_format) tuples.
+        crs (str, optional): Coordinate Reference System, if applicable.
+        extent (dict, optional): Spatial extent for the export.
+        client (httpx.Client, optional): The HTTP client to use, typically the pooled KServer client.
+            If not provided, a temporary client is created for the request.
+        **kwargs: Additional parameters for the export.
 
-    if data_type == "layer" and crs:
-        data["crs"] = crs
-    if data_type == "layer" and extent:
-        data["extent"] = extent
+    Returns:
+        dict: The response from the export request, typically containing job details.
 
-    logger.debug(f"{data=}")
+    Raises:
+        KExportError: If the export request fails or if the response cannot be parsed.
+        ValueError: If the data type is unsupported or not implemented.
+    """
+
+    logger.info("Requesting export")
+
+    data = build_export_payload(api_url, items, crs=crs, extent=extent, **kwargs)
+    export_url = f"{_ensure_ending_slash(api_url)}exports/"
 
     headers = {"Authorization": f"key {api_key}"}
 
     request_datetime = datetime.utcnow().isoformat()
     try:
-        response = requests.post(export_url, headers=headers, json=data)
+        response = _post(client, export_url, headers, data)
         response.raise_for_status()
         try:
             json_response = response.json()
@@ -205,7 +378,7 @@ def request_export(
             err = f"Error parsing JSON from export request: {e}"
             logger.debug(err)
             raise KExportError(err)
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         err = f"Failed export request with status code: {response.status_code}"
         logger.debug(err)
         logger.debug(e)
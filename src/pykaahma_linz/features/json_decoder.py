@@ -0,0 +1,95 @@
+# json_decoder.py
+"""
+Pluggable JSON decoding for WFS pages and API responses.
+
+Uses orjson or msgspec when installed, as they decode large GeoJSON pages
+considerably faster than the standard library, and falls back to json otherwise.
+"""
+
+import json
+import logging
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+def _available_decoders() -> dict[str, Callable[[bytes | str], Any]]:
+    """
+    Returns the JSON decoders that can be imported, in order of preference.
+
+    Returns:
+        dict: Decoder functions keyed by backend name.
+    """
+    decoders = {}
+    try:
+        import orjson
+
+        decoders["orjson"] = orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec
+
+        decoders["msgspec"] = msgspec.json.decode
+    except ImportError:
+        pass
+    decoders["json"] = json.loads
+    return decoders
+
+
+JSON_DECODERS = _available_decoders()
+_json_backend = next(iter(JSON_DECODERS))
+_json_decoder = JSON_DECODERS[_json_backend]
+logger.debug(f"Using '{_json_backend}' JSON decoder.")
+
+
+def get_json_backend() -> str:
+    """
+    Returns the name of the JSON decoder currently in use.
+
+    Returns:
+        str: 'orjson', 'msgspec' or 'json'.
+    """
+    return _json_backend
+
+
+def set_json_backend(name: str) -> None:
+    """
+    Selects the JSON decoder used for all WFS pages and API responses.
+
+    Parameters:
+        name (str): 'orjson', 'msgspec' or 'json'. The backend must be installed.
+
+    Raises:
+        ValueError: If the backend is not installed or not supported.
+    """
+    global _json_backend, _json_decoder
+    if name not in JSON_DECODERS:
+        raise ValueError(
+            f"JSON backend '{name}' is not available. Available backends: {list(JSON_DECODERS)}"
+        )
+    _json_backend = name
+    _json_decoder = JSON_DECODERS[name]
+    logger.debug(f"Using '{_json_backend}' JSON decoder.")
+
+
+def json_loads(data: bytes | str) -> Any:
+    """
+    Decodes a JSON document with the selected backend.
+
+    Parameters:
+        data (bytes or str): The JSON document, typically response.content.
+
+    Returns:
+        Any: The decoded Python object.
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+    """
+    try:
+        return _json_decoder(data)
+    except ValueError:
+        raise
+    except Exception as e:
+        # msgspec.DecodeError is not a ValueError, so normalise it for callers
+        raise ValueError(f"Invalid JSON: {e}") from e
@@ -1,8 +1,16 @@
 # wfs.py
-import requests
+import httpx
 import os
-from typing import Any
+import re
+import time
+import tempfile
+import math
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Generator, Iterator
 from tenacity import (
+    RetryCallState,
     retry,
     stop_after_attempt,
     wait_exponential,
@@ -10,11 +18,16 @@ from tenacity import (
     retry_if_not_exception_type,
 )
 import logging
+import pandas as pd
+from .checkpoint import WfsPageCheckpoint
+from .Conversion import read_wfs_file, apply_field_types, empty_frame
+from .json_decoder import json_loads
 
 logger = logging.getLogger(__name__)
 
 # --- Configuration ---
 DEFAULT_PAGE_COUNT = 1000  # Number of features per page request
+DEFAULT_TIMEOUT = 30  # Timeout in seconds for a standalone client
 
 # Default WFS parameters
 DEFAULT_WFS_SERVICE = "WFS"
@@ -22,7 +35,23 @@ DEFAULT_WFS_VERSION = "2.0.0"
 DEFAULT_WFS_REQUEST = "GetFeature"
 DEFAULT_WFS_OUTPUT_FORMAT = "json"
 DEFAULT_SRSNAME = "EPSG:2193"
-MAX_PAGE_FETCHES = 1000  # Maximum number of pages to fetch, to prevent infinite loops
+
+# What to do when a download stops before every matching feature has been fetched
+TRUNCATION_ACTIONS = ("warn", "raise", "ignore")
+
+# Adaptive page sizing
+ADAPTIVE_MIN_PAGE_COUNT = 100  # Smallest page size the adaptive mode will shrink to
+ADAPTIVE_MAX_PAGE_COUNT = 10000  # Largest page size the adaptive mode will grow to
+ADAPTIVE_TARGET_PAGE_SECONDS = 5  # Aim for pages that take about this long to fetch
+ADAPTIVE_MAX_PAGE_BYTES = 25_000_000  # Shrink pages with responses larger than this
+
+# File based output formats: name -> (WFS outputFormat, file extension)
+WFS_FILE_OUTPUT_FORMATS = {
+    "csv": ("csv", ".csv"),
+    "gml": ("gml32", ".gml"),
+}
+# Columns holding the feature id in pages read from CSV or GML, in order of preference
+FRAME_ID_COLUMNS = ("FID", "gml_id", "id")
 
 
 class WfsDownloaderError(Exception):
@@ -37,41 +66,198 @@ class WfsBadRequestError(WfsDownloaderError):
     pass
 
 
+class WfsTruncatedError(WfsDownloaderError):
+    """Raised when a WFS download stops before every matching feature has been fetched."""
+
+    pass
+
+
+def _check_on_truncation(on_truncation: str) -> None:
+    if on_truncation not in TRUNCATION_ACTIONS:
+        raise ValueError(
+            f"Unsupported on_truncation value '{on_truncation}'. Expected one of: {list(TRUNCATION_ACTIONS)}"
+        )
+
+
+def _handle_truncation(message: str, on_truncation: str) -> None:
+    """
+    Reports a truncated download according to on_truncation.
+
+    Parameters:
+        message (str): Description of the truncation.
+        on_truncation (str): 'warn' logs a warning, 'raise' raises WfsTruncatedError and 'ignore' does nothing.
+
+    Raises:
+        WfsTruncatedError: If on_truncation is 'raise'.
+    """
+    if on_truncation == "raise":
+        raise WfsTruncatedError(message)
+    if on_truncation == "warn":
+        logger.warning(message)
+
+
+def _check_features_fetched(
+    typeNames: str,
+    features_fetched: int,
+    expected_total: int | None,
+    count: int | None,
+    on_truncation: str,
+) -> None:
+    """Reports a truncated download if fewer features were fetched than the service reported."""
+    if expected_total is None:
+        return
+    expected = expected_total if count is None else min(expected_total, count)
+    if features_fetched < expected:
+        _handle_truncation(
+            f"Downloaded {features_fetched} of {expected} expected features for '{typeNames}'. "
+            "The service may limit the number of features it returns, or the layer changed during the download.",
+            on_truncation,
+        )
+
+
+class _AdaptivePageSizer:
+    """
+    Tunes the WFS page size from the observed latency and size of each page.
+
+    Pages that come back quickly and small grow the page size (e.g. light point layers),
+    while slow, large, retried or timed out pages shrink it (e.g. heavy parcel polygons).
+
+    Attributes:
+        page_count (int): The page size to request next.
+        min_page_count (int): The smallest page size to shrink to.
+        max_page_count (int): The largest page size to grow to.
+        target_seconds (float): The target time to fetch a page.
+        max_page_bytes (int): The largest response size before shrinking.
+    """
+
+    def __init__(
+        self,
+        page_count: int = DEFAULT_PAGE_COUNT,
+        min_page_count: int = ADAPTIVE_MIN_PAGE_COUNT,
+        max_page_count: int = ADAPTIVE_MAX_PAGE_COUNT,
+        target_seconds: float = ADAPTIVE_TARGET_PAGE_SECONDS,
+        max_page_bytes: int = ADAPTIVE_MAX_PAGE_BYTES,
+    ) -> None:
+        self.min_page_count = min(min_page_count, page_count)
+        self.max_page_count = max(max_page_count, page_count)
+        self.page_count = page_count
+        self.target_seconds = target_seconds
+        self.max_page_bytes = max_page_bytes
+
+    def observe(self, elapsed: float, num_bytes: int, attempts: int = 1) -> int:
+        """
+        Updates the page size from a successfully fetched page.
+
+        Parameters:
+            elapsed (float): Seconds taken to fetch the page, including any retries.
+            num_bytes (int): Size of the response body in bytes.
+            attempts (int, optional): Number of attempts needed to fetch the page. Defaults to 1.
+
+        Returns:
+            int: The page size to request next.
+        """
+        if (
+            attempts > 1
+            or elapsed > self.target_seconds
+            or num_bytes > self.max_page_bytes
+        ):
+            self.shrink()
+        elif elapsed < self.target_seconds / 2 and num_bytes < self.max_page_bytes / 2:
+            previous = self.page_count
+            self.page_count = min(self.page_count * 2, self.max_page_count)
+            if self.page_count != previous:
+                logger.debug(f"Growing WFS page size to {self.page_count}")
+        return self.page_count
+
+    def shrink(self) -> bool:
+        """
+        Halves the page size, down to the minimum.
+
+        Returns:
+            bool: True if the page size was reduced, False if it was already at the minimum.
+        """
+        if self.page_count <= self.min_page_count:
+            return False
+        self.page_count = max(self.page_count // 2, self.min_page_count)
+        logger.debug(f"Shrinking WFS page size to {self.page_count}")
+        return True
+
+
+def _shrink_page_on_timeout(retry_state: RetryCallState) -> None:
+    """
+    Halves the page size of an adaptive download before a timed out request is retried.
+
+    Used as the tenacity before_sleep callback of the page fetchers. The request parameters
+    are updated in place, so the retry asks for the smaller page.
+
+    Parameters:
+        retry_state (RetryCallState): The state of the failed attempt. The fetcher must have
+            been called with params and sizer as keyword arguments.
+    """
+    sizer = retry_state.kwargs.get("sizer")
+    if sizer is None or not isinstance(
+        retry_state.outcome.exception(), httpx.TimeoutException
+    ):
+        return
+    params = retry_state.kwargs["params"]
+    if sizer.shrink() and sizer.page_count < params["count"]:
+        logger.warning(
+            f"Page at startIndex {params['startIndex']} timed out for '{params['typeNames']}'. "
+            f"Retrying with page size {sizer.page_count}."
+        )
+        params["count"] = sizer.page_count
+
+
 @retry(
     retry=retry_if_not_exception_type((WfsDownloaderError, WfsBadRequestError)),
     stop=stop_after_attempt(5),  # Retry up to 5 times for failed requests
     wait=wait_exponential(
         multiplier=1, min=2, max=10
     ),  # Exponential backoff: 2s, 4s, 8s, 10s, 10s
+    before_sleep=_shrink_page_on_timeout,
     reraise=True,  # Reraise the last exception if all retries fail
 )
-def _fetch_single_page_data(url: str, headers: dict, params: dict, timeout=30) -> dict:
+def _fetch_single_page_data(
+    client: httpx.Client,
+    url: str,
+    headers: dict,
+    params: dict,
+    timeout=httpx.USE_CLIENT_DEFAULT,
+    page_stats: dict = None,
+    sizer: _AdaptivePageSizer = None,
+) -> dict:
     """
     Fetches a single page of WFS data with retry logic for transient issues.
 
     Parameters:
+        client (httpx.Client): The HTTP client to send the request with.
         url (str): The WFS service endpoint URL.
         headers (dict): HTTP headers for the request (including API key).
         params (dict): Query parameters for the WFS request.
-        timeout (int, optional): Timeout for the request in seconds. Default is 30.
+        timeout (int, optional): Timeout for the request in seconds. Defaults to the client timeout.
+        page_stats (dict, optional): If provided, the response size in bytes is stored under 'bytes'.
+        sizer (_AdaptivePageSizer, optional): If provided, a timed out request is retried with a
+            smaller page, and params['count'] is updated to the page size used.
 
     Returns:
         dict: The JSON response from the WFS service for the page.
 
     Raises:
         WfsDownloaderError: If a non-retryable HTTP error occurs or request times out.
-        requests.exceptions.RequestException: For other request issues that tenacity will handle.
+        httpx.HTTPError: For other request issues that tenacity will handle.
     """
     try:
         logger.debug(f"Requesting WFS data. URL: {url}, Params: {params}")
-        response = requests.get(url, headers=headers, params=params, timeout=timeout)
+        response = client.get(url, headers=headers, params=params, timeout=timeout)
         response.raise_for_status()
-        json_data = response.json()
+        if page_stats is not None:
+            page_stats["bytes"] = len(response.content)
+        json_data = json_loads(response.content)
         logger.debug(
             f"Successfully fetched page. Status: {response.status_code}, Features: {len(json_data.get('features', []))}"
         )
         return json_data
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         status = e.response.status_code if e.response is not None else None
         logger.warning(
             f"HTTP ## error for URL {url}: {status} - {getattr(e.response, 'text', '')}"
@@ -82,14 +268,422 @@ def _fetch_single_page_data(url: str, headers: dict, params: dict, timeout=30) -
                 f"Bad request ({status}) for URL {url}: {getattr(e.response, 'text', '')}"
             ) from e
         raise  # Let tenacity retry for other HTTP errors
-    except (
-        requests.exceptions.RequestException
-    ) as e:  # Catch other network/request related errors
+    except httpx.HTTPError as e:  # Catch other network/request related errors
         logger.warning(f"Request failed for URL {url}: {e}")
         raise  # Reraise for tenacity to handle
 
 
-def download_wfs_data(
+@retry(
+    retry=retry_if_not_exception_type((WfsDownloaderError, WfsBadRequestError)),
+    stop=stop_after_attempt(5),  # Retry up to 5 times for failed requests
+    wait=wait_exponential(
+        multiplier=1, min=2, max=10
+    ),  # Exponential backoff: 2s, 4s, 8s, 10s, 10s
+    before_sleep=_shrink_page_on_timeout,
+    reraise=True,  # Reraise the last exception if all retries fail
+)
+def _download_single_page_file(
+    client: httpx.Client,
+    url: str,
+    headers: dict,
+    params: dict,
+    file_path: str,
+    timeout=httpx.USE_CLIENT_DEFAULT,
+    sizer: _AdaptivePageSizer = None,
+) -> str:
+    """
+    Streams a single page of WFS data to a file with retry logic for transient issues.
+
+    Parameters:
+        client (httpx.Client): The HTTP client to send the request with.
+        url (str): The WFS service endpoint URL.
+        headers (dict): HTTP headers for the request (including API key).
+        params (dict): Query parameters for the WFS request.
+        file_path (str): The file to write the response body to. Overwritten on each attempt.
+        timeout (int, optional): Timeout for the request in seconds. Defaults to the client timeout.
+        sizer (_AdaptivePageSizer, optional): If provided, a timed out request is retried with a
+            smaller page, and params['count'] is updated to the page size used.
+
+    Returns:
+        str: The path of the written file.
+
+    Raises:
+        WfsBadRequestError: If a 4xx HTTP error occurs.
+        httpx.HTTPError: For other request issues that tenacity will handle.
+    """
+    logger.debug(f"Requesting WFS data to file. URL: {url}, Params: {params}")
+    with client.stream(
+        "GET", url, headers=headers, params=params, timeout=timeout
+    ) as response:
+        if 400 <= response.status_code < 500:
+            response.read()
+            raise WfsBadRequestError(
+                f"Bad request ({response.status_code}) for URL {url}: {response.text}"
+            )
+        response.raise_for_status()
+        with open(file_path, "wb") as f:
+            for chunk in response.iter_bytes():
+                f.write(chunk)
+    return file_path
+
+
+def _build_wfs_params(
+    typeNames: str,
+    srsName: str,
+    start_index: int,
+    page_count: int,
+    cql_filter: str = None,
+    **other_wfs_params: Any,
+) -> dict:
+    """
+    Builds the query parameters for a single WFS GetFeature page request.
+
+    Parameters:
+        typeNames (str): The typeNames for the desired layer (e.g., "layer-12345").
+        srsName (str): Spatial Reference System name (e.g., "EPSG:2193").
+        start_index (int): The index of the first feature of the page.
+        page_count (int): Number of features to request.
+        cql_filter (str, optional): CQL filter to apply to the WFS request.
+        **other_wfs_params: Additional WFS parameters.
+
+    Returns:
+        dict: The WFS request parameters.
+    """
+    return {
+        "service": DEFAULT_WFS_SERVICE,
+        "version": DEFAULT_WFS_VERSION,
+        "request": DEFAULT_WFS_REQUEST,
+        "outputFormat": DEFAULT_WFS_OUTPUT_FORMAT,
+        "typeNames": typeNames,
+        "srsName": srsName,
+        "startIndex": start_index,
+        "count": page_count,
+        "cql_filter": cql_filter,
+        **{k: v for k, v in other_wfs_params.items()},
+    }
+
+
+class _PagePlan:
+    """
+    Plans the page requests of a sequential WFS download and checks each page as it arrives.
+
+    Shared by the JSON, file based and asynchronous downloaders, which differ only in how a
+    page is fetched and read. Call next_params for each request, record the fetched page with
+    add_page (or add_json_page) and stop once next_params returns None.
+
+    Attributes:
+        start_index (int): The index of the first feature of the next page.
+        features_fetched (int): The number of features fetched, including any before the initial start_index.
+        pages_fetched (int): The number of pages requested.
+        done (bool): True once no more pages are needed.
+        max_pages_reached (bool): True if paging stopped because max_pages was reached.
+    """
+
+    def __init__(
+        self,
+        typeNames: str,
+        srsName: str,
+        cql_filter: str = None,
+        count: int = None,
+        page_count: int = DEFAULT_PAGE_COUNT,
+        start_index: int = 0,
+        max_pages: int = None,
+        on_truncation: str = "warn",
+        sizer: _AdaptivePageSizer = None,
+        **other_wfs_params: Any,
+    ) -> None:
+        """
+        Parameters:
+            typeNames (str): The typeNames for the desired layer (e.g., "layer-12345").
+            srsName (str): Spatial Reference System name (e.g., "EPSG:2193").
+            cql_filter (str, optional): CQL filter to apply to the WFS request.
+            count (int, optional): Maximum number of features to fetch.
+            page_count (int, optional): Number of features per page request. Defaults to DEFAULT_PAGE_COUNT.
+            start_index (int, optional): The index of the first feature to request. Defaults to 0.
+            max_pages (int, optional): Stop after this many page requests. Defaults to None (no limit).
+            on_truncation (str, optional): 'warn' (default), 'raise' or 'ignore', if max_pages is reached.
+            sizer (_AdaptivePageSizer, optional): Sets the page size of each request, for an adaptive download.
+            **other_wfs_params: Additional WFS parameters.
+        """
+        self.typeNames = typeNames
+        self.srsName = srsName
+        self.cql_filter = cql_filter
+        self.count = count
+        self.page_count = min(page_count, count) if count is not None else page_count
+        self.max_pages = max_pages
+        self.on_truncation = on_truncation
+        self.sizer = sizer
+        self.other_wfs_params = other_wfs_params
+        self.start_index = start_index
+        # Features before start_index were fetched previously
+        self.features_fetched = start_index
+        self.pages_fetched = 0
+        self.done = count is not None and self.features_fetched >= count
+        self.max_pages_reached = False
+        self._previous_first_id = None
+
+    def next_params(self) -> dict | None:
+        """
+        Returns the parameters of the next page request.
+
+        Returns:
+            dict or None: The WFS request parameters, or None if no more pages are needed.
+
+        Raises:
+            WfsTruncatedError: If max_pages is reached and on_truncation is 'raise'.
+        """
+        if self.done:
+            return None
+        if self.max_pages is not None and self.pages_fetched >= self.max_pages:
+            self.done = True
+            self.max_pages_reached = True
+            _handle_truncation(
+                f"Stopped downloading '{self.typeNames}' after {self.pages_fetched} pages ({self.features_fetched} features) "
+                f"because max_pages was reached. More features may be available.",
+                self.on_truncation,
+            )
+            return None
+        self.pages_fetched += 1
+        page_count = self.page_count
+        if self.sizer is not None:
+            page_count = self.sizer.page_count
+            if self.count is not None:
+                page_count = min(page_count, self.count - self.features_fetched)
+        return _build_wfs_params(
+            self.typeNames,
+            self.srsName,
+            self.start_index,
+            page_count,
+            cql_filter=self.cql_filter,
+            **self.other_wfs_params,
+        )
+
+    def add_page(self, params: dict, num_features: int, first_id: Any = None) -> bool:
+        """
+        Records a fetched page and works out whether another page is needed.
+
+        Parameters:
+            params (dict): The parameters the page was requested with. A timed out request
+                of an adaptive download may have been retried with a smaller params['count'].
+            num_features (int): The number of features on the page.
+            first_id (optional): The id of the first feature on the page, used to detect a
+                service that ignores startIndex.
+
+        Returns:
+            bool: True if the page should be passed on. An empty page is only passed on if it
+                is the first, for its columns or metadata.
+
+        Raises:
+            WfsDownloaderError: If the service returned the same page twice.
+        """
+        page_count = params["count"]
+        if num_features == 0:
+            logger.debug(
+                f"No more features found for '{self.typeNames}' at startIndex {self.start_index}. Download likely complete."
+            )
+            self.done = True
+            return self.features_fetched == 0
+        # Guard against a service that ignores startIndex and returns the same page forever
+        if first_id is not None and first_id == self._previous_first_id:
+            raise WfsDownloaderError(
+                f"The service returned the same page twice for '{self.typeNames}' (startIndex {self.start_index}). "
+                "It may not support paging."
+            )
+        self._previous_first_id = first_id
+        self.features_fetched += num_features
+        logger.debug(
+            f"Fetched {num_features} features for '{self.typeNames}'. Total fetched so far: {self.features_fetched}."
+        )
+        if num_features < page_count:
+            # Fewer features than requested means this was the last page
+            logger.debug(
+                f"Last page fetched for '{self.typeNames}' (received {num_features} features, requested up to {page_count})."
+            )
+            self.done = True
+        elif self.count is not None and self.features_fetched >= self.count:
+            logger.debug(
+                f"Reached maximum count of {self.count} features for '{self.typeNames}'. Stopping download."
+            )
+            self.done = True
+        else:
+            self.start_index += page_count
+        return True
+
+    def add_json_page(self, params: dict, page_data: Any) -> bool:
+        """
+        Records a fetched GeoJSON page. See add_page.
+
+        Parameters:
+            params (dict): The parameters the page was requested with.
+            page_data (dict): The decoded response of the service.
+
+        Returns:
+            bool: True if the page should be passed on.
+        """
+        if not page_data or not isinstance(page_data, dict):
+            logger.warning(
+                f"Received empty or invalid data for '{self.typeNames}' at startIndex {self.start_index}. Assuming end of data."
+            )
+            self.done = True
+            return False
+        features = page_data.get("features", [])
+        first_id = features[0].get("id") if features else None
+        return self.add_page(params, len(features), first_id)
+
+    def finish(self, expected_total: int | None) -> None:
+        """
+        Reports a truncated download once paging has finished, unless max_pages stopped it.
+
+        Parameters:
+            expected_total (int or None): The number of features the service reported, if known.
+
+        Raises:
+            WfsTruncatedError: If the download was truncated and on_truncation is 'raise'.
+        """
+        if not self.max_pages_reached:
+            _check_features_fetched(
+                self.typeNames,
+                self.features_fetched,
+                expected_total,
+                self.count,
+                self.on_truncation,
+            )
+
+
+def _fetch_page(
+    client: httpx.Client,
+    url: str,
+    headers: dict,
+    params: dict,
+    typeNames: str,
+    file_path: str = None,
+    page_stats: dict = None,
+    sizer: _AdaptivePageSizer = None,
+) -> dict | str:
+    """
+    Fetches a single page, converting retry and unexpected failures into WfsDownloaderError.
+
+    Parameters:
+        client (httpx.Client): The HTTP client to send the request with.
+        url (str): The WFS service endpoint URL.
+        headers (dict): HTTP headers for the request (including API key).
+        params (dict): Query parameters for the WFS request.
+        typeNames (str): The typeNames being downloaded, used in error messages.
+        file_path (str, optional): If provided, the page is streamed to this file instead of
+            being parsed as JSON.
+        page_stats (dict, optional): If provided, the response size in bytes and the number of
+            attempts are stored under 'bytes' and 'attempts'.
+        sizer (_AdaptivePageSizer, optional): The page sizer of an adaptive download. A timed out
+            request is retried with a smaller page, and params['count'] is updated to match.
+
+    Returns:
+        dict or str: The JSON response from the WFS service for the page, or the file path.
+
+    Raises:
+        WfsBadRequestError: If the service rejects the request.
+        WfsDownloaderError: If the page could not be fetched after all retries.
+    """
+    start_index = params.get("startIndex")
+    try:
+        if file_path is not None:
+            fetch = _download_single_page_file
+            page_data = fetch(
+                client, url, headers, params=params, file_path=file_path, sizer=sizer
+            )
+        else:
+            fetch = _fetch_single_page_data
+            page_data = fetch(
+                client,
+                url,
+                headers,
+                params=params,
+                page_stats=page_stats,
+                sizer=sizer,
+            )
+        if page_stats is not None:
+            page_stats["attempts"] = fetch.statistics.get("attempt_number", 1)
+            if file_path is not None:
+                page_stats["bytes"] = os.path.getsize(file_path)
+        return page_data
+    except WfsBadRequestError as e:
+        logger.error(f"### Bad request error: {e}")
+        raise
+    except RetryError as e:  # This occurs if tenacity gives up after all retry attempts
+        # The original exception from the last attempt is available in e.last_attempt.exception()
+        last_exception = e.last_attempt.exception() if e.last_attempt else e
+        logger.error(
+            f"All retries failed for '{typeNames}' at startIndex {start_index}. Last error: {last_exception}"
+        )
+        raise WfsDownloaderError(
+            f"Failed to download WFS data for '{typeNames}' after multiple retries. Last error: {last_exception}"
+        ) from last_exception
+    except (
+        WfsDownloaderError
+    ):  # Raised directly by _fetch_single_page_data for non-retryable issues
+        raise  # Propagate the error
+    except Exception as e:
+        logger.error(
+            f"Unexpected error for '{typeNames}' at startIndex {start_index}: {e}"
+        )
+        raise WfsDownloaderError(
+            f"Failed to download WFS data for '{typeNames}' due to unexpected error: {e}"
+        ) from e
+
+
+def get_wfs_hit_count(
+    url: str,
+    typeNames: str,
+    api_key: str,
+    cql_filter: str = None,
+    client: httpx.Client = None,
+    **other_wfs_params: Any,
+) -> int | None:
+    """
+    Asks the WFS service how many features match a request, without downloading them.
+
+    Uses a GetFeature request with resultType=hits and reads the numberMatched attribute
+    from the response.
+
+    Parameters:
+        url (str): The base URL of the WFS service.
+        typeNames (str): The typeNames for the desired layer (e.g., "layer-12345").
+        api_key (str): API key.
+        cql_filter (str, optional): CQL filter to apply to the WFS request. Defaults to None.
+        client (httpx.Client, optional): The HTTP client to use. A temporary client is created if not provided.
+        **other_wfs_params: Additional WFS parameters.
+
+    Returns:
+        int or None: The number of matching features, or None if the service did not report it.
+    """
+    headers = {"Authorization": f"key {api_key}"}
+    params = {
+        "service": DEFAULT_WFS_SERVICE,
+        "version": DEFAULT_WFS_VERSION,
+        "request": DEFAULT_WFS_REQUEST,
+        "typeNames": typeNames,
+        "resultType": "hits",
+        "cql_filter": cql_filter,
+        **{k: v for k, v in other_wfs_params.items()},
+    }
+    try:
+        if client is None:
+            with httpx.Client(timeout=DEFAULT_TIMEOUT) as temp_client:
+                response = temp_client.get(url, headers=headers, params=params)
+        else:
+            response = client.get(url, headers=headers, params=params)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.warning(f"Hit count request failed for '{typeNames}': {e}")
+        return None
+
+    match = re.search(r'numberMatched="(\d+)"', response.text)
+    if match is None:
+        logger.debug(f"Service did not report numberMatched for '{typeNames}'.")
+        return None
+    return int(match.group(1))
+
+
+def iter_wfs_pages(
     url: str,
     typeNames: str,
     api_key: str,
@@ -97,10 +691,24 @@ def download_wfs_data(
     cql_filter: str = None,
     count=None,
     page_count: int = DEFAULT_PAGE_COUNT,
+    client: httpx.Client = None,
+    max_workers: int = 1,
+    feature_count: int = None,
+    adaptive: bool = False,
+    checkpoint_dir: str = None,
+    max_pages: int = None,
+    on_truncation: str = "warn",
     **other_wfs_params: Any,
-) -> dict:
+) -> Iterator[dict]:
     """
-    Downloads features from a WFS service, handling pagination and retries.
+    Yields pages of features from a WFS service as they arrive, handling pagination and retries.
+
+    Each page is the GeoJSON FeatureCollection-like dictionary returned by the service, so only
+    one page (or, in concurrent mode, a small window of pages) is held in memory at a time.
+
+    With max_workers greater than 1 the page offsets are planned up front from feature_count
+    (or a resultType=hits probe if it is not supplied) and fetched concurrently, then yielded
+    in order. Each page keeps the same retry behaviour as a sequential download.
 
     Parameters:
         url (str): The base URL of the WFS service (e.g., "https://data.linz.govt.nz/services/wfs").
@@ -110,120 +718,599 @@ def download_wfs_data(
         cql_filter (str, optional): CQL filter to apply to the WFS request. Defaults to None.
         count (int, optional): Maximum number of features to fetch.
         page_count (int, optional): Number of features per page request. Defaults to DEFAULT_PAGE_COUNT.
+        client (httpx.Client, optional): The HTTP client to use, typically the pooled KServer client.
+            If not provided, a temporary client is created for this download.
+        max_workers (int, optional): Number of pages to fetch concurrently. Defaults to 1 (sequential).
+        feature_count (int, optional): The known number of features matching the request, used to plan
+            concurrent page offsets. Only pass this if no filter is applied. Defaults to None.
+        adaptive (bool, optional): Tune the page size as the download progresses, starting from page_count.
+            Pages grow while responses are fast and small, and shrink when they are slow, large, retried
+            or time out. Only applies to sequential downloads. Defaults to False.
+        checkpoint_dir (str, optional): A directory to save each page in as it completes. If a download
+            with the same query fails part way, calling again with the same directory replays the saved
+            pages and resumes from the offset after the last one. Defaults to None (no checkpoints).
+        max_pages (int, optional): Stop after this many page requests. Defaults to None (no limit), in which
+            case paging ends at the first short or empty page, or once count features are fetched.
+        on_truncation (str, optional): What to do if the download stops before every matching feature is
+            fetched, i.e. max_pages was reached or fewer features arrived than feature_count (or the hit
+            count) promised. 'warn' (default) logs a warning, 'raise' raises WfsTruncatedError once the
+            fetched pages have been yielded, and 'ignore' does nothing.
         **other_wfs_params: Additional WFS parameters.
 
-    Returns:
-        dict: A GeoJSON FeatureCollection-like dictionary containing all fetched features.
+    Yields:
+        dict: A page of features, in startIndex order.
 
     Raises:
         WfsDownloaderError: If the API key or layer_id is missing, or if data fetching fails after all retries.
+        WfsTruncatedError: If the download was truncated and on_truncation is 'raise'.
     """
 
     if not api_key:
         raise WfsDownloaderError("API key must be provided.")
     if not typeNames:
         raise WfsDownloaderError("Typenames (i.e. layer id) must be provided.")
+    _check_on_truncation(on_truncation)
 
-    headers = {"Authorization": f"key {api_key}"}
-    all_features = []
+    checkpoint = None
     start_index = 0
-    page_count = min(page_count, count) if count is not None else page_count
-    crs_info = None
-    total_features_service_reported = None
+    pages_replayed = 0
+    if checkpoint_dir is not None:
+        checkpoint = WfsPageCheckpoint(
+            checkpoint_dir,
+            query={
+                "url": url,
+                "typeNames": typeNames,
+                "srsName": srsName,
+                "cql_filter": cql_filter,
+                "count": count,
+                **other_wfs_params,
+            },
+        )
+        for page_data in checkpoint.iter_pages():
+            pages_replayed += 1
+            yield page_data
+        if checkpoint.complete:
+            logger.debug(f"Download of '{typeNames}' loaded from checkpoint.")
+            return
+        start_index = checkpoint.next_start_index
+
+    owns_client = client is None
+    if owns_client:
+        client = httpx.Client(timeout=DEFAULT_TIMEOUT)
+    try:
+        pages = _iter_wfs_pages(
+            client,
+            url,
+            typeNames,
+            api_key,
+            srsName=srsName,
+            cql_filter=cql_filter,
+            count=count,
+            page_count=page_count,
+            max_workers=max_workers,
+            feature_count=feature_count,
+            adaptive=adaptive,
+            start_index=start_index,
+            # Replayed pages count towards max_pages, as if they had been fetched again
+            max_pages=(
+                max(max_pages - pages_replayed, 0) if max_pages is not None else None
+            ),
+            on_truncation=on_truncation,
+            **other_wfs_params,
+        )
+        while True:
+            try:
+                page_data = next(pages)
+            except StopIteration as stop:
+                complete = stop.value
+                break
+            if checkpoint is not None and isinstance(page_data, dict):
+                checkpoint.save(page_data)
+            yield page_data
+        # A download stopped by max_pages is left open, so a later call can carry on from it
+        if checkpoint is not None and complete:
+            checkpoint.mark_complete()
+    finally:
+        if owns_client:
+            client.close()
+
+
+def download_wfs_data(
+    url: str,
+    typeNames: str,
+    api_key: str,
+    srsName: str = DEFAULT_SRSNAME,
+    cql_filter: str = None,
+    count=None,
+    page_count: int = DEFAULT_PAGE_COUNT,
+    client: httpx.Client = None,
+    max_workers: int = 1,
+    feature_count: int = None,
+    adaptive: bool = False,
+    checkpoint_dir: str = None,
+    max_pages: int = None,
+    on_truncation: str = "warn",
+    **other_wfs_params: Any,
+) -> dict:
+    """
+    Downloads features from a WFS service, handling pagination and retries.
+
+    Collects all the pages yielded by iter_wfs_pages into a single dictionary. Use
+    iter_wfs_pages directly to process large layers without holding every feature in memory.
+
+    Parameters:
+        url (str): The base URL of the WFS service (e.g., "https://data.linz.govt.nz/services/wfs").
+        typeNames (str): The typeNames for the desired layer (e.g., "layer-12345").
+        api_key (str): API key.
+        srsName (str, optional): Spatial Reference System name (e.g., "EPSG:2193"). Defaults to "EPSG:2193".
+        cql_filter (str, optional): CQL filter to apply to the WFS request. Defaults to None.
+        count (int, optional): Maximum number of features to fetch.
+        page_count (int, optional): Number of features per page request. Defaults to DEFAULT_PAGE_COUNT.
+        client (httpx.Client, optional): The HTTP client to use, typically the pooled KServer client.
+            If not provided, a temporary client is created for this download.
+        max_workers (int, optional): Number of pages to fetch concurrently. Defaults to 1 (sequential).
+        feature_count (int, optional): The known number of features matching the request, used to plan
+            concurrent page offsets. Only pass this if no filter is applied. Defaults to None.
+        adaptive (bool, optional): Tune the page size as the download progresses, starting from page_count.
+            Pages grow while responses are fast and small, and shrink when they are slow, large, retried
+            or time out. Only applies to sequential downloads. Defaults to False.
+        checkpoint_dir (str, optional): A directory to save each page in as it completes. If a download
+            with the same query fails part way, calling again with the same directory replays the saved
+            pages and resumes from the offset after the last one. Defaults to None (no checkpoints).
+        max_pages (int, optional): Stop after this many page requests. Defaults to None (no limit), in which
+            case paging ends at the first short or empty page, or once count features are fetched.
+        on_truncation (str, optional): What to do if the download stops before every matching feature is
+            fetched, i.e. max_pages was reached or fewer features arrived than feature_count (or the hit
+            count) promised. 'warn' (default) logs a warning, 'raise' raises WfsTruncatedError once the
+            fetched pages have been yielded, and 'ignore' does nothing.
+        **other_wfs_params: Additional WFS parameters.
+
+    Returns:
+        dict: A GeoJSON FeatureCollection-like dictionary containing all fetched features.
+
+    Raises:
+        WfsDownloaderError: If the API key or layer_id is missing, or if data fetching fails after all retries.
+        WfsTruncatedError: If the download was truncated and on_truncation is 'raise'.
+    """
+
+    all_features = []
 
     # The final result to return
     result = None
 
+    for page_data in iter_wfs_pages(
+        url,
+        typeNames,
+        api_key,
+        srsName=srsName,
+        cql_filter=cql_filter,
+        count=count,
+        page_count=page_count,
+        client=client,
+        max_workers=max_workers,
+        feature_count=feature_count,
+        adaptive=adaptive,
+        checkpoint_dir=checkpoint_dir,
+        max_pages=max_pages,
+        on_truncation=on_truncation,
+        **other_wfs_params,
+    ):
+        result = page_data if result is None else result
+        all_features.extend(page_data.get("features", []))
+
+    return _assemble_result(typeNames, result, all_features)
+
+
+def _assemble_result(typeNames: str, result: dict | None, all_features: list) -> dict:
+    """
+    Combines the features from every page into the first page's FeatureCollection.
+
+    Parameters:
+        typeNames (str): The typeNames of the downloaded layer, for logging.
+        result (dict or None): The first page, used as the template for the result.
+        all_features (list): The features from every page, in order.
+
+    Returns:
+        dict: A GeoJSON FeatureCollection-like dictionary containing all fetched features.
+    """
+    if result is None:
+        result = {"type": "FeatureCollection"}
+    result["features"] = all_features
+
+    # LINZ api seems to always return totalFeatures as "unknown" in the response
+    # So here we manually set it to the number of features we have
+    result["totalFeatures"] = len(all_features)
+    # remove numberReturned because it relates to the last page, not the total
+    result.pop("numberReturned", None)
+
+    logger.debug(
+        f"Finished WFS data download for '{typeNames}'. Total features retrieved: {len(all_features)}."
+    )
+    return result
+
+
+def _iter_pages_concurrently(
+    client: httpx.Client,
+    url: str,
+    headers: dict,
+    typeNames: str,
+    srsName: str,
+    cql_filter: str,
+    total: int,
+    page_count: int,
+    max_workers: int,
+    start_index: int = 0,
+    **other_wfs_params: Any,
+) -> Iterator[dict]:
+    """
+    Fetches the pages covering the first `total` features concurrently and yields them in order.
+
+    At most 2 * max_workers pages are in flight or waiting to be consumed at any time, so
+    memory stays bounded even if the caller processes pages slower than they arrive.
+
+    Parameters:
+        client (httpx.Client): The HTTP client to send the requests with.
+        url (str): The WFS service endpoint URL.
+        headers (dict): HTTP headers for the request (including API key).
+        typeNames (str): The typeNames for the desired layer.
+        srsName (str): Spatial Reference System name.
+        cql_filter (str): CQL filter to apply to the WFS request.
+        total (int): The number of features to cover.
+        page_count (int): Number of features per page request.
+        max_workers (int): Maximum number of concurrent page requests.
+        start_index (int, optional): The offset of the first page. Defaults to 0.
+        **other_wfs_params: Additional WFS parameters.
+
+    Yields:
+        dict: The page responses, in startIndex order.
+    """
+    offsets = iter(range(start_index, total, page_count))
+    logger.debug(
+        f"Fetching {math.ceil(max(total - start_index, 0) / page_count)} pages for '{typeNames}' with {max_workers} workers."
+    )
+
+    def fetch(start_index: int) -> dict:
+        params = _build_wfs_params(
+            typeNames,
+            srsName,
+            start_index,
+            page_count,
+            cql_filter=cql_filter,
+            **other_wfs_params,
+        )
+        return _fetch_page(client, url, headers, params, typeNames)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque(
+            executor.submit(fetch, offset)
+            for offset in itertools.islice(offsets, max_workers * 2)
+        )
+        try:
+            while pending:
+                page_data = pending.popleft().result()
+                next_offset = next(offsets, None)
+                if next_offset is not None:
+                    pending.append(executor.submit(fetch, next_offset))
+                yield page_data
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _iter_wfs_pages(
+    client: httpx.Client,
+    url: str,
+    typeNames: str,
+    api_key: str,
+    srsName: str = DEFAULT_SRSNAME,
+    cql_filter: str = None,
+    count=None,
+    page_count: int = DEFAULT_PAGE_COUNT,
+    max_workers: int = 1,
+    feature_count: int = None,
+    adaptive: bool = False,
+    start_index: int = 0,
+    max_pages: int = None,
+    on_truncation: str = "warn",
+    **other_wfs_params: Any,
+) -> Generator[dict, None, bool]:
+    """
+    Pages through a WFS layer using the supplied client, starting at start_index. See iter_wfs_pages.
+
+    Returns False if paging stopped because max_pages was reached, and True otherwise.
+    """
+
+    headers = {"Authorization": f"key {api_key}"}
+
     logger.debug(f"Starting WFS data download for typeNames: '{typeNames}'")
     if cql_filter:
         logger.debug(f"Using CQL filter: {cql_filter}")
 
-    pages_fetched = 0  # Track number of pages fetched to prevent infinite loops
-    while pages_fetched < MAX_PAGE_FETCHES:
-        logger.debug(f"Pages fetched: {pages_fetched} of max: {MAX_PAGE_FETCHES}")
-        pages_fetched += 1
-        wfs_request_params = {
-            "service": DEFAULT_WFS_SERVICE,
-            "version": DEFAULT_WFS_VERSION,
-            "request": DEFAULT_WFS_REQUEST,
-            "outputFormat": DEFAULT_WFS_OUTPUT_FORMAT,
-            "typeNames": typeNames,
-            "srsName": srsName,
-            "startIndex": start_index,
-            "count": page_count,
-            "cql_filter": cql_filter,
-            **{k: v for k, v in other_wfs_params.items()},
-        }
+    sizer = None
+    if adaptive and max_workers > 1:
+        logger.warning(
+            "Adaptive page sizing only applies to sequential downloads. Using a fixed page size."
+        )
+    elif adaptive:
+        sizer = _AdaptivePageSizer(page_count)
+    plan = _PagePlan(
+        typeNames,
+        srsName,
+        cql_filter=cql_filter,
+        count=count,
+        page_count=page_count,
+        start_index=start_index,
+        max_pages=max_pages,
+        on_truncation=on_truncation,
+        sizer=sizer,
+        **other_wfs_params,
+    )
+    page_count = plan.page_count
+    expected_total = feature_count
 
-        try:
-            page_data = _fetch_single_page_data(url, headers, wfs_request_params)
-        except WfsBadRequestError as e:
-            logger.error(f"### Bad request error: {e}")
-            raise
-        except (
-            RetryError
-        ) as e:  # This occurs if tenacity gives up after all retry attempts
-            # The original exception from the last attempt is available in e.last_attempt.exception()
-            last_exception = e.last_attempt.exception() if e.last_attempt else e
-            logger.error(
-                f"All retries failed for '{typeNames}' at startIndex {start_index}. Last error: {last_exception}"
+    if max_workers > 1 and not plan.done:
+        total = feature_count
+        if total is None:
+            total = get_wfs_hit_count(
+                url,
+                typeNames,
+                api_key,
+                cql_filter=cql_filter,
+                client=client,
+                **other_wfs_params,
             )
-            raise WfsDownloaderError(
-                f"Failed to download WFS data for '{typeNames}' after multiple retries. Last error: {last_exception}"
-            ) from last_exception
-        except (
-            WfsDownloaderError
-        ):  # Raised directly by _fetch_single_page_data for non-retryable issues
-            raise  # Propagate the error
-        except Exception as e:
-            logger.error(
-                f"Unexpected error for '{typeNames}' at startIndex {start_index}: {e}"
+        expected_total = total
+        if total is None:
+            logger.debug(
+                f"Feature count unknown for '{typeNames}', falling back to sequential download."
             )
-            raise WfsDownloaderError(
-                f"Failed to download WFS data for '{typeNames}' due to unexpected error: {e}"
-            ) from e
+        else:
+            if max_pages is not None:
+                total = min(total, start_index + max_pages * page_count)
+            if count is not None:
+                total = min(total, count)
+            last_page_full = False
+            for page_data in _iter_pages_concurrently(
+                client,
+                url,
+                headers,
+                typeNames,
+                srsName,
+                cql_filter,
+                total,
+                page_count,
+                max_workers,
+                start_index=start_index,
+                **other_wfs_params,
+            ):
+                plan.pages_fetched += 1
+                if not page_data or not isinstance(page_data, dict):
+                    last_page_full = False
+                    continue
+                features_on_page = page_data.get("features", [])
+                plan.features_fetched += len(features_on_page)
+                last_page_full = len(features_on_page) >= page_count
+                yield page_data
+            plan.start_index += plan.pages_fetched * page_count
+            # Carry on sequentially only if the layer has grown past the planned pages.
+            if not last_page_full or (
+                count is not None and plan.features_fetched >= count
+            ):
+                plan.done = True
 
-        if not page_data or not isinstance(page_data, dict):
-            logger.warning(
-                f"Received empty or invalid data for '{typeNames}' at startIndex {start_index}. Assuming end of data."
+    while True:
+        wfs_request_params = plan.next_params()
+        if wfs_request_params is None:
+            break
+        page_stats = {}
+        page_start = time.perf_counter()
+        page_data = _fetch_page(
+            client,
+            url,
+            headers,
+            wfs_request_params,
+            typeNames,
+            page_stats=page_stats,
+            sizer=sizer,
+        )
+        if sizer is not None:
+            sizer.observe(
+                time.perf_counter() - page_start,
+                page_stats.get("bytes", 0),
+                page_stats.get("attempts", 1),
             )
-            break  # Stop if no data or unexpected format
+        if plan.add_json_page(wfs_request_params, page_data):
+            yield page_data
 
-        result = page_data if result is None else result
-        features_on_page = page_data.get("features", [])
-        if not features_on_page:
-            logger.debug(
-                f"No more features found for '{typeNames}' at startIndex {start_index}. Download likely complete."
-            )
-            break  # No features on this page, assume end of data
-        all_features.extend(features_on_page)
-        logger.debug(
-            f"Fetched {len(features_on_page)} features for '{typeNames}'. Total fetched so far: {len(all_features)}."
+    plan.finish(expected_total)
+    return not plan.max_pages_reached
+
+
+def _first_feature_id(frame: pd.DataFrame) -> Any:
+    """
+    Returns the feature id of the first row of a page read from a file, or None.
+
+    Parameters:
+        frame (pd.DataFrame): The page, as read by read_wfs_file.
+
+    Returns:
+        The value of the first feature id column found (see FRAME_ID_COLUMNS), or None.
+    """
+    if len(frame) == 0:
+        return None
+    for column in FRAME_ID_COLUMNS:
+        if column in frame.columns:
+            return frame[column].iloc[0]
+    return None
+
+
+def iter_wfs_frames(
+    url: str,
+    typeNames: str,
+    api_key: str,
+    output_format: str = "csv",
+    epsg: int = None,
+    fields: list[dict] = None,
+    srsName: str = DEFAULT_SRSNAME,
+    cql_filter: str = None,
+    count=None,
+    page_count: int = DEFAULT_PAGE_COUNT,
+    client: httpx.Client = None,
+    adaptive: bool = False,
+    feature_count: int = None,
+    max_pages: int = None,
+    on_truncation: str = "warn",
+    **other_wfs_params: Any,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields pages of features from a WFS service as GeoDataFrames, using a file based output format.
+
+    Each page is requested in a compact server output format (e.g. CSV with WKT geometries),
+    streamed to a temporary file and read with pyogrio/GDAL, so the GeoJSON payload never has
+    to be parsed into Python dictionaries. The temporary file is removed once it has been read.
+
+    Parameters:
+        url (str): The base URL of the WFS service (e.g., "https://data.linz.govt.nz/services/wfs").
+        typeNames (str): The typeNames for the desired layer (e.g., "layer-12345").
+        api_key (str): API key.
+        output_format (str, optional): One of WFS_FILE_OUTPUT_FORMATS ('csv' or 'gml'). Defaults to 'csv'.
+        epsg (int, optional): EPSG code to assign to the geometries if the file does not carry a CRS.
+        fields (list, optional): Field definitions used to type the columns, e.g. item.fields.
+        srsName (str, optional): Spatial Reference System name (e.g., "EPSG:2193"). Defaults to "EPSG:2193".
+        cql_filter (str, optional): CQL filter to apply to the WFS request. Defaults to None.
+        count (int, optional): Maximum number of features to fetch.
+        page_count (int, optional): Number of features per page request. Defaults to DEFAULT_PAGE_COUNT.
+        client (httpx.Client, optional): The HTTP client to use, typically the pooled KServer client.
+            If not provided, a temporary client is created for this download.
+        adaptive (bool, optional): Tune the page size as the download progresses, starting from
+            page_count. See iter_wfs_pages. Defaults to False.
+        feature_count (int, optional): The known number of features matching the request, used to detect
+            a truncated download. Only pass this if no filter is applied. Defaults to None.
+        max_pages (int, optional): Stop after this many page requests. Defaults to None (no limit).
+        on_truncation (str, optional): 'warn' (default), 'raise' or 'ignore'. See iter_wfs_pages.
+        **other_wfs_params: Additional WFS parameters.
+
+    Yields:
+        pd.DataFrame: A GeoDataFrame (or DataFrame for tables) for each page, in startIndex order.
+
+    Raises:
+        ValueError: If the output format or on_truncation value is not supported.
+        WfsDownloaderError: If the API key or layer_id is missing, or if data fetching fails after all retries.
+        WfsTruncatedError: If the download was truncated and on_truncation is 'raise'.
+    """
+    output_format = output_format.lower()
+    if output_format not in WFS_FILE_OUTPUT_FORMATS:
+        raise ValueError(
+            f"Unsupported output format '{output_format}'. Expected one of: {list(WFS_FILE_OUTPUT_FORMATS)}"
         )
-        # Stop if this page had fewer features than requested (indicates last page)
-        if len(features_on_page) < page_count:
-            logger.debug(
-                f"Last page fetched for '{typeNames}' (received {len(features_on_page)} features, requested up to {page_count})."
-            )
-            break
-        # Stop if max count is set and reached
-        if count is not None and len(all_features) >= count:
-            logger.debug(
-                f"Reached maximum count of {count} features for '{typeNames}'. Stopping download."
-            )
-            break
+    if not api_key:
+        raise WfsDownloaderError("API key must be provided.")
+    if not typeNames:
+        raise WfsDownloaderError("Typenames (i.e. layer id) must be provided.")
+    _check_on_truncation(on_truncation)
 
-        start_index += page_count
+    wfs_output_format, extension = WFS_FILE_OUTPUT_FORMATS[output_format]
+    headers = {"Authorization": f"key {api_key}"}
+    sizer = _AdaptivePageSizer(page_count) if adaptive else None
+    plan = _PagePlan(
+        typeNames,
+        srsName,
+        cql_filter=cql_filter,
+        count=count,
+        page_count=page_count,
+        max_pages=max_pages,
+        on_truncation=on_truncation,
+        sizer=sizer,
+        **other_wfs_params,
+    )
 
-    result["features"] = all_features
+    owns_client = client is None
+    if owns_client:
+        client = httpx.Client(timeout=DEFAULT_TIMEOUT)
+    try:
+        with tempfile.TemporaryDirectory(prefix="pykaahma_wfs_") as folder:
+            while True:
+                wfs_request_params = plan.next_params()
+                if wfs_request_params is None:
+                    break
+                wfs_request_params["outputFormat"] = wfs_output_format
+                file_path = os.path.join(folder, f"page_{plan.start_index}{extension}")
+                page_stats = {}
+                page_start = time.perf_counter()
+                _fetch_page(
+                    client,
+                    url,
+                    headers,
+                    wfs_request_params,
+                    typeNames,
+                    file_path=file_path,
+                    page_stats=page_stats,
+                    sizer=sizer,
+                )
+                if sizer is not None:
+                    sizer.observe(
+                        time.perf_counter() - page_start,
+                        page_stats.get("bytes", 0),
+                        page_stats.get("attempts", 1),
+                    )
+                frame = read_wfs_file(
+                    file_path, output_format, epsg=epsg, fields=fields
+                )
+                os.remove(file_path)
+                if plan.add_page(
+                    wfs_request_params, len(frame), _first_feature_id(frame)
+                ):
+                    yield frame
+    finally:
+        if owns_client:
+            client.close()
 
-    # LINZ api seems to always return totalFeatures as "unknown" in the response
-    # So here we manually set it to the number of features we have
-    result["totalFeatures"] = len(all_features)
-    # remove numberReturned because it relates to the last page, not the total
-    result.pop("numberReturned", None)
+    plan.finish(feature_count)
+
+
+def download_wfs_gdf(
+    url: str,
+    typeNames: str,
+    api_key: str,
+    output_format: str = "csv",
+    epsg: int = None,
+    fields: list[dict] = None,
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """
+    Downloads features from a WFS service into a single GeoDataFrame using a file based output format.
+
+    Collects the pages yielded by iter_wfs_frames. Column types from fields are applied once to
+    the combined frame. See iter_wfs_frames for the parameters.
+
+    Parameters:
+        url (str): The base URL of the WFS service.
+        typeNames (str): The typeNames for the desired layer (e.g., "layer-12345").
+        api_key (str): API key.
+        output_format (str, optional): One of WFS_FILE_OUTPUT_FORMATS ('csv' or 'gml'). Defaults to 'csv'.
+        epsg (int, optional): EPSG code to assign to the geometries if the file does not carry a CRS.
+        fields (list, optional): Field definitions used to type the columns, e.g. item.fields.
+        **kwargs: Additional arguments for iter_wfs_frames and WFS parameters.
 
+    Returns:
+        pd.DataFrame: A GeoDataFrame (or DataFrame for tables) of all fetched features. If no
+            features were fetched, the frame is empty but has the columns given by fields.
+    """
+    frames = list(
+        iter_wfs_frames(
+            url, typeNames, api_key, output_format=output_format, epsg=epsg, **kwargs
+        )
+    )
+    if not frames:
+        # No page was requested (max_pages=0), so build the columns from the fields
+        result = empty_frame(fields, epsg)
+    elif len(frames) > 1:
+        result = pd.concat(frames, ignore_index=True)
+    else:
+        result = frames[0]
+    if fields:
+        result = apply_field_types(result, fields)
     logger.debug(
-        f"Finished WFS data download for '{typeNames}'. Total features retrieved: {len(all_features)}."
+        f"Finished WFS {output_format} download for '{typeNames}'. Total features retrieved: {len(result)}."
     )
     return result
@@ -0,0 +1,276 @@
+# wfs_async.py
+"""
+Asynchronous WFS downloader, built on httpx.AsyncClient.
+
+Shares the sequential page planning of wfs.py so many layers can be downloaded concurrently from a
+single event loop, e.g. with asyncio.gather, without a thread per layer.
+"""
+
+import httpx
+from typing import Any, AsyncIterator
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    wait_exponential,
+    RetryError,
+    retry_if_not_exception_type,
+)
+import logging
+
+from .json_decoder import json_loads
+from .wfs import (
+    DEFAULT_PAGE_COUNT,
+    DEFAULT_SRSNAME,
+    DEFAULT_TIMEOUT,
+    WfsBadRequestError,
+    WfsDownloaderError,
+    _PagePlan,
+    _assemble_result,
+    _check_on_truncation,
+)
+
+logger = logging.getLogger(__name__)
+
+# Options of the synchronous downloader that the asynchronous downloader does not support.
+# They are rejected rather than sent to the service as WFS parameters.
+SYNC_ONLY_OPTIONS = ("adaptive", "checkpoint_dir", "max_workers", "output_format")
+
+
+def _check_wfs_params(other_wfs_params: dict) -> None:
+    """Raises a TypeError if any of the WFS parameters is an option of the synchronous downloader only."""
+    unsupported = [name for name in SYNC_ONLY_OPTIONS if name in other_wfs_params]
+    if unsupported:
+        raise TypeError(
+            f"The asynchronous WFS downloader does not support: {', '.join(unsupported)}. "
+            "Use the synchronous methods for these options."
+        )
+
+
+@retry(
+    retry=retry_if_not_exception_type((WfsDownloaderError, WfsBadRequestError)),
+    stop=stop_after_attempt(5),  # Retry up to 5 times for failed requests
+    wait=wait_exponential(
+        multiplier=1, min=2, max=10
+    ),  # Exponential backoff: 2s, 4s, 8s, 10s, 10s
+    reraise=True,  # Reraise the last exception if all retries fail
+)
+async def _fetch_single_page_data_async(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict,
+    params: dict,
+    timeout=httpx.USE_CLIENT_DEFAULT,
+) -> dict:
+    """
+    Fetches a single page of WFS data with retry logic for transient issues.
+
+    Parameters:
+        client (httpx.AsyncClient): The HTTP client to send the request with.
+        url (str): The WFS service endpoint URL.
+        headers (dict): HTTP headers for the request (including API key).
+        params (dict): Query parameters for the WFS request.
+        timeout (int, optional): Timeout for the request in seconds. Defaults to the client timeout.
+
+    Returns:
+        dict: The JSON response from the WFS service for the page.
+
+    Raises:
+        WfsBadRequestError: If the service rejects the request.
+        httpx.HTTPError: For other request issues that tenacity will handle.
+    """
+    try:
+        logger.debug(f"Requesting WFS data. URL: {url}, Params: {params}")
+        response = await client.get(
+            url, headers=headers, params=params, timeout=timeout
+        )
+        response.raise_for_status()
+        return json_loads(response.content)
+    except httpx.HTTPStatusError as e:
+        status = e.response.status_code
+        logger.warning(f"HTTP error for URL {url}: {status} - {e.response.text}")
+        if 400 <= status < 500:
+            raise WfsBadRequestError(
+                f"Bad request ({status}) for URL {url}: {e.response.text}"
+            ) from e
+        raise  # Let tenacity retry for other HTTP errors
+    except httpx.HTTPError as e:
+        logger.warning(f"Request failed for URL {url}: {e}")
+        raise  # Reraise for tenacity to handle
+
+
+async def _fetch_page_async(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict,
+    params: dict,
+    typeNames: str,
+) -> dict:
+    """
+    Fetches a single page and maps any failure to a WfsDownloaderError.
+
+    Parameters:
+        client (httpx.AsyncClient): The HTTP client to send the request with.
+        url (str): The WFS service endpoint URL.
+        headers (dict): HTTP headers for the request (including API key).
+        params (dict): Query parameters for the WFS request.
+        typeNames (str): The typeNames of the layer, used in error messages.
+
+    Returns:
+        dict: The JSON response from the WFS service for the page.
+
+    Raises:
+        WfsBadRequestError: If the service rejects the request.
+        WfsDownloaderError: If the page could not be fetched after all retries.
+    """
+    start_index = params.get("startIndex")
+    try:
+        return await _fetch_single_page_data_async(client, url, headers, params)
+    except WfsDownloaderError:
+        raise
+    except RetryError as e:
+        last_exception = e.last_attempt.exception() if e.last_attempt else e
+        logger.error(
+            f"All retries failed for '{typeNames}' at startIndex {start_index}. Last error: {last_exception}"
+        )
+        raise WfsDownloaderError(
+            f"Failed to download WFS data for '{typeNames}' after multiple retries. Last error: {last_exception}"
+        ) from last_exception
+    except Exception as e:
+        logger.error(
+            f"Unexpected error for '{typeNames}' at startIndex {start_index}: {e}"
+        )
+        raise WfsDownloaderError(
+            f"Failed to download WFS data for '{typeNames}' due to unexpected error: {e}"
+        ) from e
+
+
+async def iter_wfs_pages_async(
+    url: str,
+    typeNames: str,
+    api_key: str,
+    srsName: str = DEFAULT_SRSNAME,
+    cql_filter: str = None,
+    count=None,
+    page_count: int = DEFAULT_PAGE_COUNT,
+    client: httpx.AsyncClient = None,
+    feature_count: int = None,
+    max_pages: int = None,
+    on_truncation: str = "warn",
+    **other_wfs_params: Any,
+) -> AsyncIterator[dict]:
+    """
+    Yields pages of features from a WFS service as they arrive, handling pagination and retries.
+
+    The asynchronous counterpart of wfs.iter_wfs_pages. Pages are fetched one after another;
+    run several downloads concurrently (e.g. one per layer) to overlap their network waits.
+
+    Parameters:
+        url (str): The base URL of the WFS service (e.g., "https://data.linz.govt.nz/services/wfs").
+        typeNames (str): The typeNames for the desired layer (e.g., "layer-12345").
+        api_key (str): API key.
+        srsName (str, optional): Spatial Reference System name (e.g., "EPSG:2193"). Defaults to "EPSG:2193".
+        cql_filter (str, optional): CQL filter to apply to the WFS request. Defaults to None.
+        count (int, optional): Maximum number of features to fetch.
+        page_count (int, optional): Number of features per page request. Defaults to DEFAULT_PAGE_COUNT.
+        client (httpx.AsyncClient, optional): The HTTP client to use, typically the pooled KServer
+            async client. If not provided, a temporary client is created for this download.
+        feature_count (int, optional): The known number of features matching the request, used to detect
+            a truncated download. Only pass this if no filter is applied. Defaults to None.
+        max_pages (int, optional): Stop after this many page requests. Defaults to None (no limit).
+        on_truncation (str, optional): 'warn' (default), 'raise' or 'ignore'. See wfs.iter_wfs_pages.
+        **other_wfs_params: Additional WFS parameters.
+
+    Yields:
+        dict: A page of features, in startIndex order.
+
+    Raises:
+        TypeError: If an option of the synchronous downloader only (e.g. adaptive) is passed.
+        WfsDownloaderError: If the API key or layer_id is missing, or if data fetching fails after all retries.
+        WfsTruncatedError: If the download was truncated and on_truncation is 'raise'.
+    """
+    _check_wfs_params(other_wfs_params)
+    if not api_key:
+        raise WfsDownloaderError("API key must be provided.")
+    if not typeNames:
+        raise WfsDownloaderError("Typenames (i.e. layer id) must be provided.")
+    _check_on_truncation(on_truncation)
+
+    headers = {"Authorization": f"key {api_key}"}
+    plan = _PagePlan(
+        typeNames,
+        srsName,
+        cql_filter=cql_filter,
+        count=count,
+        page_count=page_count,
+        max_pages=max_pages,
+        on_truncation=on_truncation,
+        **other_wfs_params,
+    )
+
+    owns_client = client is None
+    if owns_client:
+        client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT)
+    try:
+        while True:
+            wfs_request_params = plan.next_params()
+            if wfs_request_params is None:
+                break
+            page_data = await _fetch_page_async(
+                client, url, headers, wfs_request_params, typeNames
+            )
+            if plan.add_json_page(wfs_request_params, page_data):
+                yield page_data
+    finally:
+        if owns_client:
+            await client.aclose()
+
+    plan.finish(feature_count)
+
+
+async def download_wfs_data_async(
+    url: str,
+    typeNames: str,
+    api_key: str,
+    srsName: str = DEFAULT_SRSNAME,
+    cql_filter: str = None,
+    count=None,
+    page_count: int = DEFAULT_PAGE_COUNT,
+    client: httpx.AsyncClient = None,
+    feature_count: int = None,
+    max_pages: int = None,
+    on_truncation: str = "warn",
+    **other_wfs_params: Any,
+) -> dict:
+    """
+    Downloads features from a WFS service, handling pagination and retries.
+
+    The asynchronous counterpart of wfs.download_wfs_data. See iter_wfs_pages_async for the parameters.
+
+    Returns:
+        dict: A GeoJSON FeatureCollection-like dictionary containing all fetched features.
+
+    Raises:
+        TypeError: If an option of the synchronous downloader only (e.g. adaptive) is passed.
+        WfsDownloaderError: If the API key or layer_id is missing, or if data fetching fails after all retries.
+        WfsTruncatedError: If the download was truncated and on_truncation is 'raise'.
+    """
+    all_features = []
+    result = None
+    async for page_data in iter_wfs_pages_async(
+        url,
+        typeNames,
+        api_key,
+        srsName=srsName,
+        cql_filter=cql_filter,
+        count=count,
+        page_count=page_count,
+        client=client,
+        feature_count=feature_count,
+        max_pages=max_pages,
+        on_truncation=on_truncation,
+        **other_wfs_params,
+    ):
+        result = page_data if result is None else result
+        all_features.extend(page_data.get("features", []))
+
+    return _assemble_result(typeNames, result, all_features)
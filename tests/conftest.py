@@ -0,0 +1,70 @@
+"""
+Shared test data and a mock Koordinates API for tests that run a KServer against an httpx.MockTransport.
+"""
+
+import httpx
+
+API_URL = "https://data.linz.govt.nz/services/api/v1.x/"
+
+layer_details = {
+    "id": 50318,
+    "url": f"{API_URL}layers/50318/",
+    "type": "layer",
+    "kind": "vector",
+    "title": "NZ Railway Stations",
+    "data": {
+        "crs": {"srid": 2193},
+        "fields": [],
+        "feature_count": 3,
+        "primary_key_fields": ["id"],
+    },
+}
+
+
+def make_handler(
+    seen: list | None = None,
+    items: list[dict] = (layer_details,),
+    etag: str | None = None,
+    fallback=None,
+):
+    """
+    Returns a MockTransport handler serving items from a mock Koordinates API.
+
+    Answers the item lookup by id (data/?id=...), the item details at the item's URL and the
+    item's services, which always include changesets.
+
+    Parameters:
+        seen (list, optional): If provided, every request is appended to it.
+        items (list[dict], optional): The item details to serve. Defaults to layer_details.
+        etag (str, optional): An ETag sent with the item details. A request with a matching
+            If-None-Match header gets a 304 response.
+        fallback (callable, optional): Handles any other request, e.g. WFS or export requests.
+            Defaults to a 404 response.
+
+    Returns:
+        callable: The handler, for httpx.MockTransport.
+    """
+    by_id = {str(item["id"]): item for item in items}
+    by_url = {item["url"]: item for item in items}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if seen is not None:
+            seen.append(request)
+        path = request.url.path
+        if path.endswith("/data/"):
+            item = by_id.get(request.url.params.get("id"))
+            entries = [{"id": item["id"], "url": item["url"]}] if item else []
+            return httpx.Response(200, json=entries)
+        if path.endswith("/services/"):
+            return httpx.Response(200, json=[{"key": "wfs-changesets"}])
+        item = by_url.get(str(request.url))
+        if item is not None:
+            if etag is not None and request.headers.get("If-None-Match") == etag:
+                return httpx.Response(304)
+            headers = {"ETag": etag} if etag is not None else {}
+            return httpx.Response(200, json=item, headers=headers)
+        if fallback is not None:
+            return fallback(request)
+        return httpx.Response(404)
+
+    return handler
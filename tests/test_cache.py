@@ -0,0 +1,126 @@
+import httpx
+import pytest
+
+from pykaahma_linz.Cache import CacheEntry, MemoryCache, MetadataCache, SQLiteCache
+from pykaahma_linz.KServer import KServer
+from pykaahma_linz.KVectorItem import KVectorItem
+
+from conftest import make_handler
+
+ETAG = '"abc123"'
+
+
+def test_cached_item_is_returned_without_requests():
+    seen = []
+    with KServer(
+        "test-key",
+        transport=httpx.MockTransport(make_handler(seen, etag=ETAG)),
+        cache=MemoryCache(),
+    ) as kserver:
+        first = kserver.content.get("50318")
+        second = kserver.content.get("50318")
+
+    assert len(seen) == 2
+    assert isinstance(second, KVectorItem)
+    assert second.title == first.title
+    assert second._raw_json is not first._raw_json
+
+
+def test_stale_item_is_revalidated_with_etag():
+    seen = []
+    with KServer(
+        "test-key",
+        transport=httpx.MockTransport(make_handler(seen, etag=ETAG)),
+        cache=MemoryCache(ttl=0),
+    ) as kserver:
+        kserver.content.get("50318")
+        itm = kserver.content.get("50318")
+
+    assert [r.url.path.rsplit("/", 2)[-2] for r in seen] == [
+        "data",
+        "50318",
+        "50318",
+    ]
+    assert seen[-1].headers["If-None-Match"] == ETAG
+    assert itm.title == "NZ Railway Stations"
+
+
+def test_no_cache_by_default():
+    seen = []
+    with KServer(
+        "test-key", transport=httpx.MockTransport(make_handler(seen, etag=ETAG))
+    ) as kserver:
+        kserver.content.get("50318")
+        kserver.content.get("50318")
+
+    assert len(seen) == 4
+    assert not any("If-None-Match" in r.headers for r in seen)
+
+
+def test_sqlite_cache_is_shared_between_servers(tmp_path):
+    seen = []
+    path = str(tmp_path / "metadata.db")
+    for _ in range(2):
+        cache = SQLiteCache(path)
+        with KServer(
+            "test-key",
+            transport=httpx.MockTransport(make_handler(seen, etag=ETAG)),
+            cache=cache,
+        ) as kserver:
+            itm = kserver.content.get("50318")
+        cache.close()
+
+    assert len(seen) == 2
+    assert itm.title == "NZ Railway Stations"
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.set(key, CacheEntry({"key": key}, f"https://example.com/{key}"))
+    cache.get("a")
+    cache.set("c", CacheEntry({"key": "c"}, "https://example.com/c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").value == {"key": "a"}
+    assert len(cache) == 2
+
+
+def test_services_are_shared_between_item_instances():
+    seen = []
+    with KServer(
+        "test-key", transport=httpx.MockTransport(make_handler(seen, etag=ETAG))
+    ) as kserver:
+        first = kserver.content.get("50318")
+        assert first.supports_changesets
+        first.reset()
+        assert first.supports_changesets
+        second = kserver.content.get("50318")
+        assert second.supports_changesets
+
+    assert sum(r.url.path.endswith("/services/") for r in seen) == 1
+
+
+def test_services_are_shared_between_processes_via_sqlite(tmp_path):
+    seen = []
+    path = str(tmp_path / "metadata.db")
+    for _ in range(2):
+        cache = SQLiteCache(path)
+        with KServer(
+            "test-key",
+            transport=httpx.MockTransport(make_handler(seen, etag=ETAG)),
+            cache=cache,
+        ) as kserver:
+            assert kserver.get_services("layer", "50318") == [{"key": "wfs-changesets"}]
+        cache.close()
+
+    assert len(seen) == 1
+
+
+def test_metadata_cache_subclasses_must_implement_the_interface():
+    class IncompleteCache(MetadataCache):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        IncompleteCache()
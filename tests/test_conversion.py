@@ -0,0 +1,144 @@
+import random
+
+import pytest
+import shapely
+from shapely.geometry import shape
+
+import pandas as pd
+
+from pykaahma_linz.features.Conversion import (
+    apply_field_types,
+    geojson_geometries_to_shapely,
+    geojson_to_gdf,
+    json_to_df,
+)
+
+
+def ring(x: float, y: float, size: float = 1.0) -> list:
+    return [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+
+
+SAMPLE_GEOMETRIES = {
+    "Point": lambda i: {"type": "Point", "coordinates": [i, -i]},
+    "LineString": lambda i: {
+        "type": "LineString",
+        "coordinates": [[i, 0], [i + 1, 1], [i + 2, 0]][: 2 + i % 2],
+    },
+    "MultiPoint": lambda i: {"type": "MultiPoint", "coordinates": [[i, 0], [0, i]]},
+    "Polygon": lambda i: {
+        "type": "Polygon",
+        "coordinates": [ring(i, i, 10), ring(i + 1, i + 1)][: 1 + i % 2],
+    },
+    "MultiLineString": lambda i: {
+        "type": "MultiLineString",
+        "coordinates": [[[i, 0], [i, 1]], [[0, i], [1, i], [2, i]]],
+    },
+    "MultiPolygon": lambda i: {
+        "type": "MultiPolygon",
+        "coordinates": [[ring(i, i)], [ring(i + 5, i + 5, 2), ring(i + 5.5, i + 5.5)]][
+            : 1 + i % 2
+        ],
+    },
+}
+
+
+def reference_geometries(geometries: list) -> list:
+    return [shape(geom) if geom else None for geom in geometries]
+
+
+def assert_same_geometries(actual, expected):
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        if e is None:
+            assert a is None
+        else:
+            assert shapely.equals_exact(a, e, tolerance=0)
+
+
+@pytest.mark.parametrize("geometry_type", list(SAMPLE_GEOMETRIES))
+def test_bulk_geometry_conversion_matches_shape(geometry_type):
+    geometries = [SAMPLE_GEOMETRIES[geometry_type](i) for i in range(20)]
+    geometries[3] = None
+    assert_same_geometries(
+        geojson_geometries_to_shapely(geometries), reference_geometries(geometries)
+    )
+
+
+def test_mixed_geometries_fall_back_to_shape():
+    geometries = [
+        SAMPLE_GEOMETRIES["Point"](1),
+        {"type": "Point", "coordinates": [1, 2, 3]},
+        SAMPLE_GEOMETRIES["Polygon"](2),
+        {"type": "GeometryCollection", "geometries": [SAMPLE_GEOMETRIES["Point"](4)]},
+    ]
+    assert_same_geometries(
+        geojson_geometries_to_shapely(geometries), reference_geometries(geometries)
+    )
+
+
+def test_geojson_to_gdf():
+    random.seed(1)
+    features = [
+        {
+            "type": "Feature",
+            "geometry": SAMPLE_GEOMETRIES["MultiPolygon"](i),
+            "properties": {"id": i, "name": random.choice(["a", "b"])},
+        }
+        for i in range(50)
+    ]
+    gdf = geojson_to_gdf({"type": "FeatureCollection", "features": features}, epsg=2193)
+    assert list(gdf.columns) == ["id", "name", "geometry"]
+    assert gdf.crs.to_epsg() == 2193
+    assert_same_geometries(
+        list(gdf.geometry), reference_geometries([f["geometry"] for f in features])
+    )
+
+
+def test_geojson_to_gdf_empty():
+    gdf = geojson_to_gdf({"type": "FeatureCollection", "features": []}, epsg=2193)
+    assert len(gdf) == 0
+
+
+def test_apply_field_types():
+    records = [
+        {
+            "id": i,
+            "big_id": 2**40 + i if i else None,
+            "area": i * 1.5,
+            "ratio": str(i / 3),
+            "suburb": ["Central", "North", None][i % 3],
+            "name": f"name {i}",
+            "active": [True, False, None][i % 3],
+            "updated": f"2024-01-{i + 1:02d}T10:00:00Z",
+        }
+        for i in range(10)
+    ]
+    fields = [
+        {"name": "shape", "type": "geometry"},
+        {"name": "id", "type": "integer"},
+        {"name": "big_id", "type": "integer"},
+        {"name": "area", "type": "float"},
+        {"name": "ratio", "type": "double"},
+        {"name": "suburb", "type": "string"},
+        {"name": "name", "type": "string"},
+        {"name": "active", "type": "boolean"},
+        {"name": "updated", "type": "datetime"},
+        {"name": "missing", "type": "integer"},
+    ]
+    df = json_to_df([{"properties": r} for r in records], fields=fields)
+    assert str(df["id"].dtype) == "Int32"
+    assert str(df["big_id"].dtype) == "Int64"
+    assert df["big_id"].isna().sum() == 1
+    assert str(df["area"].dtype) == "float32"
+    assert str(df["ratio"].dtype) == "float64"
+    assert isinstance(df["suburb"].dtype, pd.CategoricalDtype)
+    assert not isinstance(df["name"].dtype, pd.CategoricalDtype)
+    assert str(df["active"].dtype) == "boolean"
+    assert pd.api.types.is_datetime64_any_dtype(df["updated"])
+    assert "missing" not in df.columns
+
+
+def test_apply_field_types_leaves_unconvertible_columns():
+    df = pd.DataFrame({"id": [1.5, 2.0]})
+    result = apply_field_types(df, [{"name": "id", "type": "integer"}])
+    assert result["id"].tolist() == [1.5, 2.0]
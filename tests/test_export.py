@@ -0,0 +1,170 @@
+import json
+
+import httpx
+import pytest
+
+from pykaahma_linz import KServer as kserver_module
+from pykaahma_linz.KServer import KServer
+from pykaahma_linz.features.export import build_export_payload
+
+from conftest import API_URL, make_handler
+
+GPKG = {"name": "GeoPackage / SQLite", "mimetype": "application/x-ogc-gpkg"}
+CSV = {"name": "CSV", "mimetype": "text/csv"}
+
+ITEMS = {
+    "50772": {
+        "id": 50772,
+        "url": f"{API_URL}layers/50772/",
+        "type": "layer",
+        "kind": "vector",
+        "data": {"crs": {"srid": 2193}, "export_formats": [GPKG, CSV]},
+    },
+    "50318": {
+        "id": 50318,
+        "url": f"{API_URL}layers/50318/",
+        "type": "layer",
+        "kind": "vector",
+        "data": {"crs": {"srid": 2193}, "export_formats": [GPKG, CSV]},
+    },
+    "51000": {
+        "id": 51000,
+        "url": f"{API_URL}tables/51000/",
+        "type": "table",
+        "kind": "table",
+        "data": {"export_formats": [CSV]},
+    },
+}
+
+
+def make_export_handler(posted: list):
+    def export_handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/exports/validate/"):
+            payload = json.loads(request.content)
+            posted.append(("validate", payload))
+            return httpx.Response(
+                200, json={"items": [{"is_valid": True} for _ in payload["items"]]}
+            )
+        if path.endswith("/exports/"):
+            posted.append(("export", json.loads(request.content)))
+            return httpx.Response(
+                201,
+                json={"id": 99, "url": f"{API_URL}exports/99/", "state": "processing"},
+            )
+        return httpx.Response(404)
+
+    return make_handler(items=list(ITEMS.values()), fallback=export_handler)
+
+
+def test_content_manager_exports_items_in_one_job():
+    posted = []
+    with KServer(
+        "test-key", transport=httpx.MockTransport(make_export_handler(posted))
+    ) as kserver:
+        layer = kserver.content.get("50772")
+        job = kserver.content.export(
+            [layer, "50318", "51000"],
+            {"vector": "geopackage", "table": "csv"},
+            crs="EPSG:2193",
+        )
+
+    assert job.id == 99
+    assert [kind for kind, _ in posted] == ["validate", "export"]
+    payload = posted[1][1]
+    assert payload["items"] == [
+        {"item": f"{API_URL}layers/50772/"},
+        {"item": f"{API_URL}layers/50318/"},
+        {"item": f"{API_URL}tables/51000/"},
+    ]
+    assert payload["formats"] == {
+        "vector": "application/x-ogc-gpkg",
+        "table": "text/csv",
+    }
+    assert payload["crs"] == "EPSG:2193"
+    assert layer._jobs == [job]
+
+
+def test_export_payload_rejects_conflicting_formats_per_kind():
+    with pytest.raises(ValueError):
+        build_export_payload(
+            API_URL,
+            [
+                ("1", "layer", "vector", "text/csv"),
+                ("2", "layer", "vector", "application/x-ogc-gpkg"),
+            ],
+        )
+    with pytest.raises(ValueError):
+        build_export_payload(API_URL, [])
+
+
+def test_table_only_export_omits_crs():
+    payload = build_export_payload(
+        API_URL, [("51000", "table", "table", "text/csv")], crs="EPSG:2193"
+    )
+    assert "crs" not in payload
+
+
+def test_repeated_export_reuses_cached_validation():
+    posted = []
+    with KServer(
+        "test-key", transport=httpx.MockTransport(make_export_handler(posted))
+    ) as kserver:
+        layer = kserver.content.get("50772")
+        layer.export("geopackage", crs="EPSG:2193")
+        layer.export("application/x-ogc-gpkg", crs="EPSG:2193")
+        layer.export("geopackage", crs="EPSG:4326")
+
+    assert [kind for kind, _ in posted] == [
+        "validate",
+        "export",
+        "export",
+        "validate",
+        "export",
+    ]
+
+
+def test_export_validation_cache_expires_and_resets():
+    posted = []
+    with KServer(
+        "test-key",
+        transport=httpx.MockTransport(make_export_handler(posted)),
+        validation_cache_ttl=0,
+    ) as kserver:
+        table = kserver.content.get("51000")
+        table.export("csv")
+        table.export("csv")
+        assert [kind for kind, _ in posted].count("validate") == 2
+
+        kserver._validation_cache_ttl = 3600
+        table.export("csv")
+        kserver.reset()
+        table.export("csv")
+        assert [kind for kind, _ in posted].count("validate") == 4
+
+
+def test_export_validation_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(kserver_module, "DEFAULT_VALIDATION_CACHE_SIZE", 2)
+    posted = []
+    with KServer(
+        "test-key", transport=httpx.MockTransport(make_export_handler(posted))
+    ) as kserver:
+        layer = kserver.content.get("50772")
+        for crs in ("EPSG:2193", "EPSG:4326", "EPSG:3857", "EPSG:2193"):
+            layer.export("geopackage", crs=crs)
+        assert len(kserver._validated_exports) == 2
+
+    # The oldest validation was evicted, so it is checked with the server again
+    assert [kind for kind, _ in posted].count("validate") == 4
+
+
+def test_export_without_validation():
+    posted = []
+    with KServer(
+        "test-key", transport=httpx.MockTransport(make_export_handler(posted))
+    ) as kserver:
+        layer = kserver.content.get("50772")
+        layer.export("geopackage", validate=False)
+        kserver.content.export(["50318", "51000"], "csv", validate=False)
+
+    assert [kind for kind, _ in posted] == ["export", "export"]
@@ -0,0 +1,333 @@
+import asyncio
+import hashlib
+import httpx
+import pytest
+from tenacity import wait_none
+
+from pykaahma_linz.KServer import KServer
+from pykaahma_linz import JobResult as job_result
+from pykaahma_linz.CustomErrors import KServerError
+from pykaahma_linz.JobResult import JobResult, download_all_async
+
+from conftest import API_URL
+
+FILE_CONTENT = b"PK" + bytes(range(256)) * 400
+ETAG = '"file-v1"'
+
+
+def job_payload(job_id: int) -> dict:
+    return {
+        "id": job_id,
+        "url": f"{API_URL}exports/{job_id}/",
+        "name": f"export-{job_id}",
+        "state": "complete",
+        "download_url": f"{API_URL}exports/{job_id}/download/",
+    }
+
+
+def make_export_handler(seen: list | None = None, ranges: bool = False):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if seen is not None:
+            seen.append(request)
+        path = request.url.path
+        if request.url.host == "s3.example.com":
+            if request.headers.get("Authorization"):
+                return httpx.Response(400)
+            byte_range = request.headers.get("Range")
+            if request.headers.get("If-Range", ETAG) != ETAG:
+                byte_range = None  # the file has changed, so send all of it
+            if ranges and byte_range:
+                start, end = byte_range.removeprefix("bytes=").split("-")
+                start, end = int(start), int(end or len(FILE_CONTENT) - 1)
+                return httpx.Response(
+                    206,
+                    content=FILE_CONTENT[start : end + 1],
+                    headers={
+                        "Content-Range": f"bytes {start}-{end}/{len(FILE_CONTENT)}",
+                        "ETag": ETAG,
+                    },
+                )
+            return httpx.Response(200, content=FILE_CONTENT, headers={"ETag": ETAG})
+        if path.endswith("/download/"):
+            job_id = path.rstrip("/").split("/")[-2]
+            return httpx.Response(
+                302, headers={"Location": f"https://s3.example.com/{job_id}.zip"}
+            )
+        if "/exports/" in path:
+            return httpx.Response(
+                200, json=job_payload(int(path.rstrip("/").split("/")[-1]))
+            )
+        return httpx.Response(404)
+
+    return handler
+
+
+def test_download_async_streams_file(tmp_path):
+    async def run():
+        async with KServer(
+            "test-key", transport=httpx.MockTransport(make_export_handler())
+        ) as kserver:
+            job = JobResult(job_payload(1), kserver, poll_interval=0)
+            return await job.download_async(str(tmp_path))
+
+    result = asyncio.run(run())
+    assert result.filename == "export-1.zip"
+    assert result.final_url == "https://s3.example.com/1.zip"
+    assert result.file_size_bytes == len(FILE_CONTENT)
+    assert result.checksum == hashlib.sha256(FILE_CONTENT).hexdigest()
+    assert (tmp_path / "export-1.zip").read_bytes() == FILE_CONTENT
+
+
+def test_download_all_async_keeps_job_order(tmp_path):
+    async def run():
+        async with KServer(
+            "test-key", transport=httpx.MockTransport(make_export_handler())
+        ) as kserver:
+            jobs = [
+                JobResult(job_payload(i), kserver, poll_interval=0) for i in range(5)
+            ]
+            return await download_all_async(jobs, str(tmp_path), max_concurrency=2)
+
+    results = asyncio.run(run())
+    assert [r.job_id for r in results] == list(range(5))
+    assert all(r.file_size_bytes == len(FILE_CONTENT) for r in results)
+
+    with pytest.raises(ValueError):
+        asyncio.run(download_all_async([], str(tmp_path), max_concurrency=0))
+
+
+def test_download_computes_requested_digests_while_streaming(tmp_path):
+    with KServer(
+        "test-key", transport=httpx.MockTransport(make_export_handler())
+    ) as kserver:
+        job = JobResult(job_payload(1), kserver, poll_interval=0)
+        result = job.download(str(tmp_path), digests=["md5", "SHA1"])
+
+    assert (tmp_path / "export-1.zip").read_bytes() == FILE_CONTENT
+    assert result.checksum == hashlib.sha256(FILE_CONTENT).hexdigest()
+    assert result.checksums == {
+        "sha256": hashlib.sha256(FILE_CONTENT).hexdigest(),
+        "md5": hashlib.md5(FILE_CONTENT).hexdigest(),
+        "sha1": hashlib.sha1(FILE_CONTENT).hexdigest(),
+    }
+    assert job.download_checksums == result.checksums
+
+    with pytest.raises(ValueError):
+        job.download(str(tmp_path), digests=["not-a-digest"])
+
+
+def test_download_transfers_file_once(tmp_path):
+    seen = []
+    with KServer(
+        "test-key", transport=httpx.MockTransport(make_export_handler(seen))
+    ) as kserver:
+        job = JobResult(job_payload(1), kserver, poll_interval=0)
+        result = job.download(str(tmp_path))
+
+    assert result.final_url == "https://s3.example.com/1.zip"
+    assert [str(r.url) for r in seen if r.url.host == "s3.example.com"] == [
+        "https://s3.example.com/1.zip"
+    ]
+    assert len([r for r in seen if r.url.path.endswith("/download/")]) == 1
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_multipart_download(tmp_path, monkeypatch, ranges):
+    monkeypatch.setattr(job_result, "MULTIPART_MIN_PART_SIZE", 10000)
+    seen = []
+    with KServer(
+        "test-key",
+        transport=httpx.MockTransport(make_export_handler(seen, ranges=ranges)),
+    ) as kserver:
+        job = JobResult(job_payload(1), kserver, poll_interval=0)
+        result = job.download(str(tmp_path), parts=4)
+
+    assert (tmp_path / "export-1.zip").read_bytes() == FILE_CONTENT
+    assert result.checksum == hashlib.sha256(FILE_CONTENT).hexdigest()
+    s3_ranges = [r.headers.get("Range") for r in seen if r.url.host == "s3.example.com"]
+    if ranges:
+        assert s3_ranges[0] == "bytes=0-0"
+        assert len(s3_ranges) == 5
+    else:
+        # The probe's full response is used as the download
+        assert s3_ranges == ["bytes=0-0"]
+
+
+def test_split_ranges_covers_file():
+    assert job_result._split_ranges(100, 3, 10) == [(0, 33), (34, 67), (68, 99)]
+    assert job_result._split_ranges(100, 8, 40) == [(0, 49), (50, 99)]
+    assert job_result._split_ranges(5, 4, 10) == [(0, 4)]
+
+
+def test_interrupted_download_resumes_from_part_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_result, "DOWNLOAD_RETRY_WAIT", wait_none())
+    handler = make_export_handler(ranges=True)
+    seen = []
+    cut = len(FILE_CONTENT) // 3
+
+    def flaky_handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "s3.example.com":
+            seen.append(request.headers.get("Range"))
+            if len(seen) == 1:
+                # The connection drops after a third of the file
+                return httpx.Response(
+                    200,
+                    content=FILE_CONTENT[:cut],
+                    headers={"Content-Length": str(len(FILE_CONTENT)), "ETag": ETAG},
+                )
+        return handler(request)
+
+    with KServer("test-key", transport=httpx.MockTransport(flaky_handler)) as kserver:
+        job = JobResult(job_payload(1), kserver, poll_interval=0)
+        result = job.download(str(tmp_path), digests=["md5"])
+
+    assert seen == [None, f"bytes={cut}-"]
+    assert not (tmp_path / "export-1.zip.part.json").exists()
+    assert (tmp_path / "export-1.zip").read_bytes() == FILE_CONTENT
+    assert not (tmp_path / "export-1.zip.part").exists()
+    assert result.checksums["sha256"] == hashlib.sha256(FILE_CONTENT).hexdigest()
+    assert result.checksums["md5"] == hashlib.md5(FILE_CONTENT).hexdigest()
+
+
+def test_incomplete_download_is_not_renamed_into_place(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_result, "DOWNLOAD_RETRY_WAIT", wait_none())
+
+    def truncating_handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "s3.example.com":
+            return httpx.Response(
+                200,
+                content=FILE_CONTENT[:100],
+                headers={"Content-Length": str(len(FILE_CONTENT)), "ETag": ETAG},
+            )
+        return make_export_handler()(request)
+
+    with KServer(
+        "test-key", transport=httpx.MockTransport(truncating_handler)
+    ) as kserver:
+        job = JobResult(job_payload(1), kserver, poll_interval=0)
+        with pytest.raises(KServerError):
+            job.download(str(tmp_path), retries=1)
+
+        assert not (tmp_path / "export-1.zip").exists()
+        assert (tmp_path / "export-1.zip.part").read_bytes() == FILE_CONTENT[:100]
+
+    # A later call resumes from the partial file
+    with KServer(
+        "test-key", transport=httpx.MockTransport(make_export_handler(ranges=True))
+    ) as kserver:
+        job = JobResult(job_payload(1), kserver, poll_interval=0)
+        job.download(str(tmp_path))
+    assert (tmp_path / "export-1.zip").read_bytes() == FILE_CONTENT
+
+
+def test_stale_part_file_from_another_download_is_discarded(tmp_path):
+    # Left behind by an earlier export that used the same job name
+    stale = b"XX" * 1000
+    (tmp_path / "export-1.zip.part").write_bytes(stale)
+    seen = []
+    with KServer(
+        "test-key",
+        transport=httpx.MockTransport(make_export_handler(seen, ranges=True)),
+    ) as kserver:
+        job = JobResult(job_payload(1), kserver, poll_interval=0)
+        result = job.download(str(tmp_path))
+
+    assert [r.headers.get("Range") for r in seen if r.url.host == "s3.example.com"] == [
+        None
+    ]
+    assert (tmp_path / "export-1.zip").read_bytes() == FILE_CONTENT
+    assert result.checksum == hashlib.sha256(FILE_CONTENT).hexdigest()
+
+
+def test_changed_file_is_downloaded_again_with_if_range(tmp_path):
+    cut = 1000
+    (tmp_path / "export-1.zip.part").write_bytes(b"YY" * (cut // 2))
+    job_result._write_part_state(
+        str(tmp_path / "export-1.zip.part"),
+        {
+            "download_url": job_payload(1)["download_url"],
+            "job_id": 1,
+            "etag": '"file-v0"',
+            "last_modified": None,
+        },
+    )
+    seen = []
+    with KServer(
+        "test-key",
+        transport=httpx.MockTransport(make_export_handler(seen, ranges=True)),
+    ) as kserver:
+        job = JobResult(job_payload(1), kserver, poll_interval=0)
+        result = job.download(str(tmp_path))
+
+    s3_request = [r for r in seen if r.url.host == "s3.example.com"][0]
+    assert s3_request.headers["Range"] == f"bytes={cut}-"
+    assert s3_request.headers["If-Range"] == '"file-v0"'
+    assert (tmp_path / "export-1.zip").read_bytes() == FILE_CONTENT
+    assert result.checksum == hashlib.sha256(FILE_CONTENT).hexdigest()
+
+
+def test_multipart_download_retries_a_failed_range(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_result, "MULTIPART_MIN_PART_SIZE", 10000)
+    monkeypatch.setattr(job_result, "DOWNLOAD_RETRY_WAIT", wait_none())
+    handler = make_export_handler(ranges=True)
+    failed = []
+
+    def flaky_handler(request: httpx.Request) -> httpx.Response:
+        byte_range = request.headers.get("Range", "")
+        if request.url.host == "s3.example.com" and not byte_range.startswith(
+            "bytes=0-"
+        ):
+            if byte_range not in failed:
+                # The first request for each range drops part way through
+                failed.append(byte_range)
+                response = handler(request)
+                return httpx.Response(
+                    206, content=response.content[:10], headers=response.headers
+                )
+        return handler(request)
+
+    seen = []
+
+    def recording_handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("Range"))
+        return flaky_handler(request)
+
+    with KServer(
+        "test-key", transport=httpx.MockTransport(recording_handler)
+    ) as kserver:
+        job = JobResult(job_payload(1), kserver, poll_interval=0)
+        result = job.download(str(tmp_path), parts=4, retries=1)
+
+    assert (tmp_path / "export-1.zip").read_bytes() == FILE_CONTENT
+    assert result.checksum == hashlib.sha256(FILE_CONTENT).hexdigest()
+    assert len(failed) == 3
+    # Only the failed ranges were fetched again; the first range was not
+    assert seen.count("bytes=0-25600") == 1
+
+
+@pytest.mark.parametrize("probe_status", [206, 416])
+def test_multipart_download_of_empty_file(tmp_path, probe_status):
+    handler = make_export_handler(ranges=True)
+
+    def empty_file_handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host != "s3.example.com":
+            return handler(request)
+        if request.headers.get("Range"):
+            return httpx.Response(
+                probe_status, headers={"Content-Range": "bytes */0", "ETag": ETAG}
+            )
+        return httpx.Response(200, content=b"", headers={"ETag": ETAG})
+
+    with KServer(
+        "test-key", transport=httpx.MockTransport(empty_file_handler)
+    ) as kserver:
+        job = JobResult(job_payload(1), kserver, poll_interval=0)
+        result = job.download(str(tmp_path), parts=4)
+
+    assert (tmp_path / "export-1.zip").read_bytes() == b""
+    assert result.checksum == hashlib.sha256(b"").hexdigest()
+
+
+def test_split_ranges_of_empty_file():
+    assert job_result._split_ranges(0, 4) == []
+    assert job_result._split_ranges(10, 4, min_part_size=8) == [(0, 9)]
@@ -0,0 +1,167 @@
+import json
+
+import httpx
+import pandas as pd
+import pytest
+
+from pykaahma_linz.CustomErrors import KServerError
+from pykaahma_linz.KServer import KServer
+from pykaahma_linz.LayerMirror import LayerMirror
+
+from conftest import layer_details, make_handler
+
+
+def feature(id, name, change=None):
+    properties = {"id": id, "name": name}
+    if change:
+        properties["__change__"] = change
+    return {
+        "type": "Feature",
+        "id": f"layer-50318.{id}",
+        "geometry": {"type": "Point", "coordinates": [1000000 + id, 5000000 + id]},
+        "properties": properties,
+    }
+
+
+LAYER = [feature(1, "Wellington"), feature(2, "Petone"), feature(3, "Lower Hutt")]
+CHANGESET = [
+    feature(1, "Wellington Central", "UPDATE"),
+    feature(2, "Petone", "DELETE"),
+    feature(9, "Upper Hutt", "INSERT"),
+]
+
+
+def make_mirror_handler(
+    seen: list,
+    details: dict = layer_details,
+    layer: list = LAYER,
+    changeset: list = CHANGESET,
+):
+    def wfs_handler(request: httpx.Request) -> httpx.Response:
+        if not request.url.path.endswith("/wfs/"):
+            return httpx.Response(404)
+        seen.append(request)
+        start = int(request.url.params["startIndex"])
+        if request.url.params["typeNames"].endswith("-changeset"):
+            features = changeset
+        else:
+            features = layer
+        return httpx.Response(
+            200, json={"type": "FeatureCollection", "features": features[start:]}
+        )
+
+    return make_handler(items=[details], fallback=wfs_handler)
+
+
+def test_mirror_applies_changeset_after_full_download(tmp_path):
+    seen = []
+    path = str(tmp_path / "stations.gpkg")
+    with KServer(
+        "test-key", transport=httpx.MockTransport(make_mirror_handler(seen))
+    ) as kserver:
+        mirror = LayerMirror(kserver.content.get("50318"), path)
+        assert mirror.last_synced is None
+
+        first = mirror.sync()
+        assert first.full and first.feature_count == 3
+        synced_at = mirror.last_synced
+        assert synced_at == first.synced_at
+
+        second = mirror.sync()
+
+    assert not second.full
+    assert (second.inserted, second.updated, second.deleted) == (1, 1, 1)
+    changeset_request = seen[-1]
+    assert changeset_request.url.params["typeNames"] == "layer-50318-changeset"
+    assert changeset_request.url.params["viewparams"].startswith(f"from:{synced_at};")
+
+    local = mirror.read().sort_values("id")
+    assert local["id"].tolist() == [1, 3, 9]
+    assert local["name"].tolist() == ["Wellington Central", "Lower Hutt", "Upper Hutt"]
+    assert "__change__" not in local.columns
+    with open(mirror.state_path) as f:
+        assert json.load(f)["synced_at"] == second.synced_at
+
+
+def test_mirror_resyncs_fully_when_filter_changes(tmp_path):
+    seen = []
+    path = str(tmp_path / "stations.gpkg")
+    with KServer(
+        "test-key", transport=httpx.MockTransport(make_mirror_handler(seen))
+    ) as kserver:
+        itm = kserver.content.get("50318")
+        LayerMirror(itm, path).sync()
+        result = LayerMirror(itm, path, cql_filter="id > 1").sync()
+
+    assert result.full
+    assert all(not r.url.params["typeNames"].endswith("-changeset") for r in seen)
+
+
+def test_mirror_requires_primary_key_for_incremental_sync(tmp_path):
+    details = {
+        **layer_details,
+        "data": {**layer_details["data"], "primary_key_fields": []},
+    }
+    path = str(tmp_path / "stations.gpkg")
+    with KServer(
+        "test-key", transport=httpx.MockTransport(make_mirror_handler([], details))
+    ) as kserver:
+        mirror = LayerMirror(kserver.content.get("50318"), path)
+        mirror.sync()
+        with pytest.raises(KServerError):
+            mirror.sync()
+
+
+def test_mirror_keeps_field_types_through_incremental_sync(tmp_path):
+    fields = [
+        {"name": "shape", "type": "geometry"},
+        {"name": "id", "type": "integer"},
+        {"name": "name", "type": "string"},
+        {"name": "platforms", "type": "integer"},
+        {"name": "status", "type": "string"},
+        {"name": "opened", "type": "date"},
+    ]
+    details = {**layer_details, "data": {**layer_details["data"], "fields": fields}}
+
+    def typed_feature(id, name, platforms, status, opened, change=None):
+        f = feature(id, name, change)
+        f["properties"].update(platforms=platforms, status=status, opened=opened)
+        return f
+
+    layer = [
+        typed_feature(1, "Wellington", 9, "open", "1937-06-19"),
+        typed_feature(2, "Petone", None, "open", None),
+        typed_feature(3, "Lower Hutt", 2, "open", "1954-01-01"),
+        typed_feature(4, "Melling", 1, "open", None),
+        typed_feature(5, "Waterloo", 3, "open", "1927-04-26"),
+    ]
+    changeset = [
+        typed_feature(1, "Wellington", None, "closed", "1937-06-19", "UPDATE"),
+        typed_feature(2, "Petone", None, "open", None, "DELETE"),
+        typed_feature(9, "Upper Hutt", 3, None, None, "INSERT"),
+    ]
+    path = str(tmp_path / "stations.gpkg")
+    handler = make_mirror_handler([], details, layer=layer, changeset=changeset)
+    with KServer("test-key", transport=httpx.MockTransport(handler)) as kserver:
+        itm = kserver.content.get("50318")
+        mirror = LayerMirror(itm, path)
+        mirror.sync()
+        result = mirror.sync()
+        expected = itm.query()
+
+    assert (result.inserted, result.updated, result.deleted) == (1, 1, 1)
+    local = mirror.read().sort_values("id", ignore_index=True)
+    assert str(local["id"].dtype) == "Int32"
+    assert str(local["platforms"].dtype) == "Int32"
+    assert str(local["status"].dtype) == "category"
+    assert str(local["opened"].dtype).startswith("datetime64")
+    # Nulls survive the GeoPackage round trip and the merge with the changeset
+    assert local["platforms"].tolist() == [pd.NA, 2, 1, 3, 3]
+    assert local["status"].tolist()[:4] == ["closed", "open", "open", "open"]
+    assert local["status"].isna().tolist() == [False, False, False, False, True]
+    assert local["opened"].isna().tolist() == [False, False, True, False, True]
+    # The mirror is typed like a fresh query of the layer (the file may store dates at another resolution)
+    skipped = ("geometry", "opened")
+    assert {c: str(t) for c, t in local.dtypes.items() if c not in skipped} == {
+        c: str(t) for c, t in expected.dtypes.items() if c not in skipped
+    }
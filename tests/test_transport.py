@@ -0,0 +1,235 @@
+import asyncio
+import threading
+import time
+import httpx
+import pytest
+
+from pykaahma_linz.KServer import KServer
+from pykaahma_linz.KVectorItem import KVectorItem
+from pykaahma_linz.features.wfs import download_wfs_data
+
+from conftest import API_URL, layer_details, make_handler
+
+
+def wfs_and_s3_handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/wfs/"):
+        start = int(request.url.params["startIndex"])
+        features = [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [i, i]},
+                "properties": {"id": i},
+            }
+            for i in range(start, min(start + int(request.url.params["count"]), 3))
+        ]
+        return httpx.Response(
+            200, json={"type": "FeatureCollection", "features": features}
+        )
+    if request.url.host == "s3.example.com":
+        return httpx.Response(
+            200, json={"authorization": request.headers.get("Authorization")}
+        )
+    return httpx.Response(404)
+
+
+mock_handler = make_handler(fallback=wfs_and_s3_handler)
+
+
+def test_content_get_uses_transport_with_auth():
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        return mock_handler(request)
+
+    with KServer("test-key", transport=httpx.MockTransport(handler)) as kserver:
+        itm = kserver.content.get("50318")
+        assert isinstance(itm, KVectorItem)
+        assert kserver.metrics.requests == 2
+        assert kserver.metrics.bytes_received > 0
+
+    assert all(r.headers["Authorization"] == "key test-key" for r in requests_seen)
+
+
+def test_api_key_not_sent_to_other_hosts():
+    with KServer("test-key", transport=httpx.MockTransport(mock_handler)) as kserver:
+        result = kserver.get("https://s3.example.com/export.zip")
+    assert result["authorization"] is None
+
+
+def test_wfs_download_through_kserver_client():
+    with KServer("test-key", transport=httpx.MockTransport(mock_handler)) as kserver:
+        result = download_wfs_data(
+            url=f"{kserver._wfs_url}",
+            typeNames="layer-50318",
+            api_key="test-key",
+            page_count=2,
+            client=kserver.client,
+        )
+        assert kserver.metrics.requests == 2
+    assert [f["properties"]["id"] for f in result["features"]] == [0, 1, 2]
+
+
+def test_async_get_uses_async_transport():
+    async def run():
+        async with KServer(
+            "test-key", transport=httpx.MockTransport(mock_handler)
+        ) as kserver:
+            return await kserver.async_get(layer_details["url"])
+
+    assert asyncio.run(run())["id"] == 50318
+
+
+def test_pooled_client_is_created_once_across_threads():
+    kserver = KServer("test-key", transport=httpx.MockTransport(mock_handler))
+    barrier = threading.Barrier(8)
+    clients = []
+
+    def get_client():
+        barrier.wait()
+        clients.append(kserver.client)
+
+    threads = [threading.Thread(target=get_client) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    kserver.close()
+
+    assert len({id(client) for client in clients}) == 1
+
+
+def test_async_client_from_a_finished_loop_is_replaced_with_warning(caplog):
+    kserver = KServer("test-key", transport=httpx.MockTransport(mock_handler))
+
+    async def get_client():
+        return kserver.async_client
+
+    first = asyncio.run(get_client())
+    assert kserver.async_client is first  # reused outside a loop
+    second = asyncio.run(get_client())
+
+    assert second is not first
+    assert "event loop has finished" in caplog.text
+    kserver.close()
+
+
+def test_query_chunks_yields_geodataframes():
+    with KServer("test-key", transport=httpx.MockTransport(mock_handler)) as kserver:
+        itm = kserver.content.get("50318")
+        chunks = list(itm.query_chunks(chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert all(chunk.crs.to_epsg() == 2193 for chunk in chunks)
+
+
+def test_async_queries_run_concurrently_on_one_loop():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.params.get("typeNames"))
+        return mock_handler(request)
+
+    async def run():
+        async with KServer(
+            "test-key", transport=httpx.MockTransport(handler)
+        ) as kserver:
+            itm = kserver.content.get("50318")
+            itm._supports_changesets = True
+            return await asyncio.gather(
+                itm.query_async(),
+                itm.query_json_async(page_count=2),
+                itm.get_changeset_async(from_time="2024-01-01T00:00:00"),
+            )
+
+    gdf, result, changeset = asyncio.run(run())
+    assert len(gdf) == 3 and gdf.crs.to_epsg() == 2193
+    assert result["totalFeatures"] == 3
+    assert len(changeset) == 3
+    assert "layer-50318-changeset" in seen
+
+
+def test_get_many_returns_items_in_input_order():
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, peak
+
+    def handler(request):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        path = request.url.path
+        if path.endswith("/data/"):
+            id = request.url.params["id"]
+            return httpx.Response(
+                200, json=[{"id": int(id), "url": f"{API_URL}layers/{id}/"}]
+            )
+        id = int(path.rstrip("/").rsplit("/", 1)[-1])
+        return httpx.Response(200, json={**layer_details, "id": id})
+
+    ids = ["5", "1", "4", "2", "3", "1"]
+    with KServer("test-key", transport=httpx.MockTransport(handler)) as kserver:
+        items = kserver.content.get_many(ids, max_workers=3)
+        assert kserver.metrics.requests == 10
+
+    assert [itm.id for itm in items] == [5, 1, 4, 2, 3, 1]
+    assert items[1] is items[5]
+    assert 1 < in_flight[1] <= 3
+
+
+def make_catalogue_handler(seen: list, total: int = 7):
+    def handler(request):
+        seen.append(request)
+        page = int(request.url.params.get("page", 1))
+        page_size = int(request.url.params["page_size"])
+        start = (page - 1) * page_size
+        entries = [
+            {"id": i, "url": f"{API_URL}layers/{i}/", "kind": "vector"}
+            for i in range(start, min(start + page_size, total))
+        ]
+        headers = {}
+        if start + page_size < total:
+            next_url = request.url.copy_set_param("page", page + 1)
+            headers["Link"] = f'<{next_url}>; rel="page-next"'
+        return httpx.Response(200, json=entries, headers=headers)
+
+    return handler
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_search_follows_next_links(prefetch):
+    seen = []
+    with KServer(
+        "test-key", transport=httpx.MockTransport(make_catalogue_handler(seen))
+    ) as kserver:
+        entries = list(
+            kserver.content.search(
+                text="rail",
+                kind="vector",
+                updated_since="2024-01-01",
+                page_size=3,
+                prefetch=prefetch,
+            )
+        )
+
+    assert [entry["id"] for entry in entries] == list(range(7))
+    assert len(seen) == 3
+    assert all(r.url.params["q"] == "rail" for r in seen)
+    assert all(r.url.params["updated_at.after"] == "2024-01-01" for r in seen)
+    assert "type" not in seen[0].url.params
+
+
+def test_search_is_lazy():
+    seen = []
+    with KServer(
+        "test-key",
+        transport=httpx.MockTransport(make_catalogue_handler(seen, total=100)),
+    ) as kserver:
+        results = kserver.content.search(page_size=10)
+        assert seen == []
+        first = next(results)
+        results.close()
+
+    assert first["id"] == 0
+    assert len(seen) <= 2  # the first page, and at most one prefetched page
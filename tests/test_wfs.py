@@ -0,0 +1,480 @@
+import asyncio
+import httpx
+import pytest
+from tenacity import wait_none
+
+from pykaahma_linz.features import json_decoder, wfs
+from pykaahma_linz.features.wfs import (
+    WfsDownloaderError,
+    WfsTruncatedError,
+    _AdaptivePageSizer,
+    download_wfs_data,
+    download_wfs_gdf,
+    get_wfs_hit_count,
+    iter_wfs_pages,
+)
+from pykaahma_linz.features.wfs_async import download_wfs_data_async
+
+WFS_URL = "https://data.linz.govt.nz/services/wfs/"
+TOTAL_FEATURES = 25
+
+
+def make_wfs_handler(total: int = TOTAL_FEATURES, seen: list | None = None):
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        if seen is not None:
+            seen.append(dict(params))
+        if params.get("resultType") == "hits":
+            return httpx.Response(
+                200,
+                text=f'<wfs:FeatureCollection numberMatched="{total}" numberReturned="0"/>',
+            )
+        start = int(params["startIndex"])
+        page_count = int(params["count"])
+        features = [
+            {
+                "type": "Feature",
+                "id": f"layer.{i}",
+                "geometry": {"type": "Point", "coordinates": [i, -i]},
+                "properties": {"id": i},
+            }
+            for i in range(start, min(start + page_count, total))
+        ]
+        return httpx.Response(
+            200,
+            json={
+                "type": "FeatureCollection",
+                "features": features,
+                "numberReturned": len(features),
+            },
+        )
+
+    return handler
+
+
+def download(handler, **kwargs):
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        return download_wfs_data(
+            url=WFS_URL,
+            typeNames="layer-1",
+            api_key="test-key",
+            client=client,
+            **kwargs,
+        )
+
+
+def feature_ids(result: dict) -> list:
+    return [f["properties"]["id"] for f in result["features"]]
+
+
+def test_sequential_download_pages_until_short_page():
+    result = download(make_wfs_handler(), page_count=10)
+    assert feature_ids(result) == list(range(TOTAL_FEATURES))
+    assert result["totalFeatures"] == TOTAL_FEATURES
+    assert "numberReturned" not in result
+
+
+@pytest.mark.parametrize("feature_count", [TOTAL_FEATURES, None])
+def test_concurrent_download_matches_sequential(feature_count):
+    seen = []
+    result = download(
+        make_wfs_handler(seen=seen),
+        page_count=10,
+        max_workers=4,
+        feature_count=feature_count,
+    )
+    assert feature_ids(result) == list(range(TOTAL_FEATURES))
+    if feature_count is None:
+        assert any(p.get("resultType") == "hits" for p in seen)
+
+
+def test_concurrent_download_continues_if_layer_grew():
+    # The planned count is stale, so the download must keep paging past it.
+    result = download(
+        make_wfs_handler(total=35), page_count=10, max_workers=3, feature_count=20
+    )
+    assert feature_ids(result) == list(range(35))
+
+
+def test_adaptive_download_grows_fast_pages():
+    seen = []
+    result = download(
+        make_wfs_handler(total=1000, seen=seen), page_count=10, adaptive=True
+    )
+    assert feature_ids(result) == list(range(1000))
+    page_sizes = [int(p["count"]) for p in seen]
+    assert page_sizes[:4] == [10, 20, 40, 80]
+
+
+def test_adaptive_download_shrinks_timed_out_page(monkeypatch):
+    monkeypatch.setattr(wfs._fetch_single_page_data.retry, "wait", wait_none())
+    handler = make_wfs_handler()
+
+    def timing_out_handler(request: httpx.Request) -> httpx.Response:
+        if int(request.url.params["count"]) > 150:
+            raise httpx.ReadTimeout("timed out", request=request)
+        return handler(request)
+
+    result = download(timing_out_handler, page_count=200, adaptive=True)
+    assert feature_ids(result) == list(range(TOTAL_FEATURES))
+
+    with pytest.raises(WfsDownloaderError):
+        download(timing_out_handler, page_count=200)
+
+
+@pytest.mark.parametrize("output_format", [None, "csv"])
+def test_adaptive_retry_after_timeout_requests_smaller_page(monkeypatch, output_format):
+    monkeypatch.setattr(wfs._fetch_single_page_data.retry, "wait", wait_none())
+    monkeypatch.setattr(wfs._download_single_page_file.retry, "wait", wait_none())
+    counts = []
+    handler = csv_handler if output_format else make_wfs_handler()
+
+    def timing_out_handler(request: httpx.Request) -> httpx.Response:
+        counts.append(int(request.url.params["count"]))
+        if len(counts) == 1:
+            raise httpx.ReadTimeout("timed out", request=request)
+        return handler(request)
+
+    with httpx.Client(transport=httpx.MockTransport(timing_out_handler)) as client:
+        if output_format:
+            result = download_wfs_gdf(
+                WFS_URL,
+                "layer-1",
+                "test-key",
+                output_format=output_format,
+                page_count=200,
+                client=client,
+                adaptive=True,
+            )
+            assert len(result) == TOTAL_FEATURES
+        else:
+            result = download_wfs_data(
+                url=WFS_URL,
+                typeNames="layer-1",
+                api_key="test-key",
+                page_count=200,
+                client=client,
+                adaptive=True,
+            )
+            assert feature_ids(result) == list(range(TOTAL_FEATURES))
+
+    # The retry of the timed out page already asks for half as many features
+    assert counts[:2] == [200, 100]
+
+
+def test_adaptive_sizer_shrinks_slow_large_or_retried_pages():
+    sizer = _AdaptivePageSizer(1000, target_seconds=5, max_page_bytes=1000)
+    assert sizer.observe(10, 100) == 500
+    assert sizer.observe(1, 5000) == 250
+    assert sizer.observe(1, 100, attempts=2) == 125
+    assert sizer.observe(1, 100) == 250
+
+
+def test_get_wfs_hit_count():
+    with httpx.Client(transport=httpx.MockTransport(make_wfs_handler())) as client:
+        assert get_wfs_hit_count(WFS_URL, "layer-1", "test-key", client=client) == 25
+
+
+def test_iter_wfs_pages_fetches_lazily():
+    seen = []
+    with httpx.Client(
+        transport=httpx.MockTransport(make_wfs_handler(seen=seen))
+    ) as client:
+        pages = iter_wfs_pages(
+            WFS_URL, "layer-1", "test-key", page_count=10, client=client
+        )
+        first_page = next(pages)
+        assert len(first_page["features"]) == 10
+        assert len(seen) == 1
+        remaining = [len(page["features"]) for page in pages]
+    assert remaining == [10, 5]
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_iter_wfs_pages_yields_in_order(max_workers):
+    with httpx.Client(transport=httpx.MockTransport(make_wfs_handler())) as client:
+        pages = list(
+            iter_wfs_pages(
+                WFS_URL,
+                "layer-1",
+                "test-key",
+                page_count=4,
+                client=client,
+                max_workers=max_workers,
+                feature_count=TOTAL_FEATURES,
+            )
+        )
+    ids = [f["properties"]["id"] for page in pages for f in page["features"]]
+    assert ids == list(range(TOTAL_FEATURES))
+
+
+def csv_handler(request: httpx.Request) -> httpx.Response:
+    params = request.url.params
+    assert params["outputFormat"] == "csv"
+    start = int(params["startIndex"])
+    rows = ["FID,id,name,active,shape"]
+    for i in range(start, min(start + int(params["count"]), TOTAL_FEATURES)):
+        active = "true" if i % 3 else "false"
+        rows.append(f'layer-1.{i},{i},"Station, {i % 2}",{active},POINT ({i} {-i})')
+    return httpx.Response(200, text="\n".join(rows) + "\n")
+
+
+@pytest.mark.parametrize("adaptive", [False, True])
+def test_download_wfs_gdf_from_csv_pages(adaptive):
+    fields = [
+        {"name": "shape", "type": "geometry"},
+        {"name": "id", "type": "integer"},
+        {"name": "name", "type": "string"},
+        {"name": "active", "type": "boolean"},
+    ]
+    with httpx.Client(transport=httpx.MockTransport(csv_handler)) as client:
+        gdf = download_wfs_gdf(
+            WFS_URL,
+            "layer-1",
+            "test-key",
+            output_format="csv",
+            epsg=2193,
+            fields=fields,
+            page_count=10,
+            client=client,
+            adaptive=adaptive,
+        )
+    assert gdf["id"].tolist() == list(range(TOTAL_FEATURES))
+    assert str(gdf["id"].dtype) == "Int32"
+    assert str(gdf["active"].dtype) == "boolean"
+    assert gdf["active"].tolist() == [bool(i % 3) for i in range(TOTAL_FEATURES)]
+    assert gdf.crs.to_epsg() == 2193
+    assert gdf.geometry.x.tolist() == [float(i) for i in range(TOTAL_FEATURES)]
+
+
+def test_download_wfs_gdf_detects_repeated_csv_page():
+    def ignoring_start_index_handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        params["startIndex"] = "0"
+        return csv_handler(httpx.Request("GET", WFS_URL, params=params))
+
+    with httpx.Client(
+        transport=httpx.MockTransport(ignoring_start_index_handler)
+    ) as client:
+        with pytest.raises(WfsDownloaderError, match="same page twice"):
+            download_wfs_gdf(
+                WFS_URL, "layer-1", "test-key", page_count=10, client=client
+            )
+
+
+def test_download_wfs_gdf_without_pages_is_empty():
+    fields = [
+        {"name": "shape", "type": "geometry"},
+        {"name": "id", "type": "integer"},
+        {"name": "name", "type": "string"},
+    ]
+    with httpx.Client(transport=httpx.MockTransport(csv_handler)) as client:
+        gdf = download_wfs_gdf(
+            WFS_URL,
+            "layer-1",
+            "test-key",
+            epsg=2193,
+            fields=fields,
+            client=client,
+            max_pages=0,
+            on_truncation="ignore",
+        )
+    assert gdf.empty
+    assert list(gdf.columns) == ["id", "name", "geometry"]
+    assert str(gdf["id"].dtype) == "Int32"
+    assert gdf.crs.to_epsg() == 2193
+
+
+def test_json_backends_decode_pages_identically():
+    page = make_wfs_handler()(
+        httpx.Request("GET", WFS_URL, params={"startIndex": 0, "count": 10})
+    ).content
+    original = json_decoder.get_json_backend()
+    try:
+        results = []
+        for name in json_decoder.JSON_DECODERS:
+            json_decoder.set_json_backend(name)
+            results.append(json_decoder.json_loads(page))
+    finally:
+        json_decoder.set_json_backend(original)
+    assert all(result == results[-1] for result in results)
+    with pytest.raises(ValueError):
+        json_decoder.set_json_backend("not-a-backend")
+    with pytest.raises(ValueError):
+        json_decoder.json_loads(b"{not json")
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_checkpointed_download_resumes_after_failure(
+    tmp_path, monkeypatch, max_workers
+):
+    monkeypatch.setattr(wfs._fetch_single_page_data.retry, "wait", wait_none())
+    seen = []
+    handler = make_wfs_handler(seen=seen)
+
+    def failing_handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params.get("startIndex") == "20":
+            return httpx.Response(503)
+        return handler(request)
+
+    checkpoint_dir = tmp_path / "checkpoint"
+    with pytest.raises(WfsDownloaderError):
+        download(
+            failing_handler,
+            page_count=10,
+            max_workers=max_workers,
+            feature_count=TOTAL_FEATURES,
+            checkpoint_dir=str(checkpoint_dir),
+        )
+
+    seen.clear()
+    result = download(
+        handler,
+        page_count=10,
+        max_workers=max_workers,
+        feature_count=TOTAL_FEATURES,
+        checkpoint_dir=str(checkpoint_dir),
+    )
+    assert feature_ids(result) == list(range(TOTAL_FEATURES))
+    assert [p["startIndex"] for p in seen] == ["20"]
+
+    # A completed download is replayed from disk without any requests
+    seen.clear()
+    result = download(handler, page_count=10, checkpoint_dir=str(checkpoint_dir))
+    assert feature_ids(result) == list(range(TOTAL_FEATURES))
+    assert seen == []
+
+
+def test_checkpoint_for_different_query_is_discarded(tmp_path):
+    checkpoint_dir = str(tmp_path)
+    download(make_wfs_handler(), page_count=10, checkpoint_dir=checkpoint_dir)
+
+    seen = []
+    result = download(
+        make_wfs_handler(seen=seen),
+        page_count=10,
+        cql_filter="id < 100",
+        checkpoint_dir=checkpoint_dir,
+    )
+    assert feature_ids(result) == list(range(TOTAL_FEATURES))
+    assert len(seen) == 3
+
+
+def test_download_is_not_capped_at_a_fixed_number_of_pages():
+    result = download(make_wfs_handler(total=2505), page_count=2)
+    assert len(result["features"]) == 2505
+
+
+def test_max_pages_truncation_warns_or_raises(caplog):
+    result = download(make_wfs_handler(), page_count=10, max_pages=2)
+    assert feature_ids(result) == list(range(20))
+    assert "max_pages was reached" in caplog.text
+
+    with pytest.raises(WfsTruncatedError):
+        download(make_wfs_handler(), page_count=10, max_pages=2, on_truncation="raise")
+
+    with pytest.raises(ValueError):
+        download(make_wfs_handler(), on_truncation="skip")
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_fewer_features_than_feature_count_is_truncation(max_workers):
+    with pytest.raises(WfsTruncatedError):
+        download(
+            make_wfs_handler(),
+            page_count=10,
+            max_workers=max_workers,
+            feature_count=TOTAL_FEATURES + 5,
+            on_truncation="raise",
+        )
+
+
+def test_service_ignoring_start_index_is_detected():
+    handler = make_wfs_handler()
+
+    def ignoring_handler(request: httpx.Request) -> httpx.Response:
+        url = request.url.copy_set_param("startIndex", "0")
+        return handler(httpx.Request(request.method, url))
+
+    with pytest.raises(WfsDownloaderError, match="same page twice"):
+        download(ignoring_handler, page_count=10)
+
+
+def test_async_download_matches_sync():
+    seen = []
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(make_wfs_handler(seen=seen))
+        ) as client:
+            return await download_wfs_data_async(
+                WFS_URL, "layer-1", "test-key", page_count=10, client=client
+            )
+
+    result = asyncio.run(run())
+    assert feature_ids(result) == list(range(TOTAL_FEATURES))
+    assert result["totalFeatures"] == TOTAL_FEATURES
+    assert [p["startIndex"] for p in seen] == ["0", "10", "20"]
+
+
+@pytest.mark.parametrize("option", ["adaptive", "max_workers", "checkpoint_dir"])
+def test_async_download_rejects_sync_only_options(option):
+    seen = []
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(make_wfs_handler(seen=seen))
+        ) as client:
+            return await download_wfs_data_async(
+                WFS_URL, "layer-1", "test-key", client=client, **{option: 2}
+            )
+
+    with pytest.raises(TypeError, match=option):
+        asyncio.run(run())
+    assert seen == []
+
+
+def test_async_download_detects_truncation_like_sync():
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(make_wfs_handler())
+        ) as client:
+            return await download_wfs_data_async(
+                WFS_URL,
+                "layer-1",
+                "test-key",
+                page_count=10,
+                client=client,
+                feature_count=30,
+                on_truncation="raise",
+            )
+
+    with pytest.raises(WfsTruncatedError):
+        asyncio.run(run())
+
+
+def test_checkpoint_stopped_by_max_pages_is_not_complete(tmp_path, caplog):
+    checkpoint_dir = str(tmp_path)
+    result = download(
+        make_wfs_handler(), page_count=10, max_pages=1, checkpoint_dir=checkpoint_dir
+    )
+    assert feature_ids(result) == list(range(10))
+
+    # The same limit replays the saved page and stops again, without a request
+    seen = []
+    result = download(
+        make_wfs_handler(seen=seen),
+        page_count=10,
+        max_pages=1,
+        checkpoint_dir=checkpoint_dir,
+    )
+    assert feature_ids(result) == list(range(10))
+    assert seen == []
+    assert "max_pages was reached" in caplog.text
+
+    # Without the limit the download carries on from the saved pages
+    result = download(
+        make_wfs_handler(seen=seen), page_count=10, checkpoint_dir=checkpoint_dir
+    )
+    assert feature_ids(result) == list(range(TOTAL_FEATURES))
+    assert [p["startIndex"] for p in seen] == ["10", "20"]